@@ -0,0 +1,38 @@
+from typing import Dict, List, Tuple
+from fastapi import HTTPException
+from app.config import config
+from app.models.batch import BatchCreateResponse, BatchItemResult, BatchItemStatus
+
+def check_batch_size(items: list):
+    """Reject empty or oversized batch requests"""
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+    if len(items) > config.MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch cannot exceed {config.MAX_BATCH_SIZE} items")
+
+def build_batch_response(
+    total: int,
+    invalid: Dict[int, str],
+    written: List[Tuple[int, str]],
+    failed: Dict[str, str]
+) -> BatchCreateResponse:
+    """
+    Combine validation errors {index: message}, written items [(index, id)] and
+    write failures {id: message} into one result per request item, in request order.
+    """
+    results = [
+        BatchItemResult(index=index, status=BatchItemStatus.INVALID, error=error)
+        for index, error in invalid.items()
+    ]
+    for index, item_id in written:
+        error = failed.get(item_id)
+        results.append(BatchItemResult(
+            index=index,
+            status=BatchItemStatus.FAILED if error else BatchItemStatus.CREATED,
+            id=item_id,
+            error=error
+        ))
+    results.sort(key=lambda result: result.index)
+    
+    created = sum(1 for result in results if result.status == BatchItemStatus.CREATED)
+    return BatchCreateResponse(total=total, created=created, failed=total - created, results=results)
@@ -1,23 +1,54 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import List
-from app.models.booking import Booking, BookingCreate, BookingUpdate
-from app.crud.booking_crud import BookingCRUD
-from app.non_crud_lib.notification_service import NotificationService
-from app.non_crud_lib.storage_service import StorageService
-from app.non_crud_lib.queue_service import QueueService
+import asyncio
+import uuid
+from fastapi import APIRouter, HTTPException, Header, Query, Response, UploadFile, File
+from typing import List, Optional
+from app.config import config
+from app.models.batch import BatchCreateResponse, BatchGetRequest, BatchGetResponse
+from app.models.pagination import Page
+from app.models.booking import Booking, BookingCreate, BookingStatus, BookingUpdate
+from app.api.batch_results import build_batch_response, check_batch_size
+from app.api.etags import format_etag, parse_if_match
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields_param, sparse_response
+from app.api.streaming import ndjson_response
+from app.crud.batch import BatchReadError
+from app.crud.pagination import InvalidPageTokenError
+from app.crud.updates import VersionConflictError
+from app.crud.async_crud import AsyncBayAllocator, AsyncBookingCRUD, AsyncServiceCenterCRUD
+from app.non_crud_lib.async_services import (
+    AsyncNotificationService,
+    AsyncStorageService,
+    AsyncQueueService,
+    AsyncSchedulerService
+)
+from app.non_crud_lib.capacity_planner import CapacityPlanner, Slot
 from app.non_crud_lib.cost_calculator import CostCalculator
 from app.non_crud_lib.validator import Validator
-from app.non_crud_lib.scheduler_service import SchedulerService
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
-booking_crud = BookingCRUD()
-notification_service = NotificationService()
-storage_service = StorageService()
-queue_service = QueueService()
+booking_crud = AsyncBookingCRUD()
+service_center_crud = AsyncServiceCenterCRUD()
+bay_allocator = AsyncBayAllocator()
+notification_service = AsyncNotificationService()
+storage_service = AsyncStorageService()
+queue_service = AsyncQueueService()
 cost_calculator = CostCalculator()
 validator = Validator()
-scheduler_service = SchedulerService()
+scheduler_service = AsyncSchedulerService()
+capacity_planner = CapacityPlanner(cost_calculator)
+
+NO_BAY_AVAILABLE = "No service bay available at the requested time"
+# Updates touching any of these may move a booking to another slot or free its bay
+SLOT_FIELDS = {'booking_date', 'scheduled_time', 'service_type', 'status'}
+SCHEDULE_FIELDS = SLOT_FIELDS - {'status'}
+# Bookings still to be serviced, which need a bay
+ACTIVE_STATUSES = {BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.IN_PROGRESS}
+
+def _held_slot(booking: Booking) -> Optional[Slot]:
+    """Slot a booking currently holds a bay for (None for cancelled bookings and ones made before bays)"""
+    if booking.bay is None or booking.status == BookingStatus.CANCELLED:
+        return None
+    return capacity_planner.slot_for(booking.booking_date, booking.scheduled_time, booking.service_type)
 
 @router.post("/", response_model=Booking)
 async def create_booking(booking_data: BookingCreate):
@@ -27,95 +58,361 @@ async def create_booking(booking_data: BookingCreate):
     if not validation['is_valid']:
         raise HTTPException(status_code=400, detail=validation['message'])
     
+    service_center = await service_center_crud.get_service_center(booking_data.service_center_id)
+    if not service_center:
+        raise HTTPException(status_code=404, detail="Service center not found")
+    
+    try:
+        slot = capacity_planner.slot_for(booking_data.booking_date, booking_data.scheduled_time, booking_data.service_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Reserve a bay before writing the booking; the reservation write is atomic, so overlapping requests cannot both win
+    booking_id = str(uuid.uuid4())
+    bay = await bay_allocator.reserve(
+        booking_data.service_center_id,
+        capacity_planner.bays_for(service_center),
+        slot,
+        booking_id
+    )
+    if bay is None:
+        raise HTTPException(status_code=409, detail=NO_BAY_AVAILABLE)
+    
     # Calculate estimated cost
     cost_estimate = cost_calculator.calculate_service_cost(
         service_type=booking_data.service_type,
         estimated_hours=1.5
     )
     
-    # Create booking in database (CRUD)
-    booking = booking_crud.create_booking(booking_data)
+    # Create booking in database with its estimated cost and bay in one write (CRUD)
+    try:
+        booking = await booking_crud.create_booking(
+            booking_data,
+            estimated_cost=cost_estimate['estimated_total'],
+            booking_id=booking_id,
+            bay=bay
+        )
+    except Exception:
+        await bay_allocator.release(booking_data.service_center_id, slot, bay, booking_id)
+        raise
     
-    # Update booking with estimated cost
-    booking_crud.update_booking(
-        booking.booking_id,
-        BookingUpdate(estimated_cost=cost_estimate['estimated_total'])
+    # Queue, notify and schedule concurrently - the three calls are independent
+    await asyncio.gather(
+        # Queue booking request for processing (NON-CRUD - SQS)
+        queue_service.enqueue_booking_request({
+            'booking_id': booking.booking_id,
+            'customer_id': booking.customer_id,
+            'service_type': booking.service_type.value
+        }),
+        # Send confirmation notification (NON-CRUD - SNS)
+        notification_service.send_booking_confirmation(
+            customer_email="customer@example.com",  # Should be fetched from customer data
+            booking_details=booking.dict()
+        ),
+        # Schedule reminder (NON-CRUD - EventBridge)
+        scheduler_service.schedule_booking_reminder(
+            booking_id=booking.booking_id,
+            booking_datetime=f"{booking.booking_date}T{booking.scheduled_time}",
+            customer_email="customer@example.com"
+        )
     )
     
-    # Queue booking request for processing (NON-CRUD - SQS)
-    queue_service.enqueue_booking_request({
-        'booking_id': booking.booking_id,
-        'customer_id': booking.customer_id,
-        'service_type': booking.service_type.value
-    })
-    
-    # Send confirmation notification (NON-CRUD - SNS)
-    notification_service.send_booking_confirmation(
-        customer_email="customer@example.com",  # Should be fetched from customer data
-        booking_details=booking.dict()
-    )
+    return booking
+
+@router.post("/batch", response_model=BatchCreateResponse)
+async def batch_create_bookings(bookings_data: List[BookingCreate]):
+    """Create many bookings at once; every item is validated before any is written"""
+    check_batch_size(bookings_data)
+    
+    # Validate booking dates and work out the slot each booking needs (NON-CRUD)
+    invalid = {}
+    slots = {}
+    for index, booking_data in enumerate(bookings_data):
+        validation = validator.validate_booking_date(booking_data.booking_date, booking_data.scheduled_time)
+        if not validation['is_valid']:
+            invalid[index] = validation['message']
+            continue
+        try:
+            slots[index] = capacity_planner.slot_for(
+                booking_data.booking_date,
+                booking_data.scheduled_time,
+                booking_data.service_type
+            )
+        except ValueError as e:
+            invalid[index] = str(e)
+    
+    # Fetch every referenced service center in one batch read (CRUD)
+    service_center_ids = list(dict.fromkeys(bookings_data[index].service_center_id for index in slots))
+    try:
+        found_service_centers = (
+            await service_center_crud.get_service_centers_by_ids(service_center_ids) if service_center_ids else []
+        )
+    except BatchReadError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    service_centers = {service_center.service_center_id: service_center for service_center in found_service_centers}
+    for index in [index for index in slots if bookings_data[index].service_center_id not in service_centers]:
+        invalid[index] = "Service center not found"
+        del slots[index]
+    
+    # Reserve bays concurrently; bookings in the same batch compete for them like separate requests
+    booking_ids = {index: str(uuid.uuid4()) for index in slots}
+    reserved_bays = await asyncio.gather(*[
+        bay_allocator.reserve(
+            bookings_data[index].service_center_id,
+            capacity_planner.bays_for(service_centers[bookings_data[index].service_center_id]),
+            slot,
+            booking_ids[index]
+        )
+        for index, slot in slots.items()
+    ])
     
-    # Schedule reminder (NON-CRUD - EventBridge)
-    scheduler_service.schedule_booking_reminder(
-        booking_id=booking.booking_id,
-        booking_datetime=f"{booking.booking_date}T{booking.scheduled_time}",
-        customer_email="customer@example.com"
+    # Calculate estimated costs for bookings that got a bay (NON-CRUD)
+    valid = []
+    estimated_costs = []
+    for index, bay in zip(list(slots), reserved_bays):
+        if bay is None:
+            invalid[index] = NO_BAY_AVAILABLE
+            continue
+        cost_estimate = cost_calculator.calculate_service_cost(
+            service_type=bookings_data[index].service_type,
+            estimated_hours=1.5
+        )
+        valid.append((index, bay))
+        estimated_costs.append(cost_estimate['estimated_total'])
+    
+    # Create bookings in batches of 25 (CRUD)
+    bookings, failed = await booking_crud.batch_create_bookings(
+        [bookings_data[index] for index, _ in valid],
+        estimated_costs,
+        booking_ids=[booking_ids[index] for index, _ in valid],
+        bays=[bay for _, bay in valid]
     )
+    written = [(index, booking.booking_id) for (index, _), booking in zip(valid, bookings)]
+    created = [booking for booking in bookings if booking.booking_id not in failed]
     
-    return booking
+    # Give back the bays of bookings that could not be written
+    if failed:
+        await asyncio.gather(*[
+            bay_allocator.release(booking.service_center_id, slots[index], bay, booking.booking_id)
+            for (index, bay), booking in zip(valid, bookings)
+            if booking.booking_id in failed
+        ])
+    
+    if created:
+        await asyncio.gather(
+            # Queue booking requests for processing, 10 per call (NON-CRUD - SQS)
+            queue_service.enqueue_booking_requests([
+                {
+                    'booking_id': booking.booking_id,
+                    'customer_id': booking.customer_id,
+                    'service_type': booking.service_type.value
+                }
+                for booking in created
+            ]),
+            # Send confirmation notifications (NON-CRUD - SNS)
+            *[
+                notification_service.send_booking_confirmation(
+                    customer_email="customer@example.com",  # Should be fetched from customer data
+                    booking_details=booking.dict()
+                )
+                for booking in created
+            ],
+            # Schedule reminders (NON-CRUD - EventBridge)
+            *[
+                scheduler_service.schedule_booking_reminder(
+                    booking_id=booking.booking_id,
+                    booking_datetime=f"{booking.booking_date}T{booking.scheduled_time}",
+                    customer_email="customer@example.com"
+                )
+                for booking in created
+            ]
+        )
+    
+    return build_batch_response(len(bookings_data), invalid, written, failed)
 
-@router.get("/", response_model=List[Booking])
-async def get_all_bookings():
-    """Get all bookings"""
-    return booking_crud.get_all_bookings()
+@router.get("/", response_model=Page[Booking])
+async def get_all_bookings(
+    limit: int = Query(config.DEFAULT_PAGE_SIZE, ge=1, le=config.MAX_PAGE_SIZE),
+    next_token: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """Get a page of bookings; pass next_token back to fetch the following page"""
+    projection = parse_fields_param(fields, Booking, 'booking_id')
+    try:
+        bookings, next_token = await booking_crud.get_bookings_page(limit, next_token, projection)
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if projection:
+        return sparse_response({'items': bookings, 'next_token': next_token})
+    return Page(items=bookings, next_token=next_token)
+
+@router.post("/batch-get", response_model=BatchGetResponse[Booking])
+async def batch_get_bookings(request: BatchGetRequest):
+    """Get many bookings by ID in one request, in the order requested"""
+    check_batch_size(request.ids)
+    try:
+        bookings = await booking_crud.get_bookings_by_ids(request.ids)
+    except BatchReadError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    found_ids = {booking.booking_id for booking in bookings}
+    return BatchGetResponse(
+        items=bookings,
+        missing_ids=[booking_id for booking_id in dict.fromkeys(request.ids) if booking_id not in found_ids]
+    )
+
+@router.get("/export")
+async def export_bookings(segments: int = Query(config.SCAN_SEGMENTS, ge=1, le=config.MAX_SCAN_SEGMENTS)):
+    """Stream all bookings as NDJSON, one record per line, read as a parallel segmented scan"""
+    return ndjson_response(booking_crud.wrapped.iter_booking_pages(segments), "bookings.ndjson")
 
 @router.get("/{booking_id}", response_model=Booking)
-async def get_booking(booking_id: str):
+async def get_booking(
+    booking_id: str,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get booking by ID"""
-    booking = booking_crud.get_booking(booking_id)
+    projection = parse_fields_param(fields, Booking, 'booking_id')
+    booking = await booking_crud.get_booking(booking_id, projection)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
+    if projection:
+        return sparse_response(booking)
+    response.headers["ETag"] = format_etag(booking.version)
     return booking
 
 @router.put("/{booking_id}", response_model=Booking)
-async def update_booking(booking_id: str, booking_data: BookingUpdate):
-    """Update booking"""
-    booking = booking_crud.update_booking(booking_id, booking_data)
+async def update_booking(
+    booking_id: str,
+    booking_data: BookingUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """Update booking; send If-Match with the ETag from a previous read to reject concurrent changes"""
+    expected_version = parse_if_match(if_match)
+    changes = booking_data.dict(exclude_unset=True)
+    if SLOT_FIELDS.isdisjoint(changes):
+        booking = await _apply_update(booking_id, booking_data, expected_version)
+    else:
+        booking = await _reschedule(booking_id, booking_data, changes, expected_version)
+    response.headers["ETag"] = format_etag(booking.version)
+    return booking
+
+async def _apply_update(
+    booking_id: str,
+    booking_data: BookingUpdate,
+    expected_version: Optional[int],
+    bay: Optional[int] = None
+) -> Booking:
+    try:
+        booking = await booking_crud.update_booking(booking_id, booking_data, expected_version, bay=bay)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     return booking
 
+async def _reschedule(booking_id: str, booking_data: BookingUpdate, changes: dict, expected_version: Optional[int]) -> Booking:
+    """
+    Apply an update that may move the booking: reserve the new slot first, write
+    the booking conditioned on the version just read, then free the old slot.
+    """
+    current = await booking_crud.get_booking(booking_id)
+    if not current:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    if expected_version is not None and expected_version != current.version:
+        raise HTTPException(status_code=412, detail=str(VersionConflictError(current.version)))
+    
+    if ('booking_date' in changes) != ('scheduled_time' in changes):
+        # The repository takes the two together; the half left alone comes from the booking just read
+        booking_data = booking_data.copy(update={
+            'booking_date': changes.get('booking_date', current.booking_date),
+            'scheduled_time': changes.get('scheduled_time', current.scheduled_time)
+        })
+    
+    old_slot = _held_slot(current)
+    target = current.copy(update=changes)
+    new_slot = None
+    new_bay = None
+    # A bay is only claimed for a booking that moves or comes back into service, so a
+    # status change alone (e.g. completing a booking made before bays) never needs one
+    needs_bay = target.status in ACTIVE_STATUSES and (
+        not SCHEDULE_FIELDS.isdisjoint(changes) or current.status not in ACTIVE_STATUSES
+    )
+    if needs_bay:
+        try:
+            new_slot = capacity_planner.slot_for(target.booking_date, target.scheduled_time, target.service_type)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        if new_slot != old_slot:
+            service_center = await service_center_crud.get_service_center(current.service_center_id)
+            if not service_center:
+                raise HTTPException(status_code=404, detail="Service center not found")
+            # Keys this booking already holds count as free, so it can shift within its own slot
+            new_bay = await bay_allocator.reserve(
+                current.service_center_id,
+                capacity_planner.bays_for(service_center),
+                new_slot,
+                booking_id
+            )
+            if new_bay is None:
+                raise HTTPException(status_code=409, detail=NO_BAY_AVAILABLE)
+    
+    try:
+        booking = await _apply_update(booking_id, booking_data, current.version, bay=new_bay)
+    except HTTPException:
+        if new_bay is not None:
+            await bay_allocator.release(
+                current.service_center_id, new_slot, new_bay, booking_id,
+                keep=old_slot, keep_bay=current.bay if old_slot else None
+            )
+        raise
+    
+    if old_slot and (new_bay is not None or target.status == BookingStatus.CANCELLED):
+        await bay_allocator.release(
+            current.service_center_id, old_slot, current.bay, booking_id,
+            keep=new_slot if new_bay is not None else None, keep_bay=new_bay
+        )
+    return booking
+
 @router.delete("/{booking_id}")
 async def delete_booking(booking_id: str):
     """Delete/Cancel booking"""
-    booking = booking_crud.get_booking(booking_id)
+    booking = await booking_crud.get_booking(booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    # Send cancellation notification (NON-CRUD - SNS)
-    notification_service.send_cancellation_notification(
-        customer_email="customer@example.com",
-        booking_details=booking.dict()
+    await asyncio.gather(
+        # Send cancellation notification (NON-CRUD - SNS)
+        notification_service.send_cancellation_notification(
+            customer_email="customer@example.com",
+            booking_details=booking.dict()
+        ),
+        # Cancel scheduled reminder (NON-CRUD - EventBridge)
+        scheduler_service.cancel_scheduled_event(f"vehicle-service-reminders-{booking_id}")
     )
     
-    # Cancel scheduled reminder (NON-CRUD - EventBridge)
-    scheduler_service.cancel_scheduled_event(f"vehicle-service-reminders-{booking_id}")
-    
-    success = booking_crud.delete_booking(booking_id)
+    success = await booking_crud.delete_booking(booking_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete booking")
     
+    # Free the bay for other bookings
+    held_slot = _held_slot(booking)
+    if held_slot:
+        await bay_allocator.release(booking.service_center_id, held_slot, booking.bay, booking_id)
+    
     return {"message": "Booking cancelled successfully"}
 
 @router.post("/{booking_id}/upload-report")
 async def upload_service_report(booking_id: str, file: UploadFile = File(...)):
     """Upload service report (NON-CRUD - S3)"""
-    booking = booking_crud.get_booking(booking_id)
+    booking = await booking_crud.get_booking(booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
     file_content = await file.read()
-    result = storage_service.upload_service_report(
+    result = await storage_service.upload_service_report(
         booking_id=booking_id,
         file_content=file_content,
         file_name=file.filename
@@ -129,7 +426,7 @@ async def upload_service_report(booking_id: str, file: UploadFile = File(...)):
 @router.get("/{booking_id}/calculate-cost")
 async def calculate_booking_cost(booking_id: str, estimated_hours: float = 1.5):
     """Calculate service cost (NON-CRUD - Pure Logic)"""
-    booking = booking_crud.get_booking(booking_id)
+    booking = await booking_crud.get_booking(booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -141,4 +438,4 @@ async def calculate_booking_cost(booking_id: str, estimated_hours: float = 1.5):
 @router.get("/customer/{customer_id}", response_model=List[Booking])
 async def get_customer_bookings(customer_id: str):
     """Get all bookings for a customer"""
-    return booking_crud.get_bookings_by_customer(customer_id)
\ No newline at end of file
+    return await booking_crud.get_bookings_by_customer(customer_id)
\ No newline at end of file
@@ -1,17 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Header, Query, Response
+from typing import List, Optional
+from app.config import config
+from app.models.batch import BatchCreateResponse, BatchGetRequest, BatchGetResponse
+from app.models.pagination import Page
 from app.models.customer import Customer, CustomerCreate, CustomerUpdate
-from app.crud.customer_crud import CustomerCRUD
+from app.api.batch_results import build_batch_response, check_batch_size
+from app.api.etags import format_etag, parse_if_match
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields_param, sparse_response
+from app.api.streaming import ndjson_response
+from app.crud.batch import BatchReadError
+from app.crud.pagination import InvalidPageTokenError
+from app.crud.updates import VersionConflictError
+from app.crud.async_crud import AsyncCustomerCRUD, AsyncReportBuilder
 from app.non_crud_lib.validator import Validator
-from app.non_crud_lib.report_generator import ReportGenerator
-from app.crud.booking_crud import BookingCRUD
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
-customer_crud = CustomerCRUD()
+customer_crud = AsyncCustomerCRUD()
 validator = Validator()
-report_generator = ReportGenerator()
-booking_crud = BookingCRUD()
+report_builder = AsyncReportBuilder()
 
 @router.post("/", response_model=Customer)
 async def create_customer(customer_data: CustomerCreate):
@@ -22,34 +29,102 @@ async def create_customer(customer_data: CustomerCreate):
         raise HTTPException(status_code=400, detail=phone_validation['message'])
     
     # Create customer (CRUD)
-    customer = customer_crud.create_customer(customer_data)
+    customer = await customer_crud.create_customer(customer_data)
     return customer
 
-@router.get("/", response_model=List[Customer])
-async def get_all_customers():
-    """Get all customers"""
-    return customer_crud.get_all_customers()
+@router.post("/batch", response_model=BatchCreateResponse)
+async def batch_create_customers(customers_data: List[CustomerCreate]):
+    """Create many customers at once; every item is validated before any is written"""
+    check_batch_size(customers_data)
+    
+    # Validate phone numbers (NON-CRUD)
+    invalid = {}
+    valid = []
+    for index, customer_data in enumerate(customers_data):
+        phone_validation = validator.validate_phone_number(customer_data.phone)
+        if not phone_validation['is_valid']:
+            invalid[index] = phone_validation['message']
+        else:
+            valid.append((index, customer_data))
+    
+    # Create customers in batches of 25 (CRUD)
+    customers, failed = await customer_crud.batch_create_customers([customer_data for _, customer_data in valid])
+    written = [(index, customer.customer_id) for (index, _), customer in zip(valid, customers)]
+    
+    return build_batch_response(len(customers_data), invalid, written, failed)
+
+@router.get("/", response_model=Page[Customer])
+async def get_all_customers(
+    limit: int = Query(config.DEFAULT_PAGE_SIZE, ge=1, le=config.MAX_PAGE_SIZE),
+    next_token: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """Get a page of customers; pass next_token back to fetch the following page"""
+    projection = parse_fields_param(fields, Customer, 'customer_id')
+    try:
+        customers, next_token = await customer_crud.get_customers_page(limit, next_token, projection)
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if projection:
+        return sparse_response({'items': customers, 'next_token': next_token})
+    return Page(items=customers, next_token=next_token)
+
+@router.post("/batch-get", response_model=BatchGetResponse[Customer])
+async def batch_get_customers(request: BatchGetRequest):
+    """Get many customers by ID in one request, in the order requested"""
+    check_batch_size(request.ids)
+    try:
+        customers = await customer_crud.get_customers_by_ids(request.ids)
+    except BatchReadError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    found_ids = {customer.customer_id for customer in customers}
+    return BatchGetResponse(
+        items=customers,
+        missing_ids=[customer_id for customer_id in dict.fromkeys(request.ids) if customer_id not in found_ids]
+    )
+
+@router.get("/export")
+async def export_customers(segments: int = Query(config.SCAN_SEGMENTS, ge=1, le=config.MAX_SCAN_SEGMENTS)):
+    """Stream all customers as NDJSON, one record per line, read as a parallel segmented scan"""
+    return ndjson_response(customer_crud.wrapped.iter_customer_pages(segments), "customers.ndjson")
 
 @router.get("/{customer_id}", response_model=Customer)
-async def get_customer(customer_id: str):
+async def get_customer(
+    customer_id: str,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get customer by ID"""
-    customer = customer_crud.get_customer(customer_id)
+    projection = parse_fields_param(fields, Customer, 'customer_id')
+    customer = await customer_crud.get_customer(customer_id, projection)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
+    if projection:
+        return sparse_response(customer)
+    response.headers["ETag"] = format_etag(customer.version)
     return customer
 
 @router.put("/{customer_id}", response_model=Customer)
-async def update_customer(customer_id: str, customer_data: CustomerUpdate):
-    """Update customer"""
-    customer = customer_crud.update_customer(customer_id, customer_data)
+async def update_customer(
+    customer_id: str,
+    customer_data: CustomerUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """Update customer; send If-Match with the ETag from a previous read to reject concurrent changes"""
+    try:
+        customer = await customer_crud.update_customer(customer_id, customer_data, parse_if_match(if_match))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
+    response.headers["ETag"] = format_etag(customer.version)
     return customer
 
 @router.delete("/{customer_id}")
 async def delete_customer(customer_id: str):
     """Delete customer"""
-    success = customer_crud.delete_customer(customer_id)
+    success = await customer_crud.delete_customer(customer_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete customer")
     return {"message": "Customer deleted successfully"}
@@ -57,15 +132,9 @@ async def delete_customer(customer_id: str):
 @router.get("/{customer_id}/service-history")
 async def get_customer_service_history(customer_id: str):
     """Get customer service history report (NON-CRUD)"""
-    customer = customer_crud.get_customer(customer_id)
+    customer = await customer_crud.get_customer(customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    # Get customer bookings
-    bookings = booking_crud.get_bookings_by_customer(customer_id)
-    bookings_dict = [booking.dict() for booking in bookings]
-    
-    # Generate report (NON-CRUD)
-    report = report_generator.generate_customer_service_history(bookings_dict)
-    
-    return report
\ No newline at end of file
+    # Same report as the CUSTOMER_SERVICE_HISTORY job, cached until one of the customer's bookings changes
+    return await report_builder.customer_service_history(customer_id)
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import Optional
+from fastapi import HTTPException
+
+def format_etag(version: int) -> str:
+    """ETag header value for a record version"""
+    return f'"{version}"'
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Expected record version from an If-Match header (None when absent or '*')"""
+    if if_match is None:
+        return None
+    
+    value = if_match.strip()
+    if value == '*':
+        return None
+    if value.startswith('W/'):
+        value = value[2:]
+    
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be an ETag returned by this API")
@@ -0,0 +1,19 @@
+from typing import Any, Optional, Tuple, Type
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.crud.projection import InvalidFieldsError, parse_fields
+
+FIELDS_DESCRIPTION = "Comma-separated attributes to return, e.g. booking_id,status (the ID is always included)"
+
+def parse_fields_param(fields: Optional[str], model: Type[BaseModel], key_name: str) -> Optional[Tuple[str, ...]]:
+    """Validate a fields query parameter, answering 400 for unknown attributes"""
+    try:
+        return parse_fields(fields, model, key_name)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def sparse_response(content: Any) -> JSONResponse:
+    """Serialize trimmed records directly so response_model does not fill omitted fields back in"""
+    return JSONResponse(content=jsonable_encoder(content))
@@ -0,0 +1,136 @@
+import uuid
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Optional
+from app.crud.async_crud import AsyncCustomerCRUD, AsyncReportBuilder, AsyncReportJobRunner, AsyncServiceCenterCRUD
+from app.crud.report_builder import scans_all_bookings
+from app.crud.report_jobs import ReportQueueFullError
+from app.models.report import ReportJob, ReportJobStatus, ReportSpec, ReportType
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+# Where the summary, performance and monthly reports come from is set by
+# config.REPORT_SOURCE (see ReportBuilder). Reports that would scan the whole
+# bookings table are not built in the request: their route submits a report
+# job and answers 202 with it instead.
+service_center_crud = AsyncServiceCenterCRUD()
+customer_crud = AsyncCustomerCRUD()
+report_builder = AsyncReportBuilder()
+report_job_runner = AsyncReportJobRunner()
+
+async def _check_service_center(service_center_id: str):
+    service_center = await service_center_crud.get_service_center(service_center_id, ('service_center_id',))
+    if not service_center:
+        raise HTTPException(status_code=404, detail="Service center not found")
+
+async def _submit_job(spec: ReportSpec, response: Response) -> ReportJob:
+    """Queue a report job; response is answered 202 with a Location to poll"""
+    try:
+        job = await report_job_runner.submit(spec)
+    except ReportQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    response.status_code = 202
+    response.headers["Location"] = f"{router.prefix}/jobs/{job.job_id}"
+    return job
+
+@router.get("/bookings/summary", responses={202: {"model": ReportJob, "description": "Report job submitted"}})
+async def get_booking_summary_report(response: Response):
+    """
+    Booking counts by status and service type, and revenue, across all service
+    centers (NON-CRUD); a 202 with a report job where that needs a full scan
+    """
+    spec = ReportSpec(report_type=ReportType.BOOKING_SUMMARY)
+    if scans_all_bookings(spec):
+        return await _submit_job(spec, response)
+    return await report_builder.booking_summary()
+
+@router.get("/service-centers/performance", response_model=ReportJob, status_code=202)
+async def get_all_service_centers_performance_report(response: Response):
+    """
+    Performance of every service center with bookings (NON-CRUD). It reads the
+    whole bookings table, so it is always built as a report job: answers 202
+    with the job to poll
+    """
+    return await _submit_job(ReportSpec(report_type=ReportType.ALL_SERVICE_CENTERS_PERFORMANCE), response)
+
+@router.get("/service-centers/{service_center_id}/performance")
+async def get_service_center_performance_report(service_center_id: str):
+    """Completion and cancellation rates and completed revenue of one service center (NON-CRUD)"""
+    await _check_service_center(service_center_id)
+    return await report_builder.service_center_performance(service_center_id)
+
+@router.get("/monthly", responses={202: {"model": ReportJob, "description": "Report job submitted"}})
+async def get_monthly_report(
+    response: Response,
+    month: int = Query(..., ge=1, le=12),
+    year: int = Query(..., ge=1, le=9999),
+    service_center_id: Optional[str] = None
+):
+    """
+    Bookings and revenue of one month, for all service centers or just one
+    (NON-CRUD); a 202 with a report job where that needs a full scan
+    """
+    if service_center_id:
+        await _check_service_center(service_center_id)
+    spec = ReportSpec(report_type=ReportType.MONTHLY, month=month, year=year, service_center_id=service_center_id)
+    if scans_all_bookings(spec):
+        return await _submit_job(spec, response)
+    return await report_builder.monthly(month, year, service_center_id)
+
+@router.post("/jobs", response_model=ReportJob, status_code=202)
+async def submit_report_job(spec: ReportSpec, response: Response):
+    """
+    Queue a report to be built by a report worker and return its job at once;
+    poll GET /reports/jobs/{job_id} and download the result when it succeeds
+    """
+    if spec.report_type == ReportType.SERVICE_CENTER_PERFORMANCE and not spec.service_center_id:
+        raise HTTPException(status_code=400, detail="service_center_id is required")
+    if spec.report_type == ReportType.MONTHLY and (spec.month is None or spec.year is None):
+        raise HTTPException(status_code=400, detail="month and year are required")
+    if spec.report_type == ReportType.CUSTOMER_SERVICE_HISTORY and not spec.customer_id:
+        raise HTTPException(status_code=400, detail="customer_id is required")
+    
+    if spec.service_center_id and spec.report_type in (ReportType.SERVICE_CENTER_PERFORMANCE, ReportType.MONTHLY):
+        await _check_service_center(spec.service_center_id)
+    if spec.report_type == ReportType.CUSTOMER_SERVICE_HISTORY:
+        customer = await customer_crud.get_customer(spec.customer_id)
+        if not customer:
+            raise HTTPException(status_code=404, detail="Customer not found")
+    
+    return await _submit_job(spec, response)
+
+def _check_job_id(job_id: str):
+    """Job IDs are UUIDs as issued; anything else (e.g. an encoded ..) names no job and never reaches the job store"""
+    try:
+        valid = str(uuid.UUID(job_id)) == job_id
+    except ValueError:
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=404, detail="Report job not found")
+
+@router.get("/jobs/{job_id}", response_model=ReportJob)
+async def get_report_job(job_id: str):
+    """Status of a report job"""
+    _check_job_id(job_id)
+    job = await report_job_runner.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+@router.get("/jobs/{job_id}/result")
+async def download_report_job_result(job_id: str):
+    """Download the report of a succeeded job (JSON)"""
+    _check_job_id(job_id)
+    job = await report_job_runner.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    if job.status != ReportJobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Report job is {job.status.value}")
+    
+    content = await report_job_runner.get_result(job_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Report result not found")
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="report-{job_id}.json"'}
+    )
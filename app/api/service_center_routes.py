@@ -1,47 +1,223 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from app.models.service_center import ServiceCenter, ServiceCenterCreate, ServiceCenterUpdate
-from app.crud.service_center_crud import ServiceCenterCRUD
+import asyncio
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, HTTPException, Header, Query, Response
+from typing import List, Optional
+from app.config import config
+from app.models.batch import BatchGetRequest, BatchGetResponse
+from app.models.booking import Booking, BookingStatus, ServiceType
+from app.models.pagination import Page
+from app.models.service_center import AvailableSlot, ServiceCenter, ServiceCenterCreate, ServiceCenterUpdate
+from app.api.batch_results import check_batch_size
+from app.api.etags import format_etag, parse_if_match
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields_param, sparse_response
+from app.api.streaming import ndjson_response
+from app.crud.batch import BatchReadError
+from app.crud.pagination import InvalidPageTokenError
+from app.crud.updates import VersionConflictError
+from app.crud.async_crud import AsyncBayAllocator, AsyncBookingCRUD, AsyncServiceCenterCRUD
+from app.non_crud_lib.capacity_planner import CapacityPlanner, parse_working_hours
 
 router = APIRouter(prefix="/service-centers", tags=["service-centers"])
 
-service_center_crud = ServiceCenterCRUD()
+service_center_crud = AsyncServiceCenterCRUD()
+booking_crud = AsyncBookingCRUD()
+bay_allocator = AsyncBayAllocator()
+capacity_planner = CapacityPlanner()
 
 @router.post("/", response_model=ServiceCenter)
 async def create_service_center(service_center_data: ServiceCenterCreate):
     """Create a new service center"""
-    return service_center_crud.create_service_center(service_center_data)
+    return await service_center_crud.create_service_center(service_center_data)
 
-@router.get("/", response_model=List[ServiceCenter])
-async def get_all_service_centers():
-    """Get all service centers"""
-    return service_center_crud.get_all_service_centers()
+@router.get("/", response_model=Page[ServiceCenter])
+async def get_all_service_centers(
+    limit: int = Query(config.DEFAULT_PAGE_SIZE, ge=1, le=config.MAX_PAGE_SIZE),
+    next_token: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """Get a page of service centers; pass next_token back to fetch the following page"""
+    projection = parse_fields_param(fields, ServiceCenter, 'service_center_id')
+    try:
+        service_centers, next_token = await service_center_crud.get_service_centers_page(limit, next_token, projection)
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if projection:
+        return sparse_response({'items': service_centers, 'next_token': next_token})
+    return Page(items=service_centers, next_token=next_token)
+
+@router.post("/batch-get", response_model=BatchGetResponse[ServiceCenter])
+async def batch_get_service_centers(request: BatchGetRequest):
+    """Get many service centers by ID in one request, in the order requested"""
+    check_batch_size(request.ids)
+    try:
+        service_centers = await service_center_crud.get_service_centers_by_ids(request.ids)
+    except BatchReadError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    found_ids = {service_center.service_center_id for service_center in service_centers}
+    return BatchGetResponse(
+        items=service_centers,
+        missing_ids=[service_center_id for service_center_id in dict.fromkeys(request.ids) if service_center_id not in found_ids]
+    )
+
+@router.get("/export")
+async def export_service_centers(segments: int = Query(config.SCAN_SEGMENTS, ge=1, le=config.MAX_SCAN_SEGMENTS)):
+    """Stream all service centers as NDJSON, one record per line, read as a parallel segmented scan"""
+    return ndjson_response(service_center_crud.wrapped.iter_service_center_pages(segments), "service-centers.ndjson")
+
+@router.get("/availability", response_model=List[AvailableSlot])
+async def search_availability(
+    city: str,
+    service_type: ServiceType,
+    from_date: Optional[date] = None,
+    days: int = Query(7, ge=1, le=config.MAX_AVAILABILITY_DAYS),
+    limit: int = Query(5, ge=1, le=config.MAX_AVAILABILITY_RESULTS)
+):
+    """Earliest free slots for a service at the service centers of a city, soonest first"""
+    # Centers offering the service, with their opening hours (from the replica - no table reads)
+    candidates = []
+    for service_center in await service_center_crud.get_service_centers_by_city(city):
+        hours = parse_working_hours(service_center.working_hours)
+        if hours and service_type.value in service_center.services_offered:
+            candidates.append((service_center, hours))
+    
+    duration = capacity_planner.duration_minutes(service_type)
+    earliest = datetime.now() + timedelta(hours=1)  # Bookings must be made at least an hour ahead
+    first_day = max(from_date or earliest.date(), earliest.date())
+    
+    slots = []
+    for offset in range(days):
+        booking_date = first_day + timedelta(days=offset)
+        not_before = earliest.hour * 60 + earliest.minute if booking_date == earliest.date() else 0
+        
+        # One scan of each center's cached occupancy bitmaps; days not cached yet load concurrently
+        free_starts = await asyncio.gather(*[
+            bay_allocator.free_starts(
+                service_center.service_center_id,
+                capacity_planner.bays_for(service_center),
+                booking_date.isoformat(),
+                max(opening, not_before),
+                closing,
+                duration
+            )
+            for service_center, (opening, closing) in candidates
+        ])
+        
+        day_slots = [
+            (start, service_center.name, service_center.service_center_id, free_bays)
+            for (service_center, _), starts in zip(candidates, free_starts)
+            for start, free_bays in starts
+        ]
+        day_slots.sort()
+        slots.extend(
+            AvailableSlot(
+                service_center_id=service_center_id,
+                service_center_name=name,
+                booking_date=booking_date.isoformat(),
+                scheduled_time=f"{start // 60:02d}:{start % 60:02d}:00",
+                free_bays=free_bays
+            )
+            for start, name, service_center_id, free_bays in day_slots[:limit - len(slots)]
+        )
+        if len(slots) >= limit:
+            break
+    
+    return slots
 
 @router.get("/{service_center_id}", response_model=ServiceCenter)
-async def get_service_center(service_center_id: str):
+async def get_service_center(
+    service_center_id: str,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get service center by ID"""
-    service_center = service_center_crud.get_service_center(service_center_id)
+    projection = parse_fields_param(fields, ServiceCenter, 'service_center_id')
+    service_center = await service_center_crud.get_service_center(service_center_id, projection)
     if not service_center:
         raise HTTPException(status_code=404, detail="Service center not found")
+    if projection:
+        return sparse_response(service_center)
+    response.headers["ETag"] = format_etag(service_center.version)
     return service_center
 
 @router.put("/{service_center_id}", response_model=ServiceCenter)
-async def update_service_center(service_center_id: str, service_center_data: ServiceCenterUpdate):
-    """Update service center"""
-    service_center = service_center_crud.update_service_center(service_center_id, service_center_data)
+async def update_service_center(
+    service_center_id: str,
+    service_center_data: ServiceCenterUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """Update service center; send If-Match with the ETag from a previous read to reject concurrent changes"""
+    try:
+        service_center = await service_center_crud.update_service_center(service_center_id, service_center_data, parse_if_match(if_match))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     if not service_center:
         raise HTTPException(status_code=404, detail="Service center not found")
+    response.headers["ETag"] = format_etag(service_center.version)
     return service_center
 
 @router.delete("/{service_center_id}")
 async def delete_service_center(service_center_id: str):
     """Delete service center"""
-    success = service_center_crud.delete_service_center(service_center_id)
+    success = await service_center_crud.delete_service_center(service_center_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete service center")
     return {"message": "Service center deleted successfully"}
 
+@router.get("/{service_center_id}/bookings", response_model=Page[Booking])
+async def get_service_center_bookings(
+    service_center_id: str,
+    from_: Optional[str] = Query(None, alias="from", description="Date or datetime (ISO 8601); default today"),
+    to: Optional[str] = Query(None, description="Date or datetime (ISO 8601), inclusive; default the end of the from day"),
+    status: Optional[BookingStatus] = None,
+    limit: int = Query(config.DEFAULT_PAGE_SIZE, ge=1, le=config.MAX_PAGE_SIZE),
+    next_token: Optional[str] = None
+):
+    """A service center's bookings in a date/time range, in schedule order; pass next_token back for more"""
+    start = _range_bound(from_ or date.today().isoformat(), 'from', end=False)
+    end = _range_bound(to or start[:10], 'to', end=True)
+    if start > end:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    
+    if not await service_center_crud.get_service_center(service_center_id):
+        raise HTTPException(status_code=404, detail="Service center not found")
+    try:
+        bookings, next_token = await booking_crud.get_service_center_schedule_page(
+            service_center_id, start, end, limit, next_token, status
+        )
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=bookings, next_token=next_token)
+
+def _range_bound(value: str, name: str, end: bool) -> str:
+    """
+    Turn a from/to parameter into a bound comparable with booking_datetime strings.
+    A bare date means the start of that day for from and its end for to.
+    """
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 date or datetime")
+    if moment.tzinfo:
+        raise HTTPException(status_code=400, detail=f"{name} must be a local time without a UTC offset")
+    if len(value) == 10:
+        return f"{moment.date().isoformat()}T23:59:59.999999" if end else moment.date().isoformat()
+    # Minute precision for a whole-minute start also matches times stored without seconds ("10:00")
+    if not end and not moment.second and not moment.microsecond:
+        return moment.strftime('%Y-%m-%dT%H:%M')
+    return moment.isoformat()
+
 @router.get("/city/{city}", response_model=List[ServiceCenter])
 async def get_service_centers_by_city(city: str):
     """Get service centers by city"""
-    return service_center_crud.get_service_centers_by_city(city)
\ No newline at end of file
+    return await service_center_crud.get_service_centers_by_city(city)
+
+@router.get("/state/{state}", response_model=List[ServiceCenter])
+async def get_service_centers_by_state(state: str):
+    """Get service centers by state"""
+    return await service_center_crud.get_service_centers_by_state(state)
+
+@router.get("/service/{service_type}", response_model=List[ServiceCenter])
+async def get_service_centers_by_service(service_type: str):
+    """Get service centers that offer a service type"""
+    return await service_center_crud.get_service_centers_by_service(service_type)
@@ -0,0 +1,23 @@
+from typing import Iterable, Iterator, List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def _ndjson_chunks(pages: Iterable[List[BaseModel]]) -> Iterator[str]:
+    """Serialize each page of models as newline-delimited JSON as soon as it arrives"""
+    for page in pages:
+        if page:
+            yield "".join(model.json() + "\n" for model in page)
+
+def ndjson_response(pages: Iterable[List[BaseModel]], filename: str) -> StreamingResponse:
+    """
+    Stream pages of models as NDJSON.
+    The page iterator is synchronous, so Starlette drives it from its thread pool
+    and only one page is ever held in memory.
+    """
+    return StreamingResponse(
+        _ndjson_chunks(pages),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import List
+from fastapi import APIRouter, HTTPException, Header, Query, Response, UploadFile, File
+from typing import List, Optional
+from app.config import config
+from app.models.batch import BatchCreateResponse, BatchGetRequest, BatchGetResponse
+from app.models.pagination import Page
 from app.models.vehicle import Vehicle, VehicleCreate, VehicleUpdate
-from app.crud.vehicle_crud import VehicleCRUD
-from app.non_crud_lib.storage_service import StorageService
+from app.api.batch_results import build_batch_response, check_batch_size
+from app.api.etags import format_etag, parse_if_match
+from app.api.fields import FIELDS_DESCRIPTION, parse_fields_param, sparse_response
+from app.api.streaming import ndjson_response
+from app.crud.batch import BatchReadError
+from app.crud.pagination import InvalidPageTokenError
+from app.crud.updates import VersionConflictError
+from app.crud.async_crud import AsyncVehicleCRUD
+from app.non_crud_lib.async_services import AsyncStorageService
 from app.non_crud_lib.validator import Validator
 
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
-vehicle_crud = VehicleCRUD()
-storage_service = StorageService()
+vehicle_crud = AsyncVehicleCRUD()
+storage_service = AsyncStorageService()
 validator = Validator()
 
 @router.post("/", response_model=Vehicle)
@@ -26,34 +36,107 @@ async def create_vehicle(vehicle_data: VehicleCreate):
             raise HTTPException(status_code=400, detail=vin_validation['message'])
     
     # Create vehicle (CRUD)
-    vehicle = vehicle_crud.create_vehicle(vehicle_data)
+    vehicle = await vehicle_crud.create_vehicle(vehicle_data)
     return vehicle
 
-@router.get("/", response_model=List[Vehicle])
-async def get_all_vehicles():
-    """Get all vehicles"""
-    return vehicle_crud.get_all_vehicles()
+@router.post("/batch", response_model=BatchCreateResponse)
+async def batch_create_vehicles(vehicles_data: List[VehicleCreate]):
+    """Create many vehicles at once; every item is validated before any is written"""
+    check_batch_size(vehicles_data)
+    
+    # Validate registration numbers and VINs (NON-CRUD)
+    invalid = {}
+    valid = []
+    for index, vehicle_data in enumerate(vehicles_data):
+        reg_validation = validator.validate_vehicle_registration(vehicle_data.registration_number)
+        if not reg_validation['is_valid']:
+            invalid[index] = reg_validation['message']
+            continue
+        if vehicle_data.vin:
+            vin_validation = validator.validate_vin(vehicle_data.vin)
+            if not vin_validation['is_valid']:
+                invalid[index] = vin_validation['message']
+                continue
+        valid.append((index, vehicle_data))
+    
+    # Create vehicles in batches of 25 (CRUD)
+    vehicles, failed = await vehicle_crud.batch_create_vehicles([vehicle_data for _, vehicle_data in valid])
+    written = [(index, vehicle.vehicle_id) for (index, _), vehicle in zip(valid, vehicles)]
+    
+    return build_batch_response(len(vehicles_data), invalid, written, failed)
+
+@router.get("/", response_model=Page[Vehicle])
+async def get_all_vehicles(
+    limit: int = Query(config.DEFAULT_PAGE_SIZE, ge=1, le=config.MAX_PAGE_SIZE),
+    next_token: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """Get a page of vehicles; pass next_token back to fetch the following page"""
+    projection = parse_fields_param(fields, Vehicle, 'vehicle_id')
+    try:
+        vehicles, next_token = await vehicle_crud.get_vehicles_page(limit, next_token, projection)
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if projection:
+        return sparse_response({'items': vehicles, 'next_token': next_token})
+    return Page(items=vehicles, next_token=next_token)
+
+@router.post("/batch-get", response_model=BatchGetResponse[Vehicle])
+async def batch_get_vehicles(request: BatchGetRequest):
+    """Get many vehicles by ID in one request, in the order requested"""
+    check_batch_size(request.ids)
+    try:
+        vehicles = await vehicle_crud.get_vehicles_by_ids(request.ids)
+    except BatchReadError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    found_ids = {vehicle.vehicle_id for vehicle in vehicles}
+    return BatchGetResponse(
+        items=vehicles,
+        missing_ids=[vehicle_id for vehicle_id in dict.fromkeys(request.ids) if vehicle_id not in found_ids]
+    )
+
+@router.get("/export")
+async def export_vehicles(segments: int = Query(config.SCAN_SEGMENTS, ge=1, le=config.MAX_SCAN_SEGMENTS)):
+    """Stream all vehicles as NDJSON, one record per line, read as a parallel segmented scan"""
+    return ndjson_response(vehicle_crud.wrapped.iter_vehicle_pages(segments), "vehicles.ndjson")
 
 @router.get("/{vehicle_id}", response_model=Vehicle)
-async def get_vehicle(vehicle_id: str):
+async def get_vehicle(
+    vehicle_id: str,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get vehicle by ID"""
-    vehicle = vehicle_crud.get_vehicle(vehicle_id)
+    projection = parse_fields_param(fields, Vehicle, 'vehicle_id')
+    vehicle = await vehicle_crud.get_vehicle(vehicle_id, projection)
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
+    if projection:
+        return sparse_response(vehicle)
+    response.headers["ETag"] = format_etag(vehicle.version)
     return vehicle
 
 @router.put("/{vehicle_id}", response_model=Vehicle)
-async def update_vehicle(vehicle_id: str, vehicle_data: VehicleUpdate):
-    """Update vehicle"""
-    vehicle = vehicle_crud.update_vehicle(vehicle_id, vehicle_data)
+async def update_vehicle(
+    vehicle_id: str,
+    vehicle_data: VehicleUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """Update vehicle; send If-Match with the ETag from a previous read to reject concurrent changes"""
+    try:
+        vehicle = await vehicle_crud.update_vehicle(vehicle_id, vehicle_data, parse_if_match(if_match))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
+    response.headers["ETag"] = format_etag(vehicle.version)
     return vehicle
 
 @router.delete("/{vehicle_id}")
 async def delete_vehicle(vehicle_id: str):
     """Delete vehicle"""
-    success = vehicle_crud.delete_vehicle(vehicle_id)
+    success = await vehicle_crud.delete_vehicle(vehicle_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete vehicle")
     return {"message": "Vehicle deleted successfully"}
@@ -61,12 +144,12 @@ async def delete_vehicle(vehicle_id: str):
 @router.post("/{vehicle_id}/upload-image")
 async def upload_vehicle_image(vehicle_id: str, file: UploadFile = File(...)):
     """Upload vehicle image (NON-CRUD - S3)"""
-    vehicle = vehicle_crud.get_vehicle(vehicle_id)
+    vehicle = await vehicle_crud.get_vehicle(vehicle_id)
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     
     file_content = await file.read()
-    result = storage_service.upload_vehicle_image(
+    result = await storage_service.upload_vehicle_image(
         vehicle_id=vehicle_id,
         image_content=file_content,
         image_name=file.filename
@@ -80,7 +163,7 @@ async def upload_vehicle_image(vehicle_id: str, file: UploadFile = File(...)):
 @router.get("/{vehicle_id}/validate")
 async def validate_vehicle(vehicle_id: str):
     """Validate vehicle details (NON-CRUD)"""
-    vehicle = vehicle_crud.get_vehicle(vehicle_id)
+    vehicle = await vehicle_crud.get_vehicle(vehicle_id)
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     
@@ -96,4 +179,4 @@ async def validate_vehicle(vehicle_id: str):
 @router.get("/customer/{customer_id}", response_model=List[Vehicle])
 async def get_customer_vehicles(customer_id: str):
     """Get all vehicles for a customer"""
-    return vehicle_crud.get_vehicles_by_customer(customer_id)
\ No newline at end of file
+    return await vehicle_crud.get_vehicles_by_customer(customer_id)
\ No newline at end of file
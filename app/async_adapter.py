@@ -0,0 +1,72 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.config import config
+
+# Bounded thread pool for blocking boto3 calls made from async routes.
+# Sized to match the AWS connection pool so offloaded calls never queue on it.
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared I/O executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.ASYNC_IO_WORKERS,
+                    thread_name_prefix='aws-io'
+                )
+    return _executor
+
+def shutdown_executor():
+    """Stop the shared I/O executor (called on application shutdown)"""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking function on the I/O executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+class AsyncAdapter:
+    """
+    Async facade over a synchronous CRUD class or AWS service.
+    Every public method keeps its signature but returns an awaitable that runs
+    the original call on the bounded I/O executor.
+    """
+    
+    def __init__(self, wrapped: Any):
+        self._wrapped = wrapped
+    
+    @property
+    def wrapped(self) -> Any:
+        """The underlying synchronous instance"""
+        return self._wrapped
+    
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._wrapped, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await run_blocking(attr, *args, **kwargs)
+        
+        return method
+
+def _reset_after_fork():
+    """Executor threads do not survive fork; let the child build its own pool"""
+    global _lock, _executor
+    _lock = threading.Lock()
+    _executor = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
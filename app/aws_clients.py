@@ -0,0 +1,105 @@
+import os
+import threading
+from typing import Any, Dict
+import boto3
+from botocore.config import Config as BotocoreConfig
+from app.config import config
+
+# Process-wide boto3 session and clients, per-thread resources.
+# Clients are thread-safe and each one owns a urllib3 connection pool, so every
+# module shares one warm pool per AWS service instead of building its own.
+# Resources are not thread-safe: each thread gets its own resource (and Table
+# objects), all wrapping the one shared client of their service.
+_lock = threading.RLock()
+_session = None
+_clients: Dict[str, Any] = {}
+_resources: Dict[str, Any] = {}  # First resource per service; only its class and client are reused
+_local = threading.local()
+
+def get_botocore_config() -> BotocoreConfig:
+    """Connection pool, keep-alive, timeout and retry settings for all clients"""
+    return BotocoreConfig(
+        max_pool_connections=config.AWS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=config.AWS_TCP_KEEPALIVE,
+        connect_timeout=config.AWS_CONNECT_TIMEOUT,
+        read_timeout=config.AWS_READ_TIMEOUT,
+        retries={
+            'max_attempts': config.AWS_MAX_RETRY_ATTEMPTS,
+            'mode': config.AWS_RETRY_MODE
+        }
+    )
+
+def get_session() -> boto3.session.Session:
+    """Get the shared boto3 session"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session_config = config.get_boto3_config()
+                session_config.pop('endpoint_url', None)
+                _session = boto3.session.Session(**session_config)
+    return _session
+
+def get_client(service_name: str):
+    """Get the shared low-level client for an AWS service"""
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = _create(get_session().client, service_name)
+                _clients[service_name] = client
+    return client
+
+def get_resource(service_name: str):
+    """Get this thread's resource for an AWS service, backed by the service's shared client"""
+    resources = _thread_cache('resources')
+    resource = resources.get(service_name)
+    if resource is None:
+        with _lock:
+            template = _resources.get(service_name)
+            if template is None:
+                # Building a resource also builds its client, with the high-level
+                # (e.g. DynamoDB type serialization) handlers registered on it
+                template = _create(get_session().resource, service_name)
+                _resources[service_name] = template
+        resource = type(template)(client=template.meta.client)
+        resources[service_name] = resource
+    return resource
+
+def get_table(table_name: str):
+    """Get this thread's DynamoDB Table object for a table"""
+    tables = _thread_cache('tables')
+    table = tables.get(table_name)
+    if table is None:
+        table = get_resource('dynamodb').Table(table_name)
+        tables[table_name] = table
+    return table
+
+def _thread_cache(name: str) -> Dict[str, Any]:
+    cache = getattr(_local, name, None)
+    if cache is None:
+        cache = {}
+        setattr(_local, name, cache)
+    return cache
+
+def _reset_after_fork():
+    """Drop cached clients in a forked child so it builds its own pools"""
+    global _lock, _session, _local
+    _lock = threading.RLock()
+    _session = None
+    _clients.clear()
+    _resources.clear()
+    _local = threading.local()
+
+def _create(factory, service_name: str):
+    """Build a client or resource with the pooled config and LocalStack endpoint"""
+    params = {'config': get_botocore_config()}
+    endpoint_url = config.get_boto3_config().get('endpoint_url')
+    if endpoint_url:
+        params['endpoint_url'] = endpoint_url
+    return factory(service_name, **params)
+
+# Connection pools must not be shared across forked worker processes
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
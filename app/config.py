@@ -9,16 +9,99 @@ class Config:
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "test")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
     
+    # AWS Client Pooling / Retries
+    AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+    AWS_MAX_RETRY_ATTEMPTS = int(os.getenv("AWS_MAX_RETRY_ATTEMPTS", "5"))
+    AWS_RETRY_MODE = os.getenv("AWS_RETRY_MODE", "adaptive")
+    AWS_CONNECT_TIMEOUT = float(os.getenv("AWS_CONNECT_TIMEOUT", "2"))
+    AWS_READ_TIMEOUT = float(os.getenv("AWS_READ_TIMEOUT", "10"))
+    AWS_TCP_KEEPALIVE = os.getenv("AWS_TCP_KEEPALIVE", "True") == "True"
+    
+    # Worker threads used by the async routes to run blocking AWS calls
+    ASYNC_IO_WORKERS = int(os.getenv("ASYNC_IO_WORKERS", str(AWS_MAX_POOL_CONNECTIONS)))
+    
     # LocalStack Configuration
     USE_LOCALSTACK = os.getenv("USE_LOCALSTACK", "False") == "True"
     LOCALSTACK_ENDPOINT = os.getenv("LOCALSTACK_ENDPOINT", "http://localhost:4566")
     
+    # Storage backend for the CRUD repositories: "dynamodb", "sqlite" (local file) or "memory" (in-process, no AWS)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "dynamodb")
+    
+    # Backend for the notification, queue, scheduler and storage services: "aws" (SNS, SQS, EventBridge, S3) or "memory" (in-process, no AWS)
+    SERVICES_BACKEND = os.getenv("SERVICES_BACKEND", "aws")
+    
+    # SQLite backend (single-node / edge deployments)
+    SQLITE_PATH = os.getenv("SQLITE_PATH", "vehicle_service.db")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_STATEMENT_CACHE_SIZE = int(os.getenv("SQLITE_STATEMENT_CACHE_SIZE", "256"))
+    
     # DynamoDB Tables
     BOOKINGS_TABLE = os.getenv("BOOKINGS_TABLE", "vehicle_bookings")
     VEHICLES_TABLE = os.getenv("VEHICLES_TABLE", "vehicles")
     CUSTOMERS_TABLE = os.getenv("CUSTOMERS_TABLE", "customers")
     SERVICE_CENTERS_TABLE = os.getenv("SERVICE_CENTERS_TABLE", "service_centers")
     
+    SLOT_RESERVATIONS_TABLE = os.getenv("SLOT_RESERVATIONS_TABLE", "slot_reservations")
+    BOOKING_AGGREGATES_TABLE = os.getenv("BOOKING_AGGREGATES_TABLE", "booking_aggregates")
+    
+    # DynamoDB Secondary Indexes (bookings table, sorted by booking_date)
+    BOOKINGS_CUSTOMER_INDEX = os.getenv("BOOKINGS_CUSTOMER_INDEX", "customer_id-booking_date-index")
+    BOOKINGS_VEHICLE_INDEX = os.getenv("BOOKINGS_VEHICLE_INDEX", "vehicle_id-booking_date-index")
+    BOOKINGS_SERVICE_CENTER_INDEX = os.getenv("BOOKINGS_SERVICE_CENTER_INDEX", "service_center_id-booking_date-index")
+    # Sorted by booking_datetime (date + scheduled time) for a center's schedule over a date range
+    BOOKINGS_SCHEDULE_INDEX = os.getenv("BOOKINGS_SCHEDULE_INDEX", "service_center_id-booking_datetime-index")
+    # Partitioned by the day of updated_at, sorted by updated_at, for reading the bookings changed since a point in time
+    BOOKINGS_UPDATED_INDEX = os.getenv("BOOKINGS_UPDATED_INDEX", "updated_day-updated_at-index")
+    
+    # Service Bay Capacity
+    DEFAULT_SERVICE_BAYS = int(os.getenv("DEFAULT_SERVICE_BAYS", "2"))  # For service centers without a bays value
+    SLOT_MINUTES = int(os.getenv("SLOT_MINUTES", "15"))  # Reservation granularity
+    DAY_SCHEDULE_CACHE_TTL = int(os.getenv("DAY_SCHEDULE_CACHE_TTL", "30"))  # Seconds a cached day of reservations is trusted
+    MAX_AVAILABILITY_DAYS = int(os.getenv("MAX_AVAILABILITY_DAYS", "31"))  # Days one availability search may look ahead
+    MAX_AVAILABILITY_RESULTS = int(os.getenv("MAX_AVAILABILITY_RESULTS", "50"))
+    
+    # Reports: "counters" reads the write-time aggregates, "rollups" the incrementally materialized ones,
+    # "columnar" recomputes them from the bookings
+    REPORT_SOURCE = os.getenv("REPORT_SOURCE", "counters")
+    REPORT_REFRESH_SECONDS = float(os.getenv("REPORT_REFRESH_SECONDS", "60"))  # Max age of rollups before a read folds in new changes
+    REPORT_FULL_REFRESH_SECONDS = float(os.getenv("REPORT_FULL_REFRESH_SECONDS", "86400"))  # Full rebuild interval (picks up deletes made by other processes)
+    REPORT_WATERMARK_OVERLAP_SECONDS = float(os.getenv("REPORT_WATERMARK_OVERLAP_SECONDS", "60"))  # Re-read window for in-flight writes
+    REPORT_CHECKPOINT_PATH = os.getenv("REPORT_CHECKPOINT_PATH", "")  # Where rollups are checkpointed; empty keeps them in memory only
+    REPORT_CHECKPOINT_SECONDS = float(os.getenv("REPORT_CHECKPOINT_SECONDS", "300"))  # Checkpoint interval (and at shutdown); 0 = only at shutdown
+    REPORT_PROCESS_WORKERS = int(os.getenv("REPORT_PROCESS_WORKERS", str(os.cpu_count() or 1)))  # Processes for all-centers reports; 1 = in process
+    REPORT_PARALLEL_MIN_BOOKINGS = int(os.getenv("REPORT_PARALLEL_MIN_BOOKINGS", "1000000"))  # Smaller reports are counted in process
+    REPORT_CACHE_MAXSIZE = int(os.getenv("REPORT_CACHE_MAXSIZE", "1000"))  # Reports kept until a booking in their scope changes; 0 disables
+    REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "300"))  # Max age of a cached report (a backstop: other instances' writes are seen through the changes counters); 0 = no expiry
+    REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", "2"))  # Report jobs built at the same time
+    REPORT_JOB_MAX_PENDING = int(os.getenv("REPORT_JOB_MAX_PENDING", "100"))  # Jobs waiting for a worker before submits are refused
+    REPORT_JOB_STORAGE = os.getenv("REPORT_JOB_STORAGE", "local")  # "local" (REPORT_JOB_DIR) or "s3" (the document bucket)
+    REPORT_JOB_DIR = os.getenv("REPORT_JOB_DIR", "report_jobs")
+    
+    # Pagination
+    DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+    
+    # Parallel segmented scans for full-table reads (exports, reports, backfills)
+    SCAN_SEGMENTS = int(os.getenv("SCAN_SEGMENTS", "4"))
+    SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", "4"))
+    MAX_SCAN_SEGMENTS = int(os.getenv("MAX_SCAN_SEGMENTS", "64"))
+    
+    # Read-through entity caches (TTL in seconds; 0 disables)
+    ENTITY_CACHE_MAXSIZE = int(os.getenv("ENTITY_CACHE_MAXSIZE", "10000"))
+    SERVICE_CENTER_CACHE_TTL = float(os.getenv("SERVICE_CENTER_CACHE_TTL", "3600"))
+    CUSTOMER_CACHE_TTL = float(os.getenv("CUSTOMER_CACHE_TTL", "300"))
+    VEHICLE_CACHE_TTL = float(os.getenv("VEHICLE_CACHE_TTL", "60"))
+    
+    # In-memory replica of the service_centers table (refresh interval in seconds; 0 = local writes only)
+    SERVICE_CENTER_REPLICA_ENABLED = os.getenv("SERVICE_CENTER_REPLICA_ENABLED", "True") == "True"
+    SERVICE_CENTER_REPLICA_REFRESH_SECONDS = float(os.getenv("SERVICE_CENTER_REPLICA_REFRESH_SECONDS", "60"))
+    
+    # Batch Operations
+    MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "500"))
+    BATCH_MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", "5"))
+    BATCH_RETRY_BASE_DELAY = float(os.getenv("BATCH_RETRY_BASE_DELAY", "0.05"))
+    BATCH_RETRY_MAX_DELAY = float(os.getenv("BATCH_RETRY_MAX_DELAY", "2"))
+    
     # S3 Configuration
     S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "vehicle-service-documents")
     
@@ -42,7 +125,7 @@ class Config:
         config = {
             'region_name': cls.AWS_REGION,
         }
-        
+    
         if cls.USE_LOCALSTACK:
             config['endpoint_url'] = cls.LOCALSTACK_ENDPOINT
             config['aws_access_key_id'] = 'test'
@@ -51,7 +134,7 @@ class Config:
             if cls.AWS_ACCESS_KEY_ID and cls.AWS_SECRET_ACCESS_KEY:
                 config['aws_access_key_id'] = cls.AWS_ACCESS_KEY_ID
                 config['aws_secret_access_key'] = cls.AWS_SECRET_ACCESS_KEY
-        
+    
         return config
 
 config = Config()
\ No newline at end of file
@@ -0,0 +1,42 @@
+from typing import List
+from app.config import config
+from app.aws_clients import get_resource, get_table
+from app.crud.serialization import to_dynamodb
+from app.non_crud_lib.booking_aggregator import AggregateKey, BookingAggregator, Change, Counters
+
+class BookingAggregatesCRUD:
+    """
+    Booking counters in DynamoDB, one item per (scope, period) with one numeric
+    attribute per counter. Writes are ADD updates, so concurrent bookings never
+    overwrite each other's increments and no read is needed first.
+    """
+    
+    def __init__(self):
+        self.aggregator = BookingAggregator()
+    
+    @property
+    def dynamodb(self):
+        """This thread's DynamoDB resource (resources are not thread-safe)"""
+        return get_resource('dynamodb')
+    
+    @property
+    def table(self):
+        """This thread's Table object"""
+        return get_table(config.BOOKING_AGGREGATES_TABLE)
+    
+    def apply(self, changes: List[Change]):
+        """ADD the net deltas of (old, new) booking writes, one update_item per aggregate touched"""
+        for (scope, period), counters in self.aggregator.deltas(changes).items():
+            names = list(counters)
+            self.table.update_item(
+                Key={'scope': scope, 'period': period},
+                UpdateExpression="ADD " + ", ".join(f"#c{i} :c{i}" for i in range(len(names))),
+                ExpressionAttributeNames={f"#c{i}": name for i, name in enumerate(names)},
+                ExpressionAttributeValues={f":c{i}": to_dynamodb(counters[name]) for i, name in enumerate(names)}
+            )
+    
+    def get(self, key: AggregateKey) -> Counters:
+        """Counters of one aggregate (empty if nothing was ever counted there); strongly consistent"""
+        scope, period = key
+        item = self.table.get_item(Key={'scope': scope, 'period': period}, ConsistentRead=True).get('Item', {})
+        return {name: float(value) for name, value in item.items() if name not in ('scope', 'period')}
@@ -0,0 +1,55 @@
+from app.async_adapter import AsyncAdapter
+from app.crud.bay_allocator import BayAllocator, get_bay_allocator
+from app.crud.factory import get_booking_crud, get_customer_crud, get_service_center_crud, get_vehicle_crud
+from app.crud.report_builder import ReportBuilder
+from app.crud.report_jobs import ReportJobRunner, get_report_job_runner
+from app.crud.report_materializer import ReportMaterializer, get_report_materializer
+from app.crud.repository import BookingRepository, CustomerRepository, ServiceCenterRepository, VehicleRepository
+
+class AsyncBookingCRUD(AsyncAdapter):
+    """Booking repository with awaitable methods (the configured backend by default)"""
+    
+    def __init__(self, booking_crud: BookingRepository = None):
+        super().__init__(booking_crud or get_booking_crud())
+
+class AsyncVehicleCRUD(AsyncAdapter):
+    """Vehicle repository with awaitable methods (the configured backend by default)"""
+    
+    def __init__(self, vehicle_crud: VehicleRepository = None):
+        super().__init__(vehicle_crud or get_vehicle_crud())
+
+class AsyncCustomerCRUD(AsyncAdapter):
+    """Customer repository with awaitable methods (the configured backend by default)"""
+    
+    def __init__(self, customer_crud: CustomerRepository = None):
+        super().__init__(customer_crud or get_customer_crud())
+
+class AsyncServiceCenterCRUD(AsyncAdapter):
+    """Service center repository with awaitable methods (the configured backend by default)"""
+    
+    def __init__(self, service_center_crud: ServiceCenterRepository = None):
+        super().__init__(service_center_crud or get_service_center_crud())
+
+class AsyncBayAllocator(AsyncAdapter):
+    """Bay allocator with awaitable methods (the shared allocator by default)"""
+    
+    def __init__(self, bay_allocator: BayAllocator = None):
+        super().__init__(bay_allocator or get_bay_allocator())
+
+class AsyncReportMaterializer(AsyncAdapter):
+    """Report materializer with awaitable methods (the shared materializer by default)"""
+    
+    def __init__(self, report_materializer: ReportMaterializer = None):
+        super().__init__(report_materializer or get_report_materializer())
+
+class AsyncReportBuilder(AsyncAdapter):
+    """Report builder with awaitable methods, so building a report never blocks the event loop"""
+    
+    def __init__(self, report_builder: ReportBuilder = None):
+        super().__init__(report_builder or ReportBuilder())
+
+class AsyncReportJobRunner(AsyncAdapter):
+    """Report job runner with awaitable methods (the shared runner by default)"""
+    
+    def __init__(self, report_job_runner: ReportJobRunner = None):
+        super().__init__(report_job_runner or get_report_job_runner())
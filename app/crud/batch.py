@@ -0,0 +1,78 @@
+import time
+from typing import Any, Dict, List
+from botocore.exceptions import ClientError
+from app.config import config
+
+# DynamoDB's per-request limits for BatchWriteItem and BatchGetItem
+BATCH_WRITE_CHUNK_SIZE = 25
+BATCH_GET_CHUNK_SIZE = 100
+
+class BatchReadError(Exception):
+    """Raised when BatchGetItem still leaves keys unprocessed after all retries (throttling)"""
+    
+    def __init__(self, table_name: str, unprocessed_ids: List[str]):
+        self.unprocessed_ids = unprocessed_ids
+        super().__init__(f"{len(unprocessed_ids)} keys of {table_name} could not be read, try again later")
+
+def batch_put_items(dynamodb, table_name: str, items: List[Dict[str, Any]], key_name: str) -> Dict[str, str]:
+    """
+    Write items with BatchWriteItem in chunks of 25, retrying UnprocessedItems
+    with exponential backoff. Returns {key: error} for items that were not written.
+    """
+    failed = {}
+    
+    for start in range(0, len(items), BATCH_WRITE_CHUNK_SIZE):
+        chunk = items[start:start + BATCH_WRITE_CHUNK_SIZE]
+        request_items = {table_name: [{'PutRequest': {'Item': item}} for item in chunk]}
+        attempt = 0
+        
+        while request_items:
+            try:
+                response = dynamodb.batch_write_item(RequestItems=request_items)
+            except ClientError as e:
+                for request in request_items[table_name]:
+                    failed[request['PutRequest']['Item'][key_name]] = str(e)
+                break
+            
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items:
+                break
+            
+            attempt += 1
+            if attempt > config.BATCH_MAX_RETRIES:
+                for request in request_items.get(table_name, []):
+                    failed[request['PutRequest']['Item'][key_name]] = 'Write not processed after retries'
+                break
+            time.sleep(min(config.BATCH_RETRY_BASE_DELAY * 2 ** (attempt - 1), config.BATCH_RETRY_MAX_DELAY))
+    
+    return failed
+
+def batch_get_items(dynamodb, table_name: str, key_name: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Read items by primary key with BatchGetItem in chunks of 100, retrying
+    UnprocessedKeys with exponential backoff. Returns {key: item} for the items found;
+    raises BatchReadError if keys are still unprocessed after config.BATCH_MAX_RETRIES.
+    """
+    found = {}
+    unique_ids = list(dict.fromkeys(ids))  # BatchGetItem rejects duplicate keys
+    
+    for start in range(0, len(unique_ids), BATCH_GET_CHUNK_SIZE):
+        chunk = unique_ids[start:start + BATCH_GET_CHUNK_SIZE]
+        request_items = {table_name: {'Keys': [{key_name: item_id} for item_id in chunk]}}
+        attempt = 0
+        
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(table_name, []):
+                found[item[key_name]] = item
+            
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                break
+            
+            attempt += 1
+            if attempt > config.BATCH_MAX_RETRIES:
+                raise BatchReadError(table_name, [key[key_name] for key in request_items[table_name]['Keys']])
+            time.sleep(min(config.BATCH_RETRY_BASE_DELAY * 2 ** (attempt - 1), config.BATCH_RETRY_MAX_DELAY))
+    
+    return found
@@ -0,0 +1,95 @@
+import threading
+from typing import List, Optional, Tuple
+from app.config import config
+from app.crud.cache import TTLCache
+from app.crud.factory import get_slot_reservation_crud
+from app.crud.repository import SlotReservationRepository
+from app.non_crud_lib.capacity_planner import CapacityPlanner, DaySchedule, Slot
+
+class BayAllocator:
+    """
+    Reserves a service bay for a booking. A cached interval index per service
+    center and day (DaySchedule) picks bays that look free without a database
+    round trip; the atomic reservation write is what guarantees that two
+    concurrent requests, in any process, never get the same bay and time.
+    """
+    
+    def __init__(self, reservations: SlotReservationRepository, planner: CapacityPlanner = None):
+        self.reservations = reservations
+        self.planner = planner or CapacityPlanner()
+        self.schedules = TTLCache(config.ENTITY_CACHE_MAXSIZE, config.DAY_SCHEDULE_CACHE_TTL)
+        self._lock = threading.Lock()
+    
+    def reserve(self, service_center_id: str, bays: int, slot: Slot, holder: str) -> Optional[int]:
+        """
+        Reserve the lowest free bay for slot and return it, or None if every bay
+        is taken. Keys holder already owns (e.g. when rescheduling) count as free.
+        """
+        day_key = self.planner.day_key(service_center_id, slot.booking_date)
+    
+        # A lost race means our view of the day is stale: reload it once and retry
+        for refresh in (False, True):
+            schedule = self._schedule(day_key, bays, refresh)
+            with self._lock:
+                candidates = schedule.free_bays(slot.start_minute, slot.end_minute, ignore_holder=holder)
+    
+            for bay in candidates:
+                if self.reservations.reserve(day_key, self.planner.slot_keys(slot, bay), holder):
+                    with self._lock:
+                        schedule.remove(holder)
+                        schedule.add(bay, slot.start_minute, slot.end_minute, holder)
+                    return bay
+        return None
+    
+    def release(self, service_center_id: str, slot: Slot, bay: int, holder: str, keep: Optional[Slot] = None, keep_bay: Optional[int] = None):
+        """
+        Free holder's reservation of slot on bay. When holder has just moved to
+        keep/keep_bay on the same day, the keys the two share stay reserved.
+        """
+        day_key = self.planner.day_key(service_center_id, slot.booking_date)
+        keys = self.planner.slot_keys(slot, bay)
+        same_day = keep is not None and keep.booking_date == slot.booking_date
+        if same_day:
+            kept = set(self.planner.slot_keys(keep, keep_bay))
+            keys = [key for key in keys if key not in kept]
+    
+        self.reservations.release(day_key, keys, holder)
+    
+        if not same_day:
+            schedule = self.schedules.get(day_key)
+            if schedule is not None:
+                with self._lock:
+                    schedule.remove(holder)
+    
+    def free_starts(
+        self,
+        service_center_id: str,
+        bays: int,
+        booking_date: str,
+        opening: int,
+        closing: int,
+        duration: int
+    ) -> List[Tuple[int, int]]:
+        """[(start minute, free bays)] on booking_date for a job of duration minutes within opening hours"""
+        schedule = self._schedule(self.planner.day_key(service_center_id, booking_date), bays)
+        with self._lock:
+            return schedule.free_starts(opening, closing, duration)
+    
+    def _schedule(self, day_key: str, bays: int, refresh: bool = False) -> DaySchedule:
+        schedule = None if refresh else self.schedules.get(day_key)
+        if schedule is None or schedule.bays != bays:
+            schedule = self.planner.schedule_from_reservations(bays, self.reservations.get_reservations(day_key))
+            self.schedules.set(day_key, schedule)
+        return schedule
+
+_lock = threading.Lock()
+_allocator: Optional[BayAllocator] = None
+
+def get_bay_allocator() -> BayAllocator:
+    """Shared allocator, so every route reads and updates the same cached day schedules"""
+    global _allocator
+    if _allocator is None:
+        with _lock:
+            if _allocator is None:
+                _allocator = BayAllocator(get_slot_reservation_crud())
+    return _allocator
@@ -1,101 +1,278 @@
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
 import uuid
 from app.config import config
-from app.models.booking import Booking, BookingCreate, BookingUpdate
+from app.aws_clients import get_resource, get_table
+from app.crud.aggregates_crud import BookingAggregatesCRUD
+from app.crud.batch import batch_get_items, batch_put_items
+from app.crud.pagination import query_page, scan_page
+from app.crud.parallel_scan import parallel_scan_pages
+from app.crud.projection import partial_model, projection_params
+from app.crud.repository import BookingRepository
+from app.crud.serialization import to_dynamodb
+from app.crud.updates import VersionConflictError, update_existing_item, updated_item
+from app.models.booking import Booking, BookingCreate, BookingStatus, BookingUpdate, booking_datetime
+from app.non_crud_lib.booking_aggregator import AggregateKey, Change, Counters
 
-class BookingCRUD:
+def _updated_day(updated_at: str) -> str:
+    """Partition key of the updated index: the day part of an ISO updated_at"""
+    return updated_at[:10]
+
+class BookingCRUD(BookingRepository):
+    """Booking repository backed by DynamoDB"""
+    
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
-        self.table = self.dynamodb.Table(config.BOOKINGS_TABLE)
+        super().__init__()
+        self.aggregates = BookingAggregatesCRUD()
     
-    def create_booking(self, booking_data: BookingCreate) -> Booking:
-        """Create a new booking"""
-        booking_id = str(uuid.uuid4())
+    @property
+    def dynamodb(self):
+        """This thread's DynamoDB resource (resources are not thread-safe)"""
+        return get_resource('dynamodb')
+    
+    @property
+    def table(self):
+        """This thread's Table object"""
+        return get_table(config.BOOKINGS_TABLE)
+    
+    def create_booking(
+        self,
+        booking_data: BookingCreate,
+        estimated_cost: Optional[float] = None,
+        booking_id: Optional[str] = None,
+        bay: Optional[int] = None
+    ) -> Booking:
+        """Create a new booking with all derived fields in a single conditional write"""
+        booking_id = booking_id or str(uuid.uuid4())
         timestamp = datetime.utcnow().isoformat()
-        
+    
         booking = Booking(
             booking_id=booking_id,
             **booking_data.dict(),
+            estimated_cost=estimated_cost,
+            bay=bay,
             created_at=timestamp,
-            updated_at=timestamp
+            updated_at=timestamp,
+            version=1
         )
-        
-        self.table.put_item(Item=booking.dict())
+    
+        self.table.put_item(
+            Item=self._to_item(booking),
+            ConditionExpression=Attr('booking_id').not_exists()
+        )
+        self._count([(None, booking)])
         return booking
     
-    def get_booking(self, booking_id: str) -> Optional[Booking]:
-        """Get booking by ID"""
-        response = self.table.get_item(Key={'booking_id': booking_id})
-        
+    def batch_create_bookings(
+        self,
+        bookings_data: List[BookingCreate],
+        estimated_costs: Optional[List[Optional[float]]] = None,
+        booking_ids: Optional[List[str]] = None,
+        bays: Optional[List[Optional[int]]] = None
+    ) -> Tuple[List[Booking], Dict[str, str]]:
+        """Create many bookings with BatchWriteItem; also returns {booking_id: error} for writes that failed"""
+        timestamp = datetime.utcnow().isoformat()
+        estimated_costs = estimated_costs or [None] * len(bookings_data)
+        booking_ids = booking_ids or [str(uuid.uuid4()) for _ in bookings_data]
+        bays = bays or [None] * len(bookings_data)
+    
+        bookings = [
+            Booking(
+                booking_id=booking_id,
+                **booking_data.dict(),
+                estimated_cost=estimated_cost,
+                bay=bay,
+                created_at=timestamp,
+                updated_at=timestamp,
+                version=1
+            )
+            for booking_data, estimated_cost, booking_id, bay in zip(bookings_data, estimated_costs, booking_ids, bays)
+        ]
+    
+        failed = batch_put_items(
+            self.dynamodb,
+            config.BOOKINGS_TABLE,
+            [self._to_item(booking) for booking in bookings],
+            'booking_id'
+        )
+        self._count([(None, booking) for booking in bookings if booking.booking_id not in failed])
+        return bookings, failed
+    
+    def get_booking(self, booking_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Booking]:
+        """Get booking by ID; fields limits the attributes read and returned"""
+        response = self.table.get_item(Key={'booking_id': booking_id}, **projection_params(fields))
+    
         if 'Item' in response:
-            return Booking(**response['Item'])
+            model = partial_model(Booking, fields) if fields else Booking
+            return model(**response['Item'])
         return None
     
-    def get_all_bookings(self) -> List[Booking]:
-        """Get all bookings"""
-        response = self.table.scan()
-        bookings = [Booking(**item) for item in response.get('Items', [])]
-        
-        # Handle pagination
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            bookings.extend([Booking(**item) for item in response.get('Items', [])])
-        
-        return bookings
+    def get_bookings_by_ids(self, booking_ids: List[str]) -> List[Booking]:
+        """Get many bookings with BatchGetItem, in the requested order (each once; missing IDs are skipped)"""
+        items = batch_get_items(self.dynamodb, config.BOOKINGS_TABLE, 'booking_id', booking_ids)
+        return [Booking(**items[booking_id]) for booking_id in dict.fromkeys(booking_ids) if booking_id in items]
+    
+    def get_bookings_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """Get one page of bookings and the token for the next page; fields limits the attributes read"""
+        items, next_token = scan_page(self.table, limit, next_token, **projection_params(fields))
+        model = partial_model(Booking, fields) if fields else Booking
+        return [model(**item) for item in items], next_token
+    
+    def iter_booking_pages(self, segments: int = 1) -> Iterator[List[Booking]]:
+        """
+        Stream all bookings page by page without holding the whole table in memory.
+        With segments > 1 the table is read as a parallel segmented scan.
+        """
+        for items in parallel_scan_pages(self.table, segments, config.SCAN_WORKERS):
+            yield [Booking(**item) for item in items]
+    
+    def iter_bookings_updated_since(self, since: str) -> Iterator[List[Booking]]:
+        """
+        Query the updated index one day partition at a time, from the day of since
+        through tomorrow (a writer's clock may run slightly ahead of ours).
+        Bookings never written since updated_day was introduced are not indexed.
+        """
+        day = datetime.fromisoformat(since).date()
+        last_day = datetime.utcnow().date() + timedelta(days=1)
+        while day <= last_day:
+            query_params = {
+                'IndexName': config.BOOKINGS_UPDATED_INDEX,
+                'KeyConditionExpression': Key('updated_day').eq(day.isoformat()) & Key('updated_at').gt(since)
+            }
+            while True:
+                response = self.table.query(**query_params)
+                if response.get('Items'):
+                    yield [Booking(**item) for item in response['Items']]
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            day += timedelta(days=1)
     
     def get_bookings_by_customer(self, customer_id: str) -> List[Booking]:
-        """Get all bookings for a customer"""
-        response = self.table.scan(
-            FilterExpression=Attr('customer_id').eq(customer_id)
-        )
-        return [Booking(**item) for item in response.get('Items', [])]
+        """Get all bookings for a customer, ordered by booking date"""
+        return self._query_index(config.BOOKINGS_CUSTOMER_INDEX, Key('customer_id').eq(customer_id))
     
     def get_bookings_by_vehicle(self, vehicle_id: str) -> List[Booking]:
-        """Get all bookings for a vehicle"""
-        response = self.table.scan(
-            FilterExpression=Attr('vehicle_id').eq(vehicle_id)
+        """Get all bookings for a vehicle, ordered by booking date"""
+        return self._query_index(config.BOOKINGS_VEHICLE_INDEX, Key('vehicle_id').eq(vehicle_id))
+    
+    def get_bookings_by_service_center(self, service_center_id: str) -> List[Booking]:
+        """Get all bookings for a service center, ordered by booking date"""
+        return self._query_index(
+            config.BOOKINGS_SERVICE_CENTER_INDEX,
+            Key('service_center_id').eq(service_center_id)
         )
-        return [Booking(**item) for item in response.get('Items', [])]
     
-    def update_booking(self, booking_id: str, booking_data: BookingUpdate) -> Optional[Booking]:
-        """Update an existing booking"""
-        # Get current booking
-        current_booking = self.get_booking(booking_id)
-        if not current_booking:
-            return None
-        
-        # Update fields
+    def get_service_center_schedule_page(
+        self,
+        service_center_id: str,
+        start: str,
+        end: str,
+        limit: int,
+        next_token: Optional[str] = None,
+        status: Optional[BookingStatus] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """
+        One page of a service center's bookings in [start, end] from a key-condition query
+        on the schedule index. A status filter is applied after the read, so pages may hold
+        fewer than limit items while next_token is still set.
+        """
+        query_params = {
+            'IndexName': config.BOOKINGS_SCHEDULE_INDEX,
+            'KeyConditionExpression': (
+                Key('service_center_id').eq(service_center_id) & Key('booking_datetime').between(start, end)
+            )
+        }
+        if status:
+            query_params['FilterExpression'] = Attr('status').eq(status.value)
+    
+        items, next_token = query_page(self.table, limit, next_token, **query_params)
+        return [Booking(**item) for item in items], next_token
+    
+    def _query_index(self, index_name: str, key_condition) -> List[Booking]:
+        """Query a secondary index, following LastEvaluatedKey across pages"""
+        query_params = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition
+        }
+    
+        response = self.table.query(**query_params)
+        bookings = [Booking(**item) for item in response.get('Items', [])]
+    
+        while 'LastEvaluatedKey' in response:
+            response = self.table.query(ExclusiveStartKey=response['LastEvaluatedKey'], **query_params)
+            bookings.extend([Booking(**item) for item in response.get('Items', [])])
+    
+        return bookings
+    
+    def update_booking(
+        self,
+        booking_id: str,
+        booking_data: BookingUpdate,
+        expected_version: Optional[int] = None,
+        bay: Optional[int] = None
+    ) -> Optional[Booking]:
+        """
+        Update an existing booking (single conditional write, no read first).
+        Raises VersionConflictError if expected_version is given and does not match.
+        """
         update_data = booking_data.dict(exclude_unset=True)
+        self._check_schedule_update(update_data)
+        if bay is not None:
+            update_data['bay'] = bay
         update_data['updated_at'] = datetime.utcnow().isoformat()
-        
-        # Build update expression
-        update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in update_data.keys()])
-        expression_attribute_names = {f"#{k}": k for k in update_data.keys()}
-        expression_attribute_values = {f":{k}": v for k, v in update_data.items()}
-        
-        response = self.table.update_item(
-            Key={'booking_id': booking_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeNames=expression_attribute_names,
-            ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW"
-        )
-        
-        return Booking(**response['Attributes'])
+        update_data['updated_day'] = _updated_day(update_data['updated_at'])
+        if 'booking_date' in update_data:
+            update_data['booking_datetime'] = booking_datetime(update_data['booking_date'], update_data['scheduled_time'])
+    
+        return self._write_update(booking_id, update_data, expected_version)
+    
+    def _write_update(self, booking_id: str, update_data: Dict, expected_version: Optional[int]) -> Optional[Booking]:
+        """Conditional update that also returns the old item, so the aggregate deltas need no extra read"""
+        old_item = update_existing_item(self.table, 'booking_id', booking_id, update_data, expected_version, return_old=True)
+        if not old_item:
+            return None
+        booking = Booking(**updated_item(old_item, update_data))
+        self._count([(Booking(**old_item), booking)])
+        return booking
+    
+    def _to_item(self, booking: Booking) -> Dict:
+        """Item for a booking, with the booking_datetime sort key of the schedule index"""
+        item = to_dynamodb(booking.dict())
+        item['booking_datetime'] = booking_datetime(booking.booking_date, booking.scheduled_time)
+        item['updated_day'] = _updated_day(booking.updated_at)
+        return item
     
     def delete_booking(self, booking_id: str) -> bool:
         """Delete a booking"""
         try:
-            self.table.delete_item(Key={'booking_id': booking_id})
+            response = self.table.delete_item(Key={'booking_id': booking_id}, ReturnValues='ALL_OLD')
+            if 'Attributes' in response:
+                self._count([(Booking(**response['Attributes']), None)])
             return True
         except Exception as e:
             print(f"Error deleting booking: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def get_booking_aggregates(self, key: AggregateKey) -> Counters:
+        """Write-time counters of one (scope, period) aggregate"""
+        return self.aggregates.get(key)
+    
+    def _count(self, changes: List[Change]):
+        """
+        Apply booking writes to the aggregate counters, then tell the change listeners.
+        This runs after the booking write has succeeded, so a failure here is logged
+        rather than failing the request; scripts/rebuild_booking_aggregates.py
+        recomputes the counters.
+        """
+        try:
+            self.aggregates.apply(changes)
+        except Exception as e:
+            print(f"Error updating booking aggregates: {e}")
+        self._notify_change(changes)
@@ -1,20 +1,34 @@
-import boto3
 from boto3.dynamodb.conditions import Attr
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import uuid
 from app.config import config
+from app.aws_clients import get_resource, get_table
+from app.crud.batch import batch_get_items, batch_put_items
+from app.crud.cache import TTLCache
+from app.crud.pagination import scan_page
+from app.crud.parallel_scan import parallel_scan_pages
+from app.crud.projection import partial_model, project, projection_params
+from app.crud.repository import CustomerRepository
+from app.crud.serialization import to_dynamodb
+from app.crud.updates import VersionConflictError, update_existing_item
 from app.models.customer import Customer, CustomerCreate, CustomerUpdate
 
-class CustomerCRUD:
+class CustomerCRUD(CustomerRepository):
+    """Customer repository backed by DynamoDB"""
+    
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
-        self.table = self.dynamodb.Table(config.CUSTOMERS_TABLE)
+        self.cache = TTLCache(config.ENTITY_CACHE_MAXSIZE, config.CUSTOMER_CACHE_TTL)
+    
+    @property
+    def dynamodb(self):
+        """This thread's DynamoDB resource (resources are not thread-safe)"""
+        return get_resource('dynamodb')
+    
+    @property
+    def table(self):
+        """This thread's Table object"""
+        return get_table(config.CUSTOMERS_TABLE)
     
     def create_customer(self, customer_data: CustomerCreate) -> Customer:
         """Create a new customer"""
@@ -25,30 +39,78 @@ class CustomerCRUD:
             customer_id=customer_id,
             **customer_data.dict(),
             created_at=timestamp,
-            updated_at=timestamp
+            updated_at=timestamp,
+            version=1
         )
         
         self.table.put_item(Item=customer.dict())
+        self.cache.set(customer_id, customer.copy())
         return customer
     
-    def get_customer(self, customer_id: str) -> Optional[Customer]:
-        """Get customer by ID"""
-        response = self.table.get_item(Key={'customer_id': customer_id})
+    def batch_create_customers(self, customers_data: List[CustomerCreate]) -> Tuple[List[Customer], Dict[str, str]]:
+        """Create many customers with BatchWriteItem; also returns {customer_id: error} for writes that failed"""
+        timestamp = datetime.utcnow().isoformat()
         
-        if 'Item' in response:
-            return Customer(**response['Item'])
-        return None
-    
-    def get_all_customers(self) -> List[Customer]:
-        """Get all customers"""
-        response = self.table.scan()
-        customers = [Customer(**item) for item in response.get('Items', [])]
+        customers = [
+            Customer(
+                customer_id=str(uuid.uuid4()),
+                **customer_data.dict(),
+                created_at=timestamp,
+                updated_at=timestamp,
+                version=1
+            )
+            for customer_data in customers_data
+        ]
         
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            customers.extend([Customer(**item) for item in response.get('Items', [])])
+        failed = batch_put_items(
+            self.dynamodb,
+            config.CUSTOMERS_TABLE,
+            [to_dynamodb(customer.dict()) for customer in customers],
+            'customer_id'
+        )
+        return customers, failed
+    
+    def get_customer(self, customer_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Customer]:
+        """Get customer by ID (read-through cache); fields limits the attributes returned"""
+        customer = self.cache.get(customer_id)
+        if customer is None:
+            response = self.table.get_item(Key={'customer_id': customer_id}, **projection_params(fields))
+            if 'Item' not in response:
+                return None
+            if fields:
+                # Partial items are never cached
+                return partial_model(Customer, fields)(**response['Item'])
+            customer = Customer(**response['Item'])
+            self.cache.set(customer_id, customer)
         
-        return customers
+        if fields:
+            return project(customer, fields)
+        # Callers get their own copy so they cannot mutate the cached record
+        return customer.copy()
+    
+    def get_customers_by_ids(self, customer_ids: List[str]) -> List[Customer]:
+        """Get many customers with BatchGetItem, in the requested order (each once; missing IDs are skipped)"""
+        items = batch_get_items(self.dynamodb, config.CUSTOMERS_TABLE, 'customer_id', customer_ids)
+        return [Customer(**items[customer_id]) for customer_id in dict.fromkeys(customer_ids) if customer_id in items]
+    
+    def get_customers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Customer], Optional[str]]:
+        """Get one page of customers and the token for the next page; fields limits the attributes read"""
+        items, next_token = scan_page(self.table, limit, next_token, **projection_params(fields))
+        model = partial_model(Customer, fields) if fields else Customer
+        return [model(**item) for item in items], next_token
+    
+    def iter_customer_pages(self, segments: int = 1) -> Iterator[List[Customer]]:
+        """
+        Stream all customers page by page without holding the whole table in memory.
+        With segments > 1 the table is read as a parallel segmented scan.
+        """
+        for items in parallel_scan_pages(self.table, segments, config.SCAN_WORKERS):
+            yield [Customer(**item) for item in items]
     
     def get_customer_by_email(self, email: str) -> Optional[Customer]:
         """Get customer by email"""
@@ -58,34 +120,38 @@ class CustomerCRUD:
         items = response.get('Items', [])
         return Customer(**items[0]) if items else None
     
-    def update_customer(self, customer_id: str, customer_data: CustomerUpdate) -> Optional[Customer]:
-        """Update an existing customer"""
-        current_customer = self.get_customer(customer_id)
-        if not current_customer:
-            return None
-        
+    def update_customer(self, customer_id: str, customer_data: CustomerUpdate, expected_version: Optional[int] = None) -> Optional[Customer]:
+        """
+        Update an existing customer (single conditional write, no read first).
+        Raises VersionConflictError if expected_version is given and does not match.
+        """
         update_data = customer_data.dict(exclude_unset=True)
         update_data['updated_at'] = datetime.utcnow().isoformat()
         
-        update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in update_data.keys()])
-        expression_attribute_names = {f"#{k}": k for k in update_data.keys()}
-        expression_attribute_values = {f":{k}": v for k, v in update_data.items()}
+        try:
+            item = update_existing_item(self.table, 'customer_id', customer_id, update_data, expected_version)
+        except VersionConflictError:
+            self.cache.invalidate(customer_id)
+            raise
         
-        response = self.table.update_item(
-            Key={'customer_id': customer_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeNames=expression_attribute_names,
-            ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW"
-        )
+        if not item:
+            self.cache.invalidate(customer_id)
+            return None
         
-        return Customer(**response['Attributes'])
+        customer = Customer(**item)
+        self.cache.set(customer_id, customer.copy())
+        return customer
     
     def delete_customer(self, customer_id: str) -> bool:
         """Delete a customer"""
         try:
             self.table.delete_item(Key={'customer_id': customer_id})
+            self.cache.invalidate(customer_id)
             return True
         except Exception as e:
             print(f"Error deleting customer: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the customer read-through cache"""
+        return self.cache.stats()
@@ -0,0 +1,104 @@
+import threading
+from typing import Any, Callable, Dict
+from app.config import config
+from app.crud.repository import (
+    BookingRepository,
+    CustomerRepository,
+    ServiceCenterRepository,
+    SlotReservationRepository,
+    VehicleRepository
+)
+
+# One repository instance per entity and process, built for config.STORAGE_BACKEND:
+#   dynamodb - the AWS tables (default)
+#   sqlite   - one local SQLite file (config.SQLITE_PATH) for single-node deployments
+#   memory   - indexed in-process store for benchmarks, tests and the mock app
+_lock = threading.Lock()
+_instances: Dict[str, Any] = {}
+
+def _dynamodb_backend() -> Dict[str, Callable[[], Any]]:
+    from app.crud.booking_crud import BookingCRUD
+    from app.crud.customer_crud import CustomerCRUD
+    from app.crud.service_center_crud import ServiceCenterCRUD
+    from app.crud.slot_reservation_crud import SlotReservationCRUD
+    from app.crud.vehicle_crud import VehicleCRUD
+    return {
+        'booking': BookingCRUD,
+        'vehicle': VehicleCRUD,
+        'customer': CustomerCRUD,
+        'service_center': ServiceCenterCRUD,
+        'slot_reservation': SlotReservationCRUD
+    }
+
+def _memory_backend() -> Dict[str, Callable[[], Any]]:
+    from app.crud.memory_crud import (
+        MemoryBookingCRUD,
+        MemoryCustomerCRUD,
+        MemoryServiceCenterCRUD,
+        MemorySlotReservationCRUD,
+        MemoryVehicleCRUD
+    )
+    return {
+        'booking': MemoryBookingCRUD,
+        'vehicle': MemoryVehicleCRUD,
+        'customer': MemoryCustomerCRUD,
+        'service_center': MemoryServiceCenterCRUD,
+        'slot_reservation': MemorySlotReservationCRUD
+    }
+
+def _sqlite_backend() -> Dict[str, Callable[[], Any]]:
+    from app.crud.sqlite_crud import (
+        SQLiteBookingCRUD,
+        SQLiteCustomerCRUD,
+        SQLiteServiceCenterCRUD,
+        SQLiteSlotReservationCRUD,
+        SQLiteVehicleCRUD
+    )
+    return {
+        'booking': SQLiteBookingCRUD,
+        'vehicle': SQLiteVehicleCRUD,
+        'customer': SQLiteCustomerCRUD,
+        'service_center': SQLiteServiceCenterCRUD,
+        'slot_reservation': SQLiteSlotReservationCRUD
+    }
+
+BACKENDS = {
+    'dynamodb': _dynamodb_backend,
+    'sqlite': _sqlite_backend,
+    'memory': _memory_backend
+}
+
+def _get(entity: str):
+    repository = _instances.get(entity)
+    if repository is None:
+        with _lock:
+            repository = _instances.get(entity)
+            if repository is None:
+                backend = BACKENDS.get(config.STORAGE_BACKEND)
+                if backend is None:
+                    raise ValueError(
+                        f"Unknown STORAGE_BACKEND '{config.STORAGE_BACKEND}' (expected one of: {', '.join(BACKENDS)})"
+                    )
+                repository = backend()[entity]()
+                _instances[entity] = repository
+    return repository
+
+def get_booking_crud() -> BookingRepository:
+    """Shared booking repository for the configured backend"""
+    return _get('booking')
+
+def get_vehicle_crud() -> VehicleRepository:
+    """Shared vehicle repository for the configured backend"""
+    return _get('vehicle')
+
+def get_customer_crud() -> CustomerRepository:
+    """Shared customer repository for the configured backend"""
+    return _get('customer')
+
+def get_service_center_crud() -> ServiceCenterRepository:
+    """Shared service center repository for the configured backend"""
+    return _get('service_center')
+
+def get_slot_reservation_crud() -> SlotReservationRepository:
+    """Shared slot reservation repository for the configured backend"""
+    return _get('slot_reservation')
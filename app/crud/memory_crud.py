@@ -0,0 +1,463 @@
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+import uuid
+from app.config import config
+from app.crud.memory_table import MemoryTable
+from app.crud.pagination import InvalidPageTokenError, decode_next_token, encode_next_token
+from app.crud.projection import project
+from app.crud.repository import (
+    BookingRepository,
+    CustomerRepository,
+    ServiceCenterRepository,
+    SlotReservationRepository,
+    VehicleRepository
+)
+from app.models.booking import Booking, BookingCreate, BookingStatus, BookingUpdate, booking_datetime
+from app.models.customer import Customer, CustomerCreate, CustomerUpdate
+from app.models.service_center import ServiceCenter, ServiceCenterCreate, ServiceCenterUpdate
+from app.models.vehicle import Vehicle, VehicleCreate, VehicleUpdate
+from app.non_crud_lib.booking_aggregator import AggregateKey, BookingAggregator, Counters
+
+# In-process backends for benchmarks, tests and the mock app. Data lives only as
+# long as the process; every lookup the routes make is served from an index.
+
+def _by_booking_date(bookings: List[Booking]) -> List[Booking]:
+    """Same order as the bookings GSIs (booking_date range key)"""
+    return sorted(bookings, key=lambda booking: (booking.booking_date, booking.booking_id))
+
+class MemoryBookingCRUD(BookingRepository):
+    """Booking repository held in process memory"""
+    
+    def __init__(self):
+        super().__init__()
+        self.aggregates = MemoryBookingAggregates()
+        self.table = MemoryTable(
+            'booking_id',
+            indexes=('customer_id', 'vehicle_id', 'service_center_id'),
+            on_change=self._on_change
+        )
+    
+    def _on_change(self, old: Optional[Booking], new: Optional[Booking]):
+        self.aggregates.apply(old, new)
+        self._notify_change([(old, new)])
+    
+    def create_booking(
+        self,
+        booking_data: BookingCreate,
+        estimated_cost: Optional[float] = None,
+        booking_id: Optional[str] = None,
+        bay: Optional[int] = None
+    ) -> Booking:
+        """Create a new booking"""
+        timestamp = datetime.utcnow().isoformat()
+    
+        booking = Booking(
+            booking_id=booking_id or str(uuid.uuid4()),
+            **booking_data.dict(),
+            estimated_cost=estimated_cost,
+            bay=bay,
+            created_at=timestamp,
+            updated_at=timestamp,
+            version=1
+        )
+    
+        self.table.put(booking.copy())
+        return booking
+    
+    def batch_create_bookings(
+        self,
+        bookings_data: List[BookingCreate],
+        estimated_costs: Optional[List[Optional[float]]] = None,
+        booking_ids: Optional[List[str]] = None,
+        bays: Optional[List[Optional[int]]] = None
+    ) -> Tuple[List[Booking], Dict[str, str]]:
+        """Create many bookings; in memory no write can fail"""
+        estimated_costs = estimated_costs or [None] * len(bookings_data)
+        booking_ids = booking_ids or [None] * len(bookings_data)
+        bays = bays or [None] * len(bookings_data)
+        bookings = [
+            self.create_booking(booking_data, estimated_cost, booking_id, bay)
+            for booking_data, estimated_cost, booking_id, bay in zip(bookings_data, estimated_costs, booking_ids, bays)
+        ]
+        return bookings, {}
+    
+    def get_booking(self, booking_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Booking]:
+        """Get booking by ID"""
+        booking = self.table.get(booking_id)
+        if booking is None:
+            return None
+        return project(booking, fields) if fields else booking.copy()
+    
+    def get_bookings_by_ids(self, booking_ids: List[str]) -> List[Booking]:
+        """Get many bookings, in the requested order (each once; missing IDs are skipped)"""
+        bookings = [self.table.get(booking_id) for booking_id in dict.fromkeys(booking_ids)]
+        return [booking.copy() for booking in bookings if booking]
+    
+    def get_bookings_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """Get one page of bookings and the token for the next page"""
+        bookings, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(booking, fields) for booking in bookings], next_token
+        return [booking.copy() for booking in bookings], next_token
+    
+    def iter_booking_pages(self, segments: int = 1) -> Iterator[List[Booking]]:
+        """Stream all bookings page by page (segments is ignored)"""
+        bookings = self.table.all()
+        for start in range(0, len(bookings), config.MAX_PAGE_SIZE):
+            yield [booking.copy() for booking in bookings[start:start + config.MAX_PAGE_SIZE]]
+    
+    def iter_bookings_updated_since(self, since: str) -> Iterator[List[Booking]]:
+        """Stream the bookings updated after since, page by page"""
+        bookings = [booking for booking in self.table.all() if booking.updated_at and booking.updated_at > since]
+        for start in range(0, len(bookings), config.MAX_PAGE_SIZE):
+            yield [booking.copy() for booking in bookings[start:start + config.MAX_PAGE_SIZE]]
+    
+    def get_bookings_by_customer(self, customer_id: str) -> List[Booking]:
+        """Get all bookings for a customer, ordered by booking date"""
+        return [booking.copy() for booking in _by_booking_date(self.table.lookup('customer_id', customer_id))]
+    
+    def get_bookings_by_vehicle(self, vehicle_id: str) -> List[Booking]:
+        """Get all bookings for a vehicle, ordered by booking date"""
+        return [booking.copy() for booking in _by_booking_date(self.table.lookup('vehicle_id', vehicle_id))]
+    
+    def get_bookings_by_service_center(self, service_center_id: str) -> List[Booking]:
+        """Get all bookings for a service center, ordered by booking date"""
+        return [
+            booking.copy()
+            for booking in _by_booking_date(self.table.lookup('service_center_id', service_center_id))
+        ]
+    
+    def get_service_center_schedule_page(
+        self,
+        service_center_id: str,
+        start: str,
+        end: str,
+        limit: int,
+        next_token: Optional[str] = None,
+        status: Optional[BookingStatus] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """One page of a service center's bookings in [start, end], ordered by booking datetime"""
+        last_key = decode_next_token(next_token)
+        after = None
+        if last_key:
+            if not isinstance(last_key.get('booking_datetime'), str) or not isinstance(last_key.get('booking_id'), str):
+                raise InvalidPageTokenError('Invalid next_token')
+            after = (last_key['booking_datetime'], last_key['booking_id'])
+    
+        schedule = sorted(
+            ((booking_datetime(booking.booking_date, booking.scheduled_time), booking.booking_id), booking)
+            for booking in self.table.lookup('service_center_id', service_center_id)
+        )
+        matches = [
+            (key, booking) for key, booking in schedule
+            if start <= key[0] <= end and (after is None or key > after) and (status is None or booking.status == status)
+        ]
+    
+        next_token = None
+        if len(matches) > limit:
+            last_datetime, last_id = matches[limit - 1][0]
+            next_token = encode_next_token({'booking_datetime': last_datetime, 'booking_id': last_id})
+        return [booking.copy() for _, booking in matches[:limit]], next_token
+    
+    def update_booking(
+        self,
+        booking_id: str,
+        booking_data: BookingUpdate,
+        expected_version: Optional[int] = None,
+        bay: Optional[int] = None
+    ) -> Optional[Booking]:
+        """Update an existing booking"""
+        update_data = booking_data.dict(exclude_unset=True)
+        self._check_schedule_update(update_data)
+        if bay is not None:
+            update_data['bay'] = bay
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        booking = self.table.update(booking_id, update_data, expected_version)
+        return booking.copy() if booking else None
+    
+    def delete_booking(self, booking_id: str) -> bool:
+        """Delete a booking"""
+        self.table.delete(booking_id)
+        return True
+    
+    def get_booking_aggregates(self, key: AggregateKey) -> Counters:
+        """Write-time counters of one (scope, period) aggregate"""
+        return self.aggregates.get(key)
+
+class MemoryBookingAggregates:
+    """Booking counters held in process memory, updated with each booking write"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aggregates: Dict[AggregateKey, Counters] = {}
+        self.aggregator = BookingAggregator()
+    
+    def apply(self, old: Optional[Booking], new: Optional[Booking]):
+        """Add the counter deltas of one booking write"""
+        with self._lock:
+            for key, deltas in self.aggregator.deltas([(old, new)]).items():
+                counters = self._aggregates.setdefault(key, {})
+                for name, value in deltas.items():
+                    counters[name] = counters.get(name, 0) + value
+    
+    def get(self, key: AggregateKey) -> Counters:
+        """Counters of one aggregate (empty if nothing was ever counted there)"""
+        with self._lock:
+            return dict(self._aggregates.get(key, {}))
+
+class MemoryVehicleCRUD(VehicleRepository):
+    """Vehicle repository held in process memory"""
+    
+    def __init__(self):
+        self.table = MemoryTable('vehicle_id', indexes=('customer_id',))
+    
+    def create_vehicle(self, vehicle_data: VehicleCreate) -> Vehicle:
+        """Create a new vehicle"""
+        timestamp = datetime.utcnow().isoformat()
+    
+        vehicle = Vehicle(
+            vehicle_id=str(uuid.uuid4()),
+            **vehicle_data.dict(),
+            created_at=timestamp,
+            updated_at=timestamp,
+            version=1
+        )
+    
+        self.table.put(vehicle.copy())
+        return vehicle
+    
+    def batch_create_vehicles(self, vehicles_data: List[VehicleCreate]) -> Tuple[List[Vehicle], Dict[str, str]]:
+        """Create many vehicles; in memory no write can fail"""
+        return [self.create_vehicle(vehicle_data) for vehicle_data in vehicles_data], {}
+    
+    def get_vehicle(self, vehicle_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Vehicle]:
+        """Get vehicle by ID"""
+        vehicle = self.table.get(vehicle_id)
+        if vehicle is None:
+            return None
+        return project(vehicle, fields) if fields else vehicle.copy()
+    
+    def get_vehicles_by_ids(self, vehicle_ids: List[str]) -> List[Vehicle]:
+        """Get many vehicles, in the requested order (each once; missing IDs are skipped)"""
+        vehicles = [self.table.get(vehicle_id) for vehicle_id in dict.fromkeys(vehicle_ids)]
+        return [vehicle.copy() for vehicle in vehicles if vehicle]
+    
+    def get_vehicles_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Vehicle], Optional[str]]:
+        """Get one page of vehicles and the token for the next page"""
+        vehicles, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(vehicle, fields) for vehicle in vehicles], next_token
+        return [vehicle.copy() for vehicle in vehicles], next_token
+    
+    def iter_vehicle_pages(self, segments: int = 1) -> Iterator[List[Vehicle]]:
+        """Stream all vehicles page by page (segments is ignored)"""
+        vehicles = self.table.all()
+        for start in range(0, len(vehicles), config.MAX_PAGE_SIZE):
+            yield [vehicle.copy() for vehicle in vehicles[start:start + config.MAX_PAGE_SIZE]]
+    
+    def get_vehicles_by_customer(self, customer_id: str) -> List[Vehicle]:
+        """Get all vehicles for a customer"""
+        return [vehicle.copy() for vehicle in self.table.lookup('customer_id', customer_id)]
+    
+    def update_vehicle(self, vehicle_id: str, vehicle_data: VehicleUpdate, expected_version: Optional[int] = None) -> Optional[Vehicle]:
+        """Update an existing vehicle"""
+        update_data = vehicle_data.dict(exclude_unset=True)
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        vehicle = self.table.update(vehicle_id, update_data, expected_version)
+        return vehicle.copy() if vehicle else None
+    
+    def delete_vehicle(self, vehicle_id: str) -> bool:
+        """Delete a vehicle"""
+        self.table.delete(vehicle_id)
+        return True
+
+class MemoryCustomerCRUD(CustomerRepository):
+    """Customer repository held in process memory"""
+    
+    def __init__(self):
+        self.table = MemoryTable('customer_id', indexes=('email',))
+    
+    def create_customer(self, customer_data: CustomerCreate) -> Customer:
+        """Create a new customer"""
+        timestamp = datetime.utcnow().isoformat()
+    
+        customer = Customer(
+            customer_id=str(uuid.uuid4()),
+            **customer_data.dict(),
+            created_at=timestamp,
+            updated_at=timestamp,
+            version=1
+        )
+    
+        self.table.put(customer.copy())
+        return customer
+    
+    def batch_create_customers(self, customers_data: List[CustomerCreate]) -> Tuple[List[Customer], Dict[str, str]]:
+        """Create many customers; in memory no write can fail"""
+        return [self.create_customer(customer_data) for customer_data in customers_data], {}
+    
+    def get_customer(self, customer_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Customer]:
+        """Get customer by ID"""
+        customer = self.table.get(customer_id)
+        if customer is None:
+            return None
+        return project(customer, fields) if fields else customer.copy()
+    
+    def get_customers_by_ids(self, customer_ids: List[str]) -> List[Customer]:
+        """Get many customers, in the requested order (each once; missing IDs are skipped)"""
+        customers = [self.table.get(customer_id) for customer_id in dict.fromkeys(customer_ids)]
+        return [customer.copy() for customer in customers if customer]
+    
+    def get_customers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Customer], Optional[str]]:
+        """Get one page of customers and the token for the next page"""
+        customers, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(customer, fields) for customer in customers], next_token
+        return [customer.copy() for customer in customers], next_token
+    
+    def iter_customer_pages(self, segments: int = 1) -> Iterator[List[Customer]]:
+        """Stream all customers page by page (segments is ignored)"""
+        customers = self.table.all()
+        for start in range(0, len(customers), config.MAX_PAGE_SIZE):
+            yield [customer.copy() for customer in customers[start:start + config.MAX_PAGE_SIZE]]
+    
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
+        """Get customer by email"""
+        customers = self.table.lookup('email', email)
+        return customers[0].copy() if customers else None
+    
+    def update_customer(self, customer_id: str, customer_data: CustomerUpdate, expected_version: Optional[int] = None) -> Optional[Customer]:
+        """Update an existing customer"""
+        update_data = customer_data.dict(exclude_unset=True)
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        customer = self.table.update(customer_id, update_data, expected_version)
+        return customer.copy() if customer else None
+    
+    def delete_customer(self, customer_id: str) -> bool:
+        """Delete a customer"""
+        self.table.delete(customer_id)
+        return True
+
+class MemoryServiceCenterCRUD(ServiceCenterRepository):
+    """Service center repository held in process memory"""
+    
+    def __init__(self):
+        self.table = MemoryTable('service_center_id', indexes=('city', 'state', 'services_offered'))
+    
+    def create_service_center(self, service_center_data: ServiceCenterCreate) -> ServiceCenter:
+        """Create a new service center"""
+        timestamp = datetime.utcnow().isoformat()
+    
+        service_center = ServiceCenter(
+            service_center_id=str(uuid.uuid4()),
+            **service_center_data.dict(),
+            created_at=timestamp,
+            updated_at=timestamp,
+            version=1
+        )
+    
+        self.table.put(service_center.copy())
+        return service_center
+    
+    def get_service_center(self, service_center_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[ServiceCenter]:
+        """Get service center by ID"""
+        service_center = self.table.get(service_center_id)
+        if service_center is None:
+            return None
+        return project(service_center, fields) if fields else service_center.copy()
+    
+    def get_service_centers_by_ids(self, service_center_ids: List[str]) -> List[ServiceCenter]:
+        """Get many service centers, in the requested order (each once; missing IDs are skipped)"""
+        service_centers = [self.table.get(service_center_id) for service_center_id in dict.fromkeys(service_center_ids)]
+        return [service_center.copy() for service_center in service_centers if service_center]
+    
+    def get_service_centers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[ServiceCenter], Optional[str]]:
+        """Get one page of service centers and the token for the next page"""
+        service_centers, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(service_center, fields) for service_center in service_centers], next_token
+        return [service_center.copy() for service_center in service_centers], next_token
+    
+    def iter_service_center_pages(self, segments: int = 1) -> Iterator[List[ServiceCenter]]:
+        """Stream all service centers page by page (segments is ignored)"""
+        service_centers = self.table.all()
+        for start in range(0, len(service_centers), config.MAX_PAGE_SIZE):
+            yield [service_center.copy() for service_center in service_centers[start:start + config.MAX_PAGE_SIZE]]
+    
+    def get_service_centers_by_city(self, city: str) -> List[ServiceCenter]:
+        """Get service centers by city"""
+        return [service_center.copy() for service_center in self.table.lookup('city', city)]
+    
+    def get_service_centers_by_state(self, state: str) -> List[ServiceCenter]:
+        """Get service centers by state"""
+        return [service_center.copy() for service_center in self.table.lookup('state', state)]
+    
+    def get_service_centers_by_service(self, service: str) -> List[ServiceCenter]:
+        """Get service centers that offer a service type"""
+        return [service_center.copy() for service_center in self.table.lookup('services_offered', service)]
+    
+    def update_service_center(self, service_center_id: str, service_center_data: ServiceCenterUpdate, expected_version: Optional[int] = None) -> Optional[ServiceCenter]:
+        """Update an existing service center"""
+        update_data = service_center_data.dict(exclude_unset=True)
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        service_center = self.table.update(service_center_id, update_data, expected_version)
+        return service_center.copy() if service_center else None
+    
+    def delete_service_center(self, service_center_id: str) -> bool:
+        """Delete a service center"""
+        self.table.delete(service_center_id)
+        return True
+
+class MemorySlotReservationCRUD(SlotReservationRepository):
+    """Slot reservations held in process memory"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._days: Dict[str, Dict[str, str]] = {}
+    
+    def reserve(self, day_key: str, keys: List[str], holder: str) -> bool:
+        """Claim all keys under one lock, or none of them"""
+        with self._lock:
+            day = self._days.setdefault(day_key, {})
+            if any(day.get(key, holder) != holder for key in keys):
+                return False
+            day.update(dict.fromkeys(keys, holder))
+            return True
+    
+    def release(self, day_key: str, keys: List[str], holder: str):
+        """Free the keys that holder still owns"""
+        with self._lock:
+            day = self._days.get(day_key, {})
+            for key in keys:
+                if day.get(key) == holder:
+                    del day[key]
+    
+    def get_reservations(self, day_key: str) -> Dict[str, str]:
+        """{key: holder} for one service center and day"""
+        with self._lock:
+            return dict(self._days.get(day_key, {}))
@@ -0,0 +1,131 @@
+import bisect
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from pydantic import BaseModel
+from app.crud.pagination import InvalidPageTokenError, decode_next_token, encode_next_token
+from app.crud.updates import VERSION_ATTRIBUTE, VersionConflictError
+
+class MemoryTable:
+    """
+    Thread-safe in-process table of pydantic records, keyed by key_name, with
+    hash indexes on the given attributes (list attributes index every element).
+    Keys are kept sorted so pages use the same next_token format as DynamoDB scans.
+    Stored records are shared; callers copy them before handing them out.
+    on_change(old, new) is called under the table lock for every write (None
+    stands for a missing record), so derived state never sees writes out of order.
+    """
+    
+    def __init__(
+        self,
+        key_name: str,
+        indexes: Tuple[str, ...] = (),
+        on_change: Optional[Callable[[Optional[BaseModel], Optional[BaseModel]], None]] = None
+    ):
+        self.key_name = key_name
+        self.on_change = on_change
+        self._lock = threading.RLock()
+        self._records: Dict[str, BaseModel] = {}
+        self._ordered_keys: List[str] = []
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {name: {} for name in indexes}
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def get(self, key: str) -> Optional[BaseModel]:
+        return self._records.get(key)
+    
+    def put(self, record: BaseModel):
+        """Insert or replace a record"""
+        key = getattr(record, self.key_name)
+        with self._lock:
+            old = self._records.get(key)
+            if old is None:
+                bisect.insort(self._ordered_keys, key)
+            else:
+                self._unindex(old)
+            self._records[key] = record
+            self._index(record)
+            if self.on_change:
+                self.on_change(old, record)
+    
+    def update(self, key: str, update_data: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[BaseModel]:
+        """
+        Apply update_data and bump the version, mirroring update_existing_item:
+        None if the key is missing, VersionConflictError on a version mismatch.
+        """
+        with self._lock:
+            current = self._records.get(key)
+            if current is None:
+                return None
+            current_version = getattr(current, VERSION_ATTRIBUTE)
+            if expected_version is not None and current_version != expected_version:
+                raise VersionConflictError(current_version)
+    
+            changes = {k: v for k, v in update_data.items() if k != VERSION_ATTRIBUTE}
+            changes[VERSION_ATTRIBUTE] = current_version + 1
+            record = current.copy(update=changes)
+            self.put(record)
+            return record
+    
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            old = self._records.pop(key, None)
+            if old is None:
+                return False
+            self._ordered_keys.pop(bisect.bisect_left(self._ordered_keys, key))
+            self._unindex(old)
+            if self.on_change:
+                self.on_change(old, None)
+            return True
+    
+    def lookup(self, index_name: str, value: Any) -> List[BaseModel]:
+        """Records whose indexed attribute equals (or, for lists, contains) value, in key order"""
+        with self._lock:
+            keys = sorted(self._indexes[index_name].get(value, ()))
+            return [self._records[key] for key in keys]
+    
+    def all(self) -> List[BaseModel]:
+        """Every record, in key order"""
+        with self._lock:
+            return [self._records[key] for key in self._ordered_keys]
+    
+    def page(self, limit: int, next_token: Optional[str] = None) -> Tuple[List[BaseModel], Optional[str]]:
+        """Up to limit records after next_token, in key order, and the token for the next page"""
+        start_key = decode_next_token(next_token)
+        last_key = None
+        if start_key:
+            if not isinstance(start_key.get(self.key_name), str):
+                raise InvalidPageTokenError('Invalid next_token')
+            last_key = start_key[self.key_name]
+    
+        with self._lock:
+            start = bisect.bisect_right(self._ordered_keys, last_key) if last_key is not None else 0
+            keys = self._ordered_keys[start:start + limit]
+            records = [self._records[key] for key in keys]
+            has_more = start + limit < len(self._ordered_keys)
+    
+        next_token = encode_next_token({self.key_name: keys[-1]}) if keys and has_more else None
+        return records, next_token
+    
+    def _index(self, record: BaseModel):
+        key = getattr(record, self.key_name)
+        for name, index in self._indexes.items():
+            for value in self._index_values(record, name):
+                index.setdefault(value, set()).add(key)
+    
+    def _unindex(self, record: BaseModel):
+        key = getattr(record, self.key_name)
+        for name, index in self._indexes.items():
+            for value in self._index_values(record, name):
+                keys = index.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[value]
+    
+    @staticmethod
+    def _index_values(record: BaseModel, name: str) -> List[Any]:
+        value = getattr(record, name)
+        if value is None:
+            return []
+        return list(value) if isinstance(value, (list, tuple, set)) else [value]
@@ -0,0 +1,46 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+class InvalidPageTokenError(ValueError):
+    """Raised when a next_token cannot be decoded"""
+
+def encode_next_token(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Wrap a DynamoDB LastEvaluatedKey in an opaque, URL-safe token"""
+    if not last_evaluated_key:
+        return None
+    payload = json.dumps(last_evaluated_key, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_next_token(next_token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Turn a token from encode_next_token back into an ExclusiveStartKey"""
+    if not next_token:
+        return None
+    try:
+        padded = next_token + '=' * (-len(next_token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except ValueError:  # binascii.Error, UnicodeError and JSONDecodeError are all ValueErrors
+        raise InvalidPageTokenError('Invalid next_token')
+    if not isinstance(key, dict):
+        raise InvalidPageTokenError('Invalid next_token')
+    return key
+
+def scan_page(table, limit: int, next_token: Optional[str] = None, **scan_params) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Read one page of a table scan, returning the raw items and the next token"""
+    params = dict(scan_params, Limit=limit)
+    exclusive_start_key = decode_next_token(next_token)
+    if exclusive_start_key:
+        params['ExclusiveStartKey'] = exclusive_start_key
+    
+    response = table.scan(**params)
+    return response.get('Items', []), encode_next_token(response.get('LastEvaluatedKey'))
+
+def query_page(table, limit: int, next_token: Optional[str] = None, **query_params) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Read one page of a query, returning the raw items and the next token"""
+    params = dict(query_params, Limit=limit)
+    exclusive_start_key = decode_next_token(next_token)
+    if exclusive_start_key:
+        params['ExclusiveStartKey'] = exclusive_start_key
+    
+    response = table.query(**params)
+    return response.get('Items', []), encode_next_token(response.get('LastEvaluatedKey'))
@@ -0,0 +1,76 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+from app.aws_clients import get_table
+
+# Marks the end of one segment on the results queue
+_SEGMENT_DONE = object()
+
+def parallel_scan_pages(table, total_segments: int, max_workers: Optional[int] = None, **scan_params) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Scan a table as total_segments parallel DynamoDB segments and yield raw item
+    pages as soon as any segment returns one. Page order across segments is not
+    defined. A bounded queue keeps memory flat when the consumer is slower than
+    the scan, and closing the generator early stops the remaining workers.
+    Each worker thread scans through its own Table object for the same table.
+    """
+    if total_segments <= 1:
+        yield from _scan_segment_pages(table, None, None, scan_params)
+        return
+    
+    workers = min(max_workers or total_segments, total_segments)
+    results: queue.Queue = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+    
+    def put(value) -> bool:
+        # Blocks while the queue is full, but gives up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                results.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def scan_segment(segment: int):
+        try:
+            for page in _scan_segment_pages(get_table(table.name), segment, total_segments, scan_params):
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(_SEGMENT_DONE)
+    
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dynamodb-scan')
+    try:
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
+        
+        remaining = total_segments
+        while remaining:
+            value = results.get()
+            if value is _SEGMENT_DONE:
+                remaining -= 1
+            elif isinstance(value, Exception):
+                raise value
+            else:
+                yield value
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _scan_segment_pages(table, segment: Optional[int], total_segments: Optional[int], scan_params: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the pages of one scan segment (or of the whole table when segment is None)"""
+    params = dict(scan_params)
+    if segment is not None:
+        params['Segment'] = segment
+        params['TotalSegments'] = total_segments
+    
+    response = table.scan(**params)
+    yield response.get('Items', [])
+    
+    while 'LastEvaluatedKey' in response:
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **params)
+        yield response.get('Items', [])
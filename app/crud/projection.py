@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Type
+from pydantic import BaseModel, create_model
+
+class InvalidFieldsError(ValueError):
+    """Raised when a fields parameter names an attribute the model does not have"""
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel], key_name: str) -> Optional[Tuple[str, ...]]:
+    """
+    Turn a comma-separated fields parameter into a tuple of attribute names.
+    The primary key is always included so clients can tell the records apart.
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in model.model_fields]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys([key_name] + requested))
+
+def projection_params(fields: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    """ProjectionExpression parameters for get_item/scan/query (empty when fields is None)"""
+    if not fields:
+        return {}
+    # Placeholders keep reserved words such as "status" and "year" usable
+    names = {f'#p{index}': field for index, field in enumerate(fields)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """A trimmed copy of model holding only fields, all optional"""
+    return create_model(
+        f'{model.__name__}Fields',
+        **{field: (Optional[model.model_fields[field].annotation], None) for field in fields}
+    )
+
+def project(record: BaseModel, fields: Tuple[str, ...]) -> BaseModel:
+    """Trim a record that is already in memory (cache or replica hit) to fields"""
+    return partial_model(type(record), fields)(**{field: getattr(record, field) for field in fields})
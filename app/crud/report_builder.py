@@ -0,0 +1,172 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config import config
+from app.crud.factory import get_booking_crud
+from app.crud.report_cache import ReportCache, get_report_cache
+from app.crud.report_materializer import ReportMaterializer, get_report_materializer
+from app.crud.repository import BookingRepository
+from app.models.report import ReportSpec, ReportType
+from app.non_crud_lib.booking_aggregator import ALL, AggregateKey, Counters, customer_scope, month_period, service_center_scope
+from app.non_crud_lib.columnar_reports import BookingColumns, ColumnarReportGenerator
+from app.non_crud_lib.parallel_reports import ParallelReportGenerator
+from app.non_crud_lib.report_generator import ReportGenerator
+
+# Summary, performance and monthly reports read one pre-aggregated item instead of
+# scanning the bookings, so cost does not grow with history. config.REPORT_SOURCE
+# picks where it comes from:
+#   counters - write-time aggregates, updated by every booking write (live)
+#   rollups  - incrementally materialized from the bookings changed since the
+#              last refresh (up to REPORT_REFRESH_SECONDS old; bookings deleted by
+#              another process stay counted until the next full refresh)
+#   columnar - recomputed from the bookings every time, as vectorized NumPy
+#              group-bys (for ad-hoc checks against the pre-aggregated sources)
+# Reports computed from the bookings (columnar ones, the all-centers performance
+# report and customer service histories) are cached until a booking in their scope
+# is written, by this process or any other (ReportCache). Counter and rollup reports
+# are not: each is one aggregate read already, which is what validating a cached
+# copy against the other processes' writes would cost.
+
+def scans_all_bookings(spec: ReportSpec) -> bool:
+    """
+    Whether building the report reads the whole bookings table, so it belongs in
+    a report job rather than in a request (the all-centers performance report,
+    and the columnar summary and all-centers monthly reports)
+    """
+    if spec.report_type == ReportType.ALL_SERVICE_CENTERS_PERFORMANCE:
+        return True
+    if config.REPORT_SOURCE != 'columnar':
+        return False
+    return spec.report_type == ReportType.BOOKING_SUMMARY or (
+        spec.report_type == ReportType.MONTHLY and not spec.service_center_id
+    )
+
+class ReportBuilder:
+    """
+    Builds report payloads from the bookings repository. Blocking: the report
+    routes call it through AsyncReportBuilder, report jobs on their own workers.
+    """
+    
+    def __init__(
+        self,
+        bookings: BookingRepository = None,
+        materializer: ReportMaterializer = None,
+        cache: ReportCache = None
+    ):
+        self.bookings = bookings or get_booking_crud()
+        self.materializer = materializer or get_report_materializer()
+        self.cache = cache or get_report_cache()
+        self.report_generator = ReportGenerator()
+        self.columnar_report_generator = ColumnarReportGenerator()
+        self.parallel_report_generator = ParallelReportGenerator(
+            config.REPORT_PROCESS_WORKERS,
+            config.REPORT_PARALLEL_MIN_BOOKINGS
+        )
+    
+    def build(self, spec: ReportSpec) -> Dict[str, Any]:
+        """The report a spec describes (its required parameters are checked by the caller)"""
+        if spec.report_type == ReportType.BOOKING_SUMMARY:
+            return self.booking_summary()
+        if spec.report_type == ReportType.SERVICE_CENTER_PERFORMANCE:
+            return self.service_center_performance(spec.service_center_id)
+        if spec.report_type == ReportType.ALL_SERVICE_CENTERS_PERFORMANCE:
+            return self.all_service_centers_performance()
+        if spec.report_type == ReportType.MONTHLY:
+            return self.monthly(spec.month, spec.year, spec.service_center_id)
+        return self.customer_service_history(spec.customer_id)
+    
+    def booking_summary(self) -> Dict[str, Any]:
+        """Booking counts by status and service type, and revenue, across all service centers"""
+        return self._cached(('booking_summary',), (ALL, ALL), self._booking_summary)
+    
+    def service_center_performance(self, service_center_id: str) -> Dict[str, Any]:
+        """Completion and cancellation rates and completed revenue of one service center"""
+        return self._cached(
+            ('service_center_performance', service_center_id),
+            (service_center_scope(service_center_id), ALL),
+            lambda: self._service_center_performance(service_center_id)
+        )
+    
+    def all_service_centers_performance(self) -> Dict[str, Any]:
+        """
+        Performance of every service center with bookings. Always computed from the
+        bookings (whatever REPORT_SOURCE says): their columns are counted in row
+        ranges across the report process pool.
+        """
+        return self._cached(
+            ('all_service_centers_performance',),
+            (ALL, ALL),
+            self._all_service_centers_performance,
+            reads_aggregates=False
+        )
+    
+    def monthly(self, month: int, year: int, service_center_id: Optional[str] = None) -> Dict[str, Any]:
+        """Bookings and revenue of one month, for all service centers or just one"""
+        scope = service_center_scope(service_center_id) if service_center_id else ALL
+        return self._cached(
+            ('monthly', month, year, service_center_id),
+            (scope, month_period(month, year)),
+            lambda: self._monthly(month, year, service_center_id)
+        )
+    
+    def customer_service_history(self, customer_id: str) -> Dict[str, Any]:
+        """Services, spend and most frequent service of one customer"""
+        return self._cached(
+            ('customer_service_history', customer_id),
+            (customer_scope(customer_id), ALL),
+            lambda: self._customer_service_history(customer_id),
+            reads_aggregates=False
+        )
+    
+    def _cached(
+        self,
+        key: Tuple,
+        tag: AggregateKey,
+        compute: Callable[[], Dict[str, Any]],
+        reads_aggregates: bool = True
+    ) -> Dict[str, Any]:
+        """
+        A report from the cache, invalidated by writes to the bookings under tag.
+        Reports that read aggregates are only cached when REPORT_SOURCE makes them
+        scan bookings instead (columnar).
+        """
+        if reads_aggregates and config.REPORT_SOURCE != 'columnar':
+            return compute()
+        return self.cache.get_or_compute((config.REPORT_SOURCE,) + key, [tag], compute)
+    
+    def _booking_summary(self) -> Dict[str, Any]:
+        if config.REPORT_SOURCE == 'columnar':
+            return self.columnar_report_generator.generate_booking_summary_report(self._columns())
+        return self.report_generator.generate_booking_summary_from_aggregates(self._aggregates((ALL, ALL)))
+    
+    def _service_center_performance(self, service_center_id: str) -> Dict[str, Any]:
+        if config.REPORT_SOURCE == 'columnar':
+            return self.columnar_report_generator.generate_service_center_performance(self._columns(service_center_id))
+        aggregates = self._aggregates((service_center_scope(service_center_id), ALL))
+        return self.report_generator.generate_service_center_performance_from_aggregates(aggregates)
+    
+    def _all_service_centers_performance(self) -> Dict[str, Any]:
+        return self.parallel_report_generator.generate_all_service_center_performance(self._columns())
+    
+    def _monthly(self, month: int, year: int, service_center_id: Optional[str] = None) -> Dict[str, Any]:
+        if config.REPORT_SOURCE == 'columnar':
+            return self.columnar_report_generator.generate_monthly_report(month, year, self._columns(service_center_id))
+        scope = service_center_scope(service_center_id) if service_center_id else ALL
+        aggregates = self._aggregates((scope, month_period(month, year)))
+        return self.report_generator.generate_monthly_report_from_aggregates(month, year, aggregates)
+    
+    def _customer_service_history(self, customer_id: str) -> Dict[str, Any]:
+        bookings = self.bookings.get_bookings_by_customer(customer_id)
+        return self.report_generator.generate_customer_service_history([booking.dict() for booking in bookings])
+    
+    def _aggregates(self, key: AggregateKey) -> Counters:
+        if config.REPORT_SOURCE == 'rollups':
+            return self.materializer.aggregates(key)
+        return self.bookings.get_booking_aggregates(key)
+    
+    def _columns(self, service_center_id: Optional[str] = None) -> BookingColumns:
+        """Columns of one service center's bookings, or of the whole table read page by page"""
+        if service_center_id:
+            return BookingColumns.from_bookings(self.bookings.get_bookings_by_service_center(service_center_id))
+        return BookingColumns.concat([
+            BookingColumns.from_bookings(page)
+            for page in self.bookings.iter_booking_pages(config.SCAN_SEGMENTS)
+        ])
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+from app.config import config
+from app.crud.factory import get_booking_crud
+from app.non_crud_lib.booking_aggregator import ALL, CHANGES, AggregateKey, BookingAggregator, Change, customer_scope
+
+class ReportCache:
+    """
+    Report payloads keyed by report type and parameters. Each entry is tagged with
+    the (scope, period) keys of the bookings it was computed from, and a booking
+    write drops exactly the entries whose tags its old or new version falls under,
+    so a repeat view is served from memory until a booking in its scope changes.
+    
+    A report is only stored if none of its tags was invalidated while it was being
+    computed (it may have read the data from before that write).
+    
+    Writes made by other processes are caught through change_count, the shared
+    count of writes under a tag (the CHANGES counter the booking store bumps with
+    every aggregate update): an entry remembers the counts read before it was
+    computed and is only served while they are unchanged. Without change_count
+    the cache only sees this process's writes and ttl bounds how long others'
+    can go unseen. A maxsize of 0 disables caching.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+        change_count: Callable[[AggregateKey], float] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._change_count = change_count
+        self.aggregator = BookingAggregator()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, tags, expires_at, change counts)
+        self._keys_by_tag: Dict[AggregateKey, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self._sequence = 0  # Bumped by every invalidation
+        self._computing = 0  # Reports being computed right now
+        self._invalidated: Dict[AggregateKey, int] = {}  # tag -> sequence, kept while reports are being computed
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # Entries dropped because another process wrote under their tags
+        self.invalidations = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+    
+    def get_or_compute(self, key: Hashable, tags: List[AggregateKey], compute: Callable[[], Any]) -> Any:
+        """The cached report for key, or compute() stored under key and tags"""
+        if not self.enabled:
+            return compute()
+    
+        with self._lock:
+            entry = self._get(key)
+        if entry is not None:
+            value, _, _, counts = entry
+            current = self._change_counts(tags)
+            with self._lock:
+                if current == counts:
+                    self.hits += 1
+                    return value
+                self.stale += 1
+                if self._entries.get(key) is entry:
+                    self._remove(key)
+    
+        with self._lock:
+            self.misses += 1
+            token = self._sequence
+            self._computing += 1
+    
+        stored = False
+        try:
+            # Read before computing: a write in between makes the next lookup recompute
+            counts = self._change_counts(tags)
+            value = compute()
+            stored = True
+        finally:
+            with self._lock:
+                self._computing -= 1
+                if stored and all(self._invalidated.get(tag, 0) <= token for tag in tags):
+                    self._set(key, tags, value, counts)
+                if not self._computing:
+                    self._invalidated.clear()
+        return value
+    
+    def on_change(self, changes: List[Change]):
+        """Booking change listener: drop the reports the written bookings count towards"""
+        tags = set()
+        for old, new in changes:
+            for booking in (old, new):
+                if booking is not None:
+                    tags.update(self.aggregator.keys_for(booking))
+                    tags.add((customer_scope(booking.customer_id), ALL))
+        self.invalidate(tags)
+    
+    def invalidate(self, tags):
+        """Drop every entry tagged with one of tags"""
+        with self._lock:
+            self._sequence += 1
+            self.invalidations += 1
+            for tag in tags:
+                if self._computing:
+                    self._invalidated[tag] = self._sequence
+                for key in self._keys_by_tag.pop(tag, ()):
+                    self._remove(key)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/invalidation counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'stale': self.stale,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl
+            }
+    
+    def _change_counts(self, tags: List[AggregateKey]) -> Optional[tuple]:
+        if self._change_count is None:
+            return None
+        return tuple(self._change_count(tag) for tag in tags)
+    
+    def _get(self, key: Hashable) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] is not None and entry[2] <= self._clock():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    def _set(self, key: Hashable, tags: List[AggregateKey], value: Any, counts: Optional[tuple] = None):
+        if value is None:
+            return
+        self._remove(key)
+        expires_at = self._clock() + self.ttl if self.ttl > 0 else None
+        self._entries[key] = (value, tuple(tags), expires_at, counts)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+    
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+_lock = threading.Lock()
+_report_cache: Optional[ReportCache] = None
+
+def get_report_cache() -> ReportCache:
+    """
+    Shared report cache, invalidated by the writes of the shared booking
+    repository and checked against its CHANGES counters for everyone else's
+    """
+    global _report_cache
+    if _report_cache is None:
+        with _lock:
+            if _report_cache is None:
+                bookings = get_booking_crud()
+                report_cache = ReportCache(
+                    config.REPORT_CACHE_MAXSIZE,
+                    config.REPORT_CACHE_TTL,
+                    change_count=lambda tag: bookings.get_booking_aggregates(tag).get(CHANGES, 0)
+                )
+                bookings.add_change_listener(report_cache.on_change)
+                _report_cache = report_cache
+    return _report_cache
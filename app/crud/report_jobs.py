@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+from app.config import config
+from app.crud.report_builder import ReportBuilder
+from app.models.report import ReportJob, ReportJobStatus, ReportSpec
+from app.non_crud_lib.service_factory import get_storage_service
+from app.non_crud_lib.storage_service import StorageService
+
+JOB_FILE = 'job.json'
+RESULT_FILE = 'result.json'
+
+class ReportQueueFullError(Exception):
+    """Raised when every report worker is busy and the pending queue is full"""
+
+class ReportJobStore(ABC):
+    """
+    Where report jobs and their results live, one folder per job, so any
+    process can answer status and download requests for any job
+    """
+    
+    @abstractmethod
+    def put(self, job_id: str, file_name: str, content: bytes) -> str:
+        """Store a file of a job and return its key"""
+    
+    @abstractmethod
+    def get(self, job_id: str, file_name: str) -> Optional[bytes]:
+        """A stored file of a job, or None if it does not exist"""
+
+class LocalReportJobStore(ReportJobStore):
+    """Report jobs as files under a local directory (single-node deployments)"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+    
+    def put(self, job_id: str, file_name: str, content: bytes) -> str:
+        job_directory = os.path.join(self.directory, job_id)
+        os.makedirs(job_directory, exist_ok=True)
+        path = os.path.join(job_directory, file_name)
+        # Write then rename, so a poll never reads a half-written file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+        return path
+    
+    def get(self, job_id: str, file_name: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.directory, job_id, file_name), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+class S3ReportJobStore(ReportJobStore):
+    """Report jobs in the S3 document bucket, through StorageService"""
+    
+    def __init__(self, storage_service: StorageService = None):
+        self.storage_service = storage_service or get_storage_service()
+    
+    def put(self, job_id: str, file_name: str, content: bytes) -> str:
+        result = self.storage_service.upload_report(job_id, content, file_name)
+        if result['status'] != 'success':
+            raise RuntimeError(result['message'])
+        return result['file_key']
+    
+    def get(self, job_id: str, file_name: str) -> Optional[bytes]:
+        result = self.storage_service.download_document(f"reports/{job_id}/{file_name}")
+        if result['status'] == 'success':
+            return result['content']
+        if 'NoSuchKey' in result['message']:
+            return None
+        raise RuntimeError(result['message'])
+
+class ReportJobRunner:
+    """
+    Runs report jobs on a bounded pool of report workers, outside the request
+    path. At most workers + max_pending jobs are accepted at a time; beyond
+    that submit raises ReportQueueFullError instead of queueing without limit.
+    Jobs still pending or running when the process stops stay in that state.
+    """
+    
+    def __init__(self, store: ReportJobStore, builder: ReportBuilder = None, workers: int = None, max_pending: int = None):
+        self.store = store
+        self.builder = builder or ReportBuilder()
+        workers = workers or config.REPORT_JOB_WORKERS
+        max_pending = config.REPORT_JOB_MAX_PENDING if max_pending is None else max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-job')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+    
+    def submit(self, spec: ReportSpec) -> ReportJob:
+        """Record a new job and queue it; its parameters must already be checked"""
+        if not self._slots.acquire(blocking=False):
+            raise ReportQueueFullError('Too many report jobs in progress')
+        try:
+            job = ReportJob(job_id=str(uuid.uuid4()), spec=spec, created_at=datetime.utcnow().isoformat())
+            self._save(job)
+            self._executor.submit(self._run, job)
+        except BaseException:
+            self._slots.release()
+            raise
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[ReportJob]:
+        content = self.store.get(job_id, JOB_FILE)
+        return ReportJob(**json.loads(content)) if content is not None else None
+    
+    def get_result(self, job_id: str) -> Optional[bytes]:
+        """The stored report of a succeeded job (JSON)"""
+        return self.store.get(job_id, RESULT_FILE)
+    
+    def shutdown(self):
+        """Stop the report workers; queued jobs that have not started are dropped"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _run(self, job: ReportJob):
+        try:
+            job.status = ReportJobStatus.RUNNING
+            job.started_at = datetime.utcnow().isoformat()
+            self._save(job)
+    
+            report = self.builder.build(job.spec)
+            job.result_key = self.store.put(job.job_id, RESULT_FILE, json.dumps(report).encode())
+            job.status = ReportJobStatus.SUCCEEDED
+        except Exception as e:
+            print(f"Error running report job {job.job_id}: {e}")
+            job.status = ReportJobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            try:
+                self._save(job)
+            except Exception as e:
+                print(f"Error saving report job {job.job_id}: {e}")
+            self._slots.release()
+    
+    def _save(self, job: ReportJob):
+        self.store.put(job.job_id, JOB_FILE, json.dumps(job.dict()).encode())
+
+_lock = threading.Lock()
+_runner: Optional[ReportJobRunner] = None
+
+def get_report_job_runner() -> ReportJobRunner:
+    """Shared runner, so the worker pool bounds every report job of the process"""
+    global _runner
+    if _runner is None:
+        with _lock:
+            if _runner is None:
+                if config.REPORT_JOB_STORAGE == 's3':
+                    store = S3ReportJobStore()
+                else:
+                    store = LocalReportJobStore(config.REPORT_JOB_DIR)
+                _runner = ReportJobRunner(store)
+    return _runner
+
+def shutdown_report_job_runner():
+    """Stop the shared runner (called on application shutdown)"""
+    global _runner
+    with _lock:
+        if _runner is not None:
+            _runner.shutdown()
+            _runner = None
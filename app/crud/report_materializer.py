@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from app.config import config
+from app.crud.factory import get_booking_crud
+from app.crud.repository import BookingRepository
+from app.non_crud_lib.booking_aggregator import AggregateKey, Change, Counters
+from app.non_crud_lib.report_engine import IncrementalReportEngine
+
+class ReportMaterializer:
+    """
+    Keeps an IncrementalReportEngine up to date from the bookings repository.
+    The first refresh (and one every full_refresh_interval) folds the whole
+    table; the others fold only the bookings whose updated_at passed the
+    high-water mark, so their cost follows the number of changes rather than
+    the size of the history. Reads refresh lazily once the rollups are older
+    than refresh_interval.
+    
+    A deleted booking never shows up among the updated ones, so deletes are
+    taken from the repository's change listener (on_change) and removed by the
+    next refresh. That only sees this process's writes: a booking deleted by
+    another process is dropped by the next full refresh.
+    
+    With a checkpoint_path, the rollups are saved every checkpoint_interval by a
+    background thread and on close(), never by a refresh, and reloaded on start.
+    """
+    
+    def __init__(
+        self,
+        bookings: BookingRepository,
+        refresh_interval: float = None,
+        full_refresh_interval: float = None,
+        checkpoint_path: str = None,
+        checkpoint_interval: float = None
+    ):
+        self.bookings = bookings
+        self.refresh_interval = config.REPORT_REFRESH_SECONDS if refresh_interval is None else refresh_interval
+        self.full_refresh_interval = config.REPORT_FULL_REFRESH_SECONDS if full_refresh_interval is None else full_refresh_interval
+        self.checkpoint_path = config.REPORT_CHECKPOINT_PATH if checkpoint_path is None else checkpoint_path
+        self.checkpoint_interval = config.REPORT_CHECKPOINT_SECONDS if checkpoint_interval is None else checkpoint_interval
+        self._engine: Optional[IncrementalReportEngine] = None
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()  # One checkpoint write at a time
+        self._checkpointed_refresh = 0  # refresh_count the last checkpoint was taken at
+        self._checkpointer: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self._deleted: List[str] = []  # Booking IDs deleted since the last refresh started
+        self._deleted_lock = threading.Lock()
+        self._refreshed_at = 0.0  # time.monotonic() of the last refresh
+        self.refresh_count = 0
+        self.full_refresh_count = 0
+        self.last_folded = 0
+    
+    def aggregates(self, key: AggregateKey) -> Counters:
+        """Rollup counters of one (scope, period), folding in recent changes first if they are stale"""
+        with self._lock:
+            if self._engine is None or time.monotonic() - self._refreshed_at >= self.refresh_interval:
+                self._refresh()
+            return self._engine.get(key)
+    
+    def refresh(self, full: bool = False):
+        """Fold in the changes since the last refresh now (or rebuild everything with full)"""
+        with self._lock:
+            self._refresh(full)
+    
+    def on_change(self, changes: List[Change]):
+        """Booking change listener: remember deletes for the next refresh, without waiting for one"""
+        deleted = [old.booking_id for old, new in changes if old is not None and new is None]
+        if deleted:
+            with self._deleted_lock:
+                self._deleted.extend(deleted)
+    
+    def save_checkpoint(self):
+        """
+        Write the rollups to checkpoint_path if they changed since the last
+        checkpoint. Readers wait only for the in-memory copy, not for the write.
+        """
+        if not self.checkpoint_path:
+            return
+        with self._checkpoint_lock:
+            with self._lock:
+                if self._engine is None or self.refresh_count == self._checkpointed_refresh:
+                    return
+                snapshot = self._engine.snapshot()
+                refresh_count = self.refresh_count
+            try:
+                # Write then rename, so a crash never leaves a truncated checkpoint
+                temp_path = f"{self.checkpoint_path}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(snapshot.to_checkpoint(), f, separators=(',', ':'))
+                os.replace(temp_path, self.checkpoint_path)
+                self._checkpointed_refresh = refresh_count
+            except Exception as e:
+                print(f"Error saving report checkpoint: {e}")
+    
+    def close(self):
+        """Stop the checkpoint thread and write a last checkpoint (called on application shutdown)"""
+        self._closed.set()
+        if self._checkpointer is not None:
+            self._checkpointer.join()
+        self.save_checkpoint()
+    
+    def stats(self) -> Dict[str, Any]:
+        engine = self._engine
+        return {
+            'loaded': engine is not None,
+            'bookings': len(engine.folded) if engine else 0,
+            'rollups': len(engine.rollups) if engine else 0,
+            'high_water_mark': engine.high_water_mark if engine else None,
+            'rebuilt_at': engine.rebuilt_at if engine else None,
+            'refresh_count': self.refresh_count,
+            'full_refresh_count': self.full_refresh_count,
+            'last_folded': self.last_folded
+        }
+    
+    def _refresh(self, full: bool = False):
+        if self._engine is None and not full:
+            self._engine = self._load_checkpoint()
+        now = datetime.utcnow()
+        full = full or self._engine is None or None in (self._engine.high_water_mark, self._engine.rebuilt_at) or (
+            self.full_refresh_interval > 0
+            and now - datetime.fromisoformat(self._engine.rebuilt_at) >= timedelta(seconds=self.full_refresh_interval)
+        )
+    
+        # Everything written before the new mark is folded by this run; writes still in
+        # flight may carry an updated_at slightly below it, so the next run re-reads an
+        # overlap window (refolding an unchanged booking is a no-op)
+        high_water_mark = now.isoformat()
+        # Taken before reading the bookings: a delete from here on may come after its booking was read
+        with self._deleted_lock:
+            deleted, self._deleted = self._deleted, []
+        if full:
+            engine = IncrementalReportEngine()
+            engine.rebuilt_at = high_water_mark
+            pages = self.bookings.iter_booking_pages(config.SCAN_SEGMENTS)
+        else:
+            engine = self._engine
+            since = datetime.fromisoformat(engine.high_water_mark) - timedelta(seconds=config.REPORT_WATERMARK_OVERLAP_SECONDS)
+            pages = self.bookings.iter_bookings_updated_since(since.isoformat())
+    
+        folded = 0
+        for page in pages:
+            folded += engine.fold(page)
+        folded += engine.remove(deleted)
+        engine.high_water_mark = high_water_mark
+    
+        self._engine = engine
+        self._refreshed_at = time.monotonic()
+        self.refresh_count += 1
+        self.full_refresh_count += 1 if full else 0
+        self.last_folded = folded
+        self._start_checkpointer()
+    
+    def _load_checkpoint(self) -> Optional[IncrementalReportEngine]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path) as f:
+                return IncrementalReportEngine.from_checkpoint(json.load(f))
+        except Exception as e:
+            # Start over with a full refresh rather than fail the report
+            print(f"Error loading report checkpoint: {e}")
+            return None
+    
+    def _start_checkpointer(self):
+        if self._checkpointer is None and self.checkpoint_path and self.checkpoint_interval > 0:
+            self._checkpointer = threading.Thread(target=self._checkpoint_loop, name='report-checkpoint', daemon=True)
+            self._checkpointer.start()
+    
+    def _checkpoint_loop(self):
+        while not self._closed.wait(self.checkpoint_interval):
+            self.save_checkpoint()
+
+_lock = threading.Lock()
+_materializer: Optional[ReportMaterializer] = None
+
+def get_report_materializer() -> ReportMaterializer:
+    """Shared materializer, so every report route reads the same rollups"""
+    global _materializer
+    if _materializer is None:
+        with _lock:
+            if _materializer is None:
+                bookings = get_booking_crud()
+                materializer = ReportMaterializer(bookings)
+                bookings.add_change_listener(materializer.on_change)
+                _materializer = materializer
+    return _materializer
+
+def shutdown_report_materializer():
+    """Checkpoint and stop the shared materializer (called on application shutdown)"""
+    global _materializer
+    with _lock:
+        if _materializer is not None:
+            _materializer.close()
+            _materializer = None
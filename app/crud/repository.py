@@ -0,0 +1,333 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from app.config import config
+from app.models.booking import Booking, BookingCreate, BookingStatus, BookingUpdate
+from app.models.customer import Customer, CustomerCreate, CustomerUpdate
+from app.models.service_center import ServiceCenter, ServiceCenterCreate, ServiceCenterUpdate
+from app.models.vehicle import Vehicle, VehicleCreate, VehicleUpdate
+from app.non_crud_lib.booking_aggregator import AggregateKey, Change, Counters
+
+# Storage-agnostic interfaces for the four entities. The routes only talk to
+# these, so any backend (DynamoDB, in-memory, ...) can serve the same API.
+# Conventions shared by every backend:
+#   - create_* stamps created_at/updated_at and version 1
+#   - update_* returns None for a missing record and raises
+#     app.crud.updates.VersionConflictError when expected_version does not match
+#   - *_page takes and returns opaque next_token strings (app.crud.pagination)
+#   - fields is a tuple from app.crud.projection.parse_fields
+#   - create_booking/batch_create_bookings accept a pre-assigned booking_id and
+#     bay when the caller has already reserved the bay for that id
+#   - booking writes are reported to change listeners once they are visible to readers
+#   - update_booking takes booking_date and scheduled_time together (ValueError
+#     otherwise), so the schedule sort key needs no read of the stored booking
+
+class BookingRepository(ABC):
+    def __init__(self):
+        self._change_listeners: List[Callable[[List[Change]], None]] = []
+    
+    def add_change_listener(self, listener: Callable[[List[Change]], None]):
+        """Call listener with the (old, new) bookings of every write made through this repository"""
+        self._change_listeners.append(listener)
+    
+    def _notify_change(self, changes: List[Change]):
+        """
+        Report committed writes to the listeners. The write has already succeeded,
+        so a failing listener is logged rather than failing the request.
+        """
+        for listener in self._change_listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                print(f"Error notifying booking change listener: {e}")
+    
+    @abstractmethod
+    def create_booking(
+        self,
+        booking_data: BookingCreate,
+        estimated_cost: Optional[float] = None,
+        booking_id: Optional[str] = None,
+        bay: Optional[int] = None
+    ) -> Booking:
+        """Create a new booking"""
+    
+    @abstractmethod
+    def batch_create_bookings(
+        self,
+        bookings_data: List[BookingCreate],
+        estimated_costs: Optional[List[Optional[float]]] = None,
+        booking_ids: Optional[List[str]] = None,
+        bays: Optional[List[Optional[int]]] = None
+    ) -> Tuple[List[Booking], Dict[str, str]]:
+        """Create many bookings; also returns {booking_id: error} for writes that failed"""
+    
+    @abstractmethod
+    def get_booking(self, booking_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Booking]:
+        """Get booking by ID"""
+    
+    @abstractmethod
+    def get_bookings_by_ids(self, booking_ids: List[str]) -> List[Booking]:
+        """Get many bookings, in the requested order (each once; missing IDs are skipped)"""
+    
+    def get_all_bookings(self) -> List[Booking]:
+        """Get all bookings"""
+        bookings = []
+        for page in self.iter_booking_pages(config.SCAN_SEGMENTS):
+            bookings.extend(page)
+        return bookings
+    
+    @abstractmethod
+    def get_bookings_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """Get one page of bookings and the token for the next page"""
+    
+    @abstractmethod
+    def iter_booking_pages(self, segments: int = 1) -> Iterator[List[Booking]]:
+        """Stream all bookings page by page"""
+    
+    @abstractmethod
+    def iter_bookings_updated_since(self, since: str) -> Iterator[List[Booking]]:
+        """Stream, page by page, the bookings whose updated_at is later than since"""
+    
+    @abstractmethod
+    def get_bookings_by_customer(self, customer_id: str) -> List[Booking]:
+        """Get all bookings for a customer, ordered by booking date"""
+    
+    @abstractmethod
+    def get_bookings_by_vehicle(self, vehicle_id: str) -> List[Booking]:
+        """Get all bookings for a vehicle, ordered by booking date"""
+    
+    @abstractmethod
+    def get_bookings_by_service_center(self, service_center_id: str) -> List[Booking]:
+        """Get all bookings for a service center, ordered by booking date"""
+    
+    @abstractmethod
+    def get_service_center_schedule_page(
+        self,
+        service_center_id: str,
+        start: str,
+        end: str,
+        limit: int,
+        next_token: Optional[str] = None,
+        status: Optional[BookingStatus] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """
+        One page of a service center's bookings whose booking_datetime lies in
+        [start, end], ordered by it, and the token for the next page
+        """
+    
+    @abstractmethod
+    def update_booking(
+        self,
+        booking_id: str,
+        booking_data: BookingUpdate,
+        expected_version: Optional[int] = None,
+        bay: Optional[int] = None
+    ) -> Optional[Booking]:
+        """Update an existing booking; bay records a newly reserved bay"""
+    
+    @staticmethod
+    def _check_schedule_update(update_data: Dict[str, Any]):
+        """Reject an update that moves only half of the schedule (see the conventions above)"""
+        if ('booking_date' in update_data) != ('scheduled_time' in update_data):
+            raise ValueError("booking_date and scheduled_time must be updated together")
+    
+    @abstractmethod
+    def delete_booking(self, booking_id: str) -> bool:
+        """Delete a booking"""
+    
+    @abstractmethod
+    def get_booking_aggregates(self, key: AggregateKey) -> Counters:
+        """
+        Counters of one (scope, period) aggregate (app.non_crud_lib.booking_aggregator),
+        kept up to date by every booking write
+        """
+
+class VehicleRepository(ABC):
+    @abstractmethod
+    def create_vehicle(self, vehicle_data: VehicleCreate) -> Vehicle:
+        """Create a new vehicle"""
+    
+    @abstractmethod
+    def batch_create_vehicles(self, vehicles_data: List[VehicleCreate]) -> Tuple[List[Vehicle], Dict[str, str]]:
+        """Create many vehicles; also returns {vehicle_id: error} for writes that failed"""
+    
+    @abstractmethod
+    def get_vehicle(self, vehicle_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Vehicle]:
+        """Get vehicle by ID"""
+    
+    @abstractmethod
+    def get_vehicles_by_ids(self, vehicle_ids: List[str]) -> List[Vehicle]:
+        """Get many vehicles, in the requested order (each once; missing IDs are skipped)"""
+    
+    def get_all_vehicles(self) -> List[Vehicle]:
+        """Get all vehicles"""
+        vehicles = []
+        for page in self.iter_vehicle_pages(config.SCAN_SEGMENTS):
+            vehicles.extend(page)
+        return vehicles
+    
+    @abstractmethod
+    def get_vehicles_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Vehicle], Optional[str]]:
+        """Get one page of vehicles and the token for the next page"""
+    
+    @abstractmethod
+    def iter_vehicle_pages(self, segments: int = 1) -> Iterator[List[Vehicle]]:
+        """Stream all vehicles page by page"""
+    
+    @abstractmethod
+    def get_vehicles_by_customer(self, customer_id: str) -> List[Vehicle]:
+        """Get all vehicles for a customer"""
+    
+    @abstractmethod
+    def update_vehicle(self, vehicle_id: str, vehicle_data: VehicleUpdate, expected_version: Optional[int] = None) -> Optional[Vehicle]:
+        """Update an existing vehicle"""
+    
+    @abstractmethod
+    def delete_vehicle(self, vehicle_id: str) -> bool:
+        """Delete a vehicle"""
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the read cache, if the backend has one"""
+        return {'enabled': False}
+
+class CustomerRepository(ABC):
+    @abstractmethod
+    def create_customer(self, customer_data: CustomerCreate) -> Customer:
+        """Create a new customer"""
+    
+    @abstractmethod
+    def batch_create_customers(self, customers_data: List[CustomerCreate]) -> Tuple[List[Customer], Dict[str, str]]:
+        """Create many customers; also returns {customer_id: error} for writes that failed"""
+    
+    @abstractmethod
+    def get_customer(self, customer_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Customer]:
+        """Get customer by ID"""
+    
+    @abstractmethod
+    def get_customers_by_ids(self, customer_ids: List[str]) -> List[Customer]:
+        """Get many customers, in the requested order (each once; missing IDs are skipped)"""
+    
+    def get_all_customers(self) -> List[Customer]:
+        """Get all customers"""
+        customers = []
+        for page in self.iter_customer_pages(config.SCAN_SEGMENTS):
+            customers.extend(page)
+        return customers
+    
+    @abstractmethod
+    def get_customers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Customer], Optional[str]]:
+        """Get one page of customers and the token for the next page"""
+    
+    @abstractmethod
+    def iter_customer_pages(self, segments: int = 1) -> Iterator[List[Customer]]:
+        """Stream all customers page by page"""
+    
+    @abstractmethod
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
+        """Get customer by email"""
+    
+    @abstractmethod
+    def update_customer(self, customer_id: str, customer_data: CustomerUpdate, expected_version: Optional[int] = None) -> Optional[Customer]:
+        """Update an existing customer"""
+    
+    @abstractmethod
+    def delete_customer(self, customer_id: str) -> bool:
+        """Delete a customer"""
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the read cache, if the backend has one"""
+        return {'enabled': False}
+
+class ServiceCenterRepository(ABC):
+    @abstractmethod
+    def create_service_center(self, service_center_data: ServiceCenterCreate) -> ServiceCenter:
+        """Create a new service center"""
+    
+    @abstractmethod
+    def get_service_center(self, service_center_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[ServiceCenter]:
+        """Get service center by ID"""
+    
+    @abstractmethod
+    def get_service_centers_by_ids(self, service_center_ids: List[str]) -> List[ServiceCenter]:
+        """Get many service centers, in the requested order (each once; missing IDs are skipped)"""
+    
+    def get_all_service_centers(self) -> List[ServiceCenter]:
+        """Get all service centers"""
+        service_centers = []
+        for page in self.iter_service_center_pages(config.SCAN_SEGMENTS):
+            service_centers.extend(page)
+        return service_centers
+    
+    @abstractmethod
+    def get_service_centers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[ServiceCenter], Optional[str]]:
+        """Get one page of service centers and the token for the next page"""
+    
+    @abstractmethod
+    def iter_service_center_pages(self, segments: int = 1) -> Iterator[List[ServiceCenter]]:
+        """Stream all service centers page by page"""
+    
+    @abstractmethod
+    def get_service_centers_by_city(self, city: str) -> List[ServiceCenter]:
+        """Get service centers by city"""
+    
+    @abstractmethod
+    def get_service_centers_by_state(self, state: str) -> List[ServiceCenter]:
+        """Get service centers by state"""
+    
+    @abstractmethod
+    def get_service_centers_by_service(self, service: str) -> List[ServiceCenter]:
+        """Get service centers that offer a service type"""
+    
+    @abstractmethod
+    def update_service_center(self, service_center_id: str, service_center_data: ServiceCenterUpdate, expected_version: Optional[int] = None) -> Optional[ServiceCenter]:
+        """Update an existing service center"""
+    
+    @abstractmethod
+    def delete_service_center(self, service_center_id: str) -> bool:
+        """Delete a service center"""
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the read cache, if the backend has one"""
+        return {'enabled': False}
+    
+    def replica_stats(self) -> Dict[str, Any]:
+        """Size and refresh status of the in-memory replica, if the backend has one"""
+        return {'enabled': False}
+
+class SlotReservationRepository(ABC):
+    """
+    Service bay reservations, one record per (day_key, key) where day_key is a
+    service center and date and key a bay and time unit (see CapacityPlanner).
+    reserve must be atomic: concurrent callers can never both win a key.
+    """
+    
+    @abstractmethod
+    def reserve(self, day_key: str, keys: List[str], holder: str) -> bool:
+        """Claim every key for holder, or none if any is held by someone else"""
+    
+    @abstractmethod
+    def release(self, day_key: str, keys: List[str], holder: str):
+        """Free the keys that are still held by holder"""
+    
+    @abstractmethod
+    def get_reservations(self, day_key: str) -> Dict[str, str]:
+        """{key: holder} of every reservation under day_key"""
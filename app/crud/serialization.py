@@ -0,0 +1,12 @@
+from decimal import Decimal
+from typing import Any
+
+def to_dynamodb(value: Any) -> Any:
+    """Convert floats (recursively) to Decimal, which is the only number type boto3 accepts"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: to_dynamodb(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dynamodb(v) for v in value]
+    return value
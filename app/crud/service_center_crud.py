@@ -1,20 +1,42 @@
-import boto3
 from boto3.dynamodb.conditions import Attr
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import uuid
 from app.config import config
+from app.aws_clients import get_resource, get_table
+from app.crud.batch import batch_get_items
+from app.crud.cache import TTLCache
+from app.crud.pagination import decode_next_token, encode_next_token, scan_page
+from app.crud.parallel_scan import parallel_scan_pages
+from app.crud.projection import partial_model, project, projection_params
+from app.crud.repository import ServiceCenterRepository
+from app.crud.service_center_replica import ServiceCenterReplica
+from app.crud.updates import VersionConflictError, update_existing_item
 from app.models.service_center import ServiceCenter, ServiceCenterCreate, ServiceCenterUpdate
 
-class ServiceCenterCRUD:
+class ServiceCenterCRUD(ServiceCenterRepository):
+    """Service center repository backed by DynamoDB"""
+    
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
-        self.table = self.dynamodb.Table(config.SERVICE_CENTERS_TABLE)
+        self.cache = TTLCache(config.ENTITY_CACHE_MAXSIZE, config.SERVICE_CENTER_CACHE_TTL)
+        
+        # The table is small and read-mostly, so reads are served from a full in-memory copy
+        self.replica = None
+        if config.SERVICE_CENTER_REPLICA_ENABLED:
+            self.replica = ServiceCenterReplica(
+                self._scan_all_service_centers,
+                config.SERVICE_CENTER_REPLICA_REFRESH_SECONDS
+            )
+    
+    @property
+    def dynamodb(self):
+        """This thread's DynamoDB resource (resources are not thread-safe)"""
+        return get_resource('dynamodb')
+    
+    @property
+    def table(self):
+        """This thread's Table object"""
+        return get_table(config.SERVICE_CENTERS_TABLE)
     
     def create_service_center(self, service_center_data: ServiceCenterCreate) -> ServiceCenter:
         """Create a new service center"""
@@ -25,66 +47,188 @@ class ServiceCenterCRUD:
             service_center_id=service_center_id,
             **service_center_data.dict(),
             created_at=timestamp,
-            updated_at=timestamp
+            updated_at=timestamp,
+            version=1
         )
         
         self.table.put_item(Item=service_center.dict())
+        self._remember(service_center)
         return service_center
     
-    def get_service_center(self, service_center_id: str) -> Optional[ServiceCenter]:
-        """Get service center by ID"""
-        response = self.table.get_item(Key={'service_center_id': service_center_id})
+    def get_service_center(self, service_center_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[ServiceCenter]:
+        """Get service center by ID (replica, then read-through cache, then DynamoDB); fields limits the attributes returned"""
+        service_center = self.replica.get(service_center_id) if self.replica else None
+        if service_center is None:
+            service_center = self.cache.get(service_center_id)
+        if service_center is None:
+            # Not local yet, e.g. created by another worker since the last refresh
+            response = self.table.get_item(Key={'service_center_id': service_center_id}, **projection_params(fields))
+            if 'Item' not in response:
+                return None
+            if fields:
+                # Partial items are never cached
+                return partial_model(ServiceCenter, fields)(**response['Item'])
+            service_center = ServiceCenter(**response['Item'])
+            self._remember(service_center)
+        
+        if fields:
+            return project(service_center, fields)
+        # Callers get their own copy so they cannot mutate the cached record
+        return service_center.copy()
+    
+    def get_service_centers_by_ids(self, service_center_ids: List[str]) -> List[ServiceCenter]:
+        """
+        Get many service centers, in the requested order (each once; missing IDs are skipped).
+        Like get_service_center: replica, then cache, then one BatchGetItem for the rest.
+        """
+        unique_ids = list(dict.fromkeys(service_center_ids))
+        found = {}
+        for service_center_id in unique_ids:
+            service_center = self.replica.get(service_center_id) if self.replica else None
+            if service_center is None:
+                service_center = self.cache.get(service_center_id)
+            if service_center is not None:
+                found[service_center_id] = service_center
         
-        if 'Item' in response:
-            return ServiceCenter(**response['Item'])
-        return None
+        # Not local yet, e.g. created by another worker since the last refresh
+        missing = [service_center_id for service_center_id in unique_ids if service_center_id not in found]
+        if missing:
+            items = batch_get_items(self.dynamodb, config.SERVICE_CENTERS_TABLE, 'service_center_id', missing)
+            for service_center_id, item in items.items():
+                found[service_center_id] = ServiceCenter(**item)
+                self._remember(found[service_center_id])
+        # Callers get their own copies so they cannot mutate the cached records
+        return [found[service_center_id].copy() for service_center_id in unique_ids if service_center_id in found]
     
     def get_all_service_centers(self) -> List[ServiceCenter]:
         """Get all service centers"""
-        response = self.table.scan()
-        service_centers = [ServiceCenter(**item) for item in response.get('Items', [])]
+        if self.replica:
+            return [service_center.copy() for service_center in self.replica.all()]
+        return self._scan_all_service_centers()
+    
+    def _scan_all_service_centers(self) -> List[ServiceCenter]:
+        """Read the whole table from DynamoDB"""
+        return [
+            ServiceCenter(**item)
+            for page in parallel_scan_pages(self.table, config.SCAN_SEGMENTS, config.SCAN_WORKERS)
+            for item in page
+        ]
+    
+    def get_service_centers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[ServiceCenter], Optional[str]]:
+        """Get one page of service centers and the token for the next page; fields limits the attributes read"""
+        if self.replica:
+            # Same token format as DynamoDB's LastEvaluatedKey, paging in id order
+            start_key = decode_next_token(next_token)
+            page = self.replica.page_after(start_key.get('service_center_id') if start_key else None, limit)
+            next_token = None
+            if len(page) == limit:
+                next_token = encode_next_token({'service_center_id': page[-1].service_center_id})
+            if fields:
+                return [project(service_center, fields) for service_center in page], next_token
+            return [service_center.copy() for service_center in page], next_token
         
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            service_centers.extend([ServiceCenter(**item) for item in response.get('Items', [])])
+        items, next_token = scan_page(self.table, limit, next_token, **projection_params(fields))
+        model = partial_model(ServiceCenter, fields) if fields else ServiceCenter
+        return [model(**item) for item in items], next_token
+    
+    def iter_service_center_pages(self, segments: int = 1) -> Iterator[List[ServiceCenter]]:
+        """
+        Stream all service centers page by page without holding the whole table in memory.
+        With segments > 1 the table is read as a parallel segmented scan.
+        """
+        if self.replica:
+            service_centers = self.replica.all()
+            for start in range(0, len(service_centers), config.MAX_PAGE_SIZE):
+                yield [service_center.copy() for service_center in service_centers[start:start + config.MAX_PAGE_SIZE]]
+            return
         
-        return service_centers
+        for items in parallel_scan_pages(self.table, segments, config.SCAN_WORKERS):
+            yield [ServiceCenter(**item) for item in items]
     
     def get_service_centers_by_city(self, city: str) -> List[ServiceCenter]:
         """Get service centers by city"""
+        if self.replica:
+            return [service_center.copy() for service_center in self.replica.by_city(city)]
+        
         response = self.table.scan(
             FilterExpression=Attr('city').eq(city)
         )
         return [ServiceCenter(**item) for item in response.get('Items', [])]
     
-    def update_service_center(self, service_center_id: str, service_center_data: ServiceCenterUpdate) -> Optional[ServiceCenter]:
-        """Update an existing service center"""
-        current_service_center = self.get_service_center(service_center_id)
-        if not current_service_center:
-            return None
+    def get_service_centers_by_state(self, state: str) -> List[ServiceCenter]:
+        """Get service centers by state"""
+        if self.replica:
+            return [service_center.copy() for service_center in self.replica.by_state(state)]
         
+        return [
+            ServiceCenter(**item)
+            for page in parallel_scan_pages(self.table, 1, FilterExpression=Attr('state').eq(state))
+            for item in page
+        ]
+    
+    def get_service_centers_by_service(self, service: str) -> List[ServiceCenter]:
+        """Get service centers that offer a service type"""
+        if self.replica:
+            return [service_center.copy() for service_center in self.replica.by_service(service)]
+        
+        return [
+            ServiceCenter(**item)
+            for page in parallel_scan_pages(self.table, 1, FilterExpression=Attr('services_offered').contains(service))
+            for item in page
+        ]
+    
+    def update_service_center(self, service_center_id: str, service_center_data: ServiceCenterUpdate, expected_version: Optional[int] = None) -> Optional[ServiceCenter]:
+        """
+        Update an existing service center (single conditional write, no read first).
+        Raises VersionConflictError if expected_version is given and does not match.
+        """
         update_data = service_center_data.dict(exclude_unset=True)
         update_data['updated_at'] = datetime.utcnow().isoformat()
         
-        update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in update_data.keys()])
-        expression_attribute_names = {f"#{k}": k for k in update_data.keys()}
-        expression_attribute_values = {f":{k}": v for k, v in update_data.items()}
+        try:
+            item = update_existing_item(self.table, 'service_center_id', service_center_id, update_data, expected_version)
+        except VersionConflictError:
+            self._forget(service_center_id)
+            raise
         
-        response = self.table.update_item(
-            Key={'service_center_id': service_center_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeNames=expression_attribute_names,
-            ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW"
-        )
+        if not item:
+            self._forget(service_center_id)
+            return None
         
-        return ServiceCenter(**response['Attributes'])
+        service_center = ServiceCenter(**item)
+        self._remember(service_center)
+        return service_center
     
     def delete_service_center(self, service_center_id: str) -> bool:
         """Delete a service center"""
         try:
             self.table.delete_item(Key={'service_center_id': service_center_id})
+            self._forget(service_center_id)
             return True
         except Exception as e:
             print(f"Error deleting service center: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the service center read-through cache"""
+        return self.cache.stats()
+    
+    def replica_stats(self) -> Dict[str, Any]:
+        """Size and refresh status of the in-memory replica"""
+        return self.replica.stats() if self.replica else {'enabled': False}
+    
+    def _remember(self, service_center: ServiceCenter):
+        """Make this process's own write visible to local reads immediately"""
+        if self.replica:
+            self.replica.upsert(service_center.copy())
+        self.cache.set(service_center.service_center_id, service_center.copy())
+    
+    def _forget(self, service_center_id: str):
+        if self.replica:
+            self.replica.remove(service_center_id)
+        self.cache.invalidate(service_center_id)
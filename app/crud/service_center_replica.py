@@ -0,0 +1,158 @@
+import bisect
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from app.models.service_center import ServiceCenter
+
+class _Snapshot:
+    """Immutable view of the table with its secondary indexes"""
+    
+    def __init__(self, service_centers: Dict[str, ServiceCenter]):
+        self.by_id = service_centers
+        self.ordered_ids = sorted(service_centers)
+        self.by_city: Dict[str, List[str]] = {}
+        self.by_state: Dict[str, List[str]] = {}
+        self.by_service: Dict[str, List[str]] = {}
+        
+        for service_center_id in self.ordered_ids:
+            service_center = service_centers[service_center_id]
+            self.by_city.setdefault(service_center.city, []).append(service_center_id)
+            self.by_state.setdefault(service_center.state, []).append(service_center_id)
+            for service in service_center.services_offered:
+                self.by_service.setdefault(service, []).append(service_center_id)
+
+class ServiceCenterReplica:
+    """
+    Complete in-process copy of the service_centers table, indexed by id, city,
+    state and offered service. It is loaded on first use, reloaded in the
+    background every refresh_interval seconds, and patched immediately by this
+    process's own writes. Readers always see a consistent snapshot.
+    """
+    
+    def __init__(self, load_all: Callable[[], List[ServiceCenter]], refresh_interval: float):
+        self._load_all = load_all
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+        self._initial_load_lock = threading.Lock()
+        self._refreshing = False
+        self._pending: Dict[str, Optional[ServiceCenter]] = {}  # Local writes made while a refresh is loading
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refresh_count = 0
+        self.last_refreshed_at: Optional[str] = None
+    
+    def refresh(self):
+        """Reload the whole table and swap in a new snapshot"""
+        with self._lock:
+            self._refreshing = True
+            self._pending = {}
+        try:
+            service_centers = {sc.service_center_id: sc for sc in self._load_all()}
+        except Exception:
+            with self._lock:
+                self._refreshing = False
+            raise
+        
+        with self._lock:
+            # Writes that landed while the scan was running win over the scanned copy
+            for service_center_id, service_center in self._pending.items():
+                if service_center is None:
+                    service_centers.pop(service_center_id, None)
+                else:
+                    service_centers[service_center_id] = service_center
+            self._snapshot = _Snapshot(service_centers)
+            self._refreshing = False
+            self._pending = {}
+            self.refresh_count += 1
+            self.last_refreshed_at = datetime.utcnow().isoformat()
+    
+    def start(self):
+        """Start the background refresh thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None or self.refresh_interval <= 0:
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_loop,
+                name='service-center-replica',
+                daemon=True
+            )
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop.set()
+    
+    def upsert(self, service_center: ServiceCenter):
+        """Apply a local create/update without waiting for the next refresh"""
+        self._apply(service_center.service_center_id, service_center)
+    
+    def remove(self, service_center_id: str):
+        """Apply a local delete without waiting for the next refresh"""
+        self._apply(service_center_id, None)
+    
+    def get(self, service_center_id: str) -> Optional[ServiceCenter]:
+        return self._current().by_id.get(service_center_id)
+    
+    def all(self) -> List[ServiceCenter]:
+        snapshot = self._current()
+        return [snapshot.by_id[i] for i in snapshot.ordered_ids]
+    
+    def page_after(self, last_id: Optional[str], limit: int) -> List[ServiceCenter]:
+        """Up to limit records in id order, starting after last_id"""
+        snapshot = self._current()
+        start = bisect.bisect_right(snapshot.ordered_ids, last_id) if last_id else 0
+        return [snapshot.by_id[i] for i in snapshot.ordered_ids[start:start + limit]]
+    
+    def by_city(self, city: str) -> List[ServiceCenter]:
+        snapshot = self._current()
+        return [snapshot.by_id[i] for i in snapshot.by_city.get(city, [])]
+    
+    def by_state(self, state: str) -> List[ServiceCenter]:
+        snapshot = self._current()
+        return [snapshot.by_id[i] for i in snapshot.by_state.get(state, [])]
+    
+    def by_service(self, service: str) -> List[ServiceCenter]:
+        snapshot = self._current()
+        return [snapshot.by_id[i] for i in snapshot.by_service.get(service, [])]
+    
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            'loaded': snapshot is not None,
+            'size': len(snapshot.by_id) if snapshot else 0,
+            'refresh_count': self.refresh_count,
+            'last_refreshed_at': self.last_refreshed_at,
+            'refresh_interval_seconds': self.refresh_interval
+        }
+    
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._initial_load_lock:
+                if self._snapshot is None:
+                    self.refresh()
+                    self.start()
+            snapshot = self._snapshot
+        return snapshot
+    
+    def _apply(self, service_center_id: str, service_center: Optional[ServiceCenter]):
+        with self._lock:
+            if self._refreshing:
+                self._pending[service_center_id] = service_center
+            if self._snapshot is None:
+                return
+            service_centers = dict(self._snapshot.by_id)
+            if service_center is None:
+                service_centers.pop(service_center_id, None)
+            else:
+                service_centers[service_center_id] = service_center
+            self._snapshot = _Snapshot(service_centers)
+    
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the last good snapshot
+                print(f"Error refreshing service center replica: {e}")
@@ -0,0 +1,69 @@
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from typing import Dict, List
+from app.config import config
+from app.aws_clients import get_resource, get_table
+from app.crud.repository import SlotReservationRepository
+
+class SlotReservationCRUD(SlotReservationRepository):
+    """Slot reservations stored in DynamoDB (day_key hash key, slot range key)"""
+    
+    def __init__(self):
+        # The shared client behind the resources: thread-safe, and it accepts plain Python
+        # values (but not condition objects inside TransactItems)
+        self.client = self.dynamodb.meta.client
+    
+    @property
+    def dynamodb(self):
+        """This thread's DynamoDB resource (resources are not thread-safe)"""
+        return get_resource('dynamodb')
+    
+    @property
+    def table(self):
+        """This thread's Table object"""
+        return get_table(config.SLOT_RESERVATIONS_TABLE)
+    
+    def reserve(self, day_key: str, keys: List[str], holder: str) -> bool:
+        """Claim all keys in one TransactWriteItems; each put only succeeds if the key is free or already ours"""
+        try:
+            self.client.transact_write_items(TransactItems=[
+                {
+                    'Put': {
+                        'TableName': config.SLOT_RESERVATIONS_TABLE,
+                        'Item': {'day_key': day_key, 'slot': key, 'holder': holder},
+                        'ConditionExpression': 'attribute_not_exists(#slot) OR #holder = :holder',
+                        'ExpressionAttributeNames': {'#slot': 'slot', '#holder': 'holder'},
+                        'ExpressionAttributeValues': {':holder': holder}
+                    }
+                }
+                for key in keys
+            ])
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'TransactionCanceledException':
+                return False
+            raise
+    
+    def release(self, day_key: str, keys: List[str], holder: str):
+        """Delete each key that holder still owns"""
+        for key in keys:
+            try:
+                self.table.delete_item(
+                    Key={'day_key': day_key, 'slot': key},
+                    ConditionExpression=Attr('holder').eq(holder)
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+    
+    def get_reservations(self, day_key: str) -> Dict[str, str]:
+        """{slot: holder} for one service center and day, following LastEvaluatedKey"""
+        query_params = {'KeyConditionExpression': Key('day_key').eq(day_key)}
+        response = self.table.query(**query_params)
+        items = response.get('Items', [])
+    
+        while 'LastEvaluatedKey' in response:
+            response = self.table.query(ExclusiveStartKey=response['LastEvaluatedKey'], **query_params)
+            items.extend(response.get('Items', []))
+    
+        return {item['slot']: item['holder'] for item in items}
@@ -0,0 +1,529 @@
+import json
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+import uuid
+from app.config import config
+from app.crud.pagination import InvalidPageTokenError, decode_next_token, encode_next_token
+from app.crud.projection import project
+from app.crud.repository import (
+    BookingRepository,
+    CustomerRepository,
+    ServiceCenterRepository,
+    SlotReservationRepository,
+    VehicleRepository
+)
+from app.crud.sqlite_table import BOOKING_DATETIME_SQL, BOOKING_UPDATED_AT_SQL, SQLiteDatabase, SQLiteTable, get_database
+from app.models.booking import Booking, BookingCreate, BookingStatus, BookingUpdate, booking_datetime
+from app.models.customer import Customer, CustomerCreate, CustomerUpdate
+from app.models.service_center import ServiceCenter, ServiceCenterCreate, ServiceCenterUpdate
+from app.models.vehicle import Vehicle, VehicleCreate, VehicleUpdate
+from app.non_crud_lib.booking_aggregator import AggregateKey, BookingAggregator, Change, Counters
+
+# Embedded backends for single-node deployments: one local SQLite file (see
+# SQLiteDatabase), so reads cost microseconds instead of a network round trip.
+# Every record read is freshly decoded, so nothing is shared with callers.
+
+class SQLiteBookingCRUD(BookingRepository):
+    """Booking repository stored in the local SQLite database"""
+    
+    def __init__(self, database: SQLiteDatabase = None):
+        super().__init__()
+        database = database or get_database()
+        self.aggregates = SQLiteBookingAggregates(database)
+        self.table = SQLiteTable(
+            database,
+            config.BOOKINGS_TABLE,
+            'booking_id',
+            Booking,
+            columns=('customer_id', 'vehicle_id', 'service_center_id', 'booking_date', 'status'),
+            on_change=self.aggregates.apply,
+            on_commit=self._notify_change
+        )
+    
+    def create_booking(
+        self,
+        booking_data: BookingCreate,
+        estimated_cost: Optional[float] = None,
+        booking_id: Optional[str] = None,
+        bay: Optional[int] = None
+    ) -> Booking:
+        """Create a new booking"""
+        bookings = self._build([booking_data], [estimated_cost], [booking_id], [bay])
+        self.table.insert(bookings)
+        return bookings[0]
+    
+    def batch_create_bookings(
+        self,
+        bookings_data: List[BookingCreate],
+        estimated_costs: Optional[List[Optional[float]]] = None,
+        booking_ids: Optional[List[str]] = None,
+        bays: Optional[List[Optional[int]]] = None
+    ) -> Tuple[List[Booking], Dict[str, str]]:
+        """Create many bookings in one transaction; also returns {booking_id: error} if it failed"""
+        bookings = self._build(
+            bookings_data,
+            estimated_costs or [None] * len(bookings_data),
+            booking_ids or [None] * len(bookings_data),
+            bays or [None] * len(bookings_data)
+        )
+        try:
+            self.table.insert(bookings)
+        except Exception as e:
+            print(f"Error creating bookings: {e}")
+            return bookings, {booking.booking_id: str(e) for booking in bookings}
+        return bookings, {}
+    
+    def _build(
+        self,
+        bookings_data: List[BookingCreate],
+        estimated_costs: List[Optional[float]],
+        booking_ids: List[Optional[str]],
+        bays: List[Optional[int]]
+    ) -> List[Booking]:
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            Booking(
+                booking_id=booking_id or str(uuid.uuid4()),
+                **booking_data.dict(),
+                estimated_cost=estimated_cost,
+                bay=bay,
+                created_at=timestamp,
+                updated_at=timestamp,
+                version=1
+            )
+            for booking_data, estimated_cost, booking_id, bay in zip(bookings_data, estimated_costs, booking_ids, bays)
+        ]
+    
+    def get_booking(self, booking_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Booking]:
+        """Get booking by ID"""
+        booking = self.table.get(booking_id)
+        if booking is None:
+            return None
+        return project(booking, fields) if fields else booking
+    
+    def get_bookings_by_ids(self, booking_ids: List[str]) -> List[Booking]:
+        """Get many bookings, in the requested order (each once; missing IDs are skipped)"""
+        bookings = self.table.get_many(booking_ids)
+        return [bookings[booking_id] for booking_id in dict.fromkeys(booking_ids) if booking_id in bookings]
+    
+    def get_bookings_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """Get one page of bookings and the token for the next page"""
+        bookings, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(booking, fields) for booking in bookings], next_token
+        return bookings, next_token
+    
+    def iter_booking_pages(self, segments: int = 1) -> Iterator[List[Booking]]:
+        """Stream all bookings page by page (segments is ignored)"""
+        return self.table.iter_pages(config.MAX_PAGE_SIZE)
+    
+    def iter_bookings_updated_since(self, since: str) -> Iterator[List[Booking]]:
+        """Stream the bookings updated after since, page by page, from a range scan of the updated_at index"""
+        after = (since, '')
+        while True:
+            bookings = self.table.query(
+                f"({BOOKING_UPDATED_AT_SQL}, booking_id) > (?, ?)",
+                after,
+                f"{BOOKING_UPDATED_AT_SQL}, booking_id",
+                config.MAX_PAGE_SIZE
+            )
+            if bookings:
+                yield bookings
+            if len(bookings) < config.MAX_PAGE_SIZE:
+                return
+            after = (bookings[-1].updated_at, bookings[-1].booking_id)
+    
+    def get_bookings_by_customer(self, customer_id: str) -> List[Booking]:
+        """Get all bookings for a customer, ordered by booking date"""
+        return self.table.where('customer_id', customer_id, order_by='booking_date, booking_id')
+    
+    def get_bookings_by_vehicle(self, vehicle_id: str) -> List[Booking]:
+        """Get all bookings for a vehicle, ordered by booking date"""
+        return self.table.where('vehicle_id', vehicle_id, order_by='booking_date, booking_id')
+    
+    def get_bookings_by_service_center(self, service_center_id: str) -> List[Booking]:
+        """Get all bookings for a service center, ordered by booking date"""
+        return self.table.where('service_center_id', service_center_id, order_by='booking_date, booking_id')
+    
+    def get_service_center_schedule_page(
+        self,
+        service_center_id: str,
+        start: str,
+        end: str,
+        limit: int,
+        next_token: Optional[str] = None,
+        status: Optional[BookingStatus] = None
+    ) -> Tuple[List[Booking], Optional[str]]:
+        """One page of a service center's bookings in [start, end], a range scan of the schedule index"""
+        condition = f"service_center_id = ? AND {BOOKING_DATETIME_SQL} BETWEEN ? AND ?"
+        params = (service_center_id, start, end)
+    
+        last_key = decode_next_token(next_token)
+        if last_key:
+            if not isinstance(last_key.get('booking_datetime'), str) or not isinstance(last_key.get('booking_id'), str):
+                raise InvalidPageTokenError('Invalid next_token')
+            condition += f" AND ({BOOKING_DATETIME_SQL}, booking_id) > (?, ?)"
+            params += (last_key['booking_datetime'], last_key['booking_id'])
+        if status:
+            condition += " AND status = ?"
+            params += (status.value,)
+    
+        bookings = self.table.query(condition, params, f"{BOOKING_DATETIME_SQL}, booking_id", limit + 1)
+        next_token = None
+        if len(bookings) > limit:
+            bookings = bookings[:limit]
+            last = bookings[-1]
+            next_token = encode_next_token({
+                'booking_datetime': booking_datetime(last.booking_date, last.scheduled_time),
+                'booking_id': last.booking_id
+            })
+        return bookings, next_token
+    
+    def update_booking(
+        self,
+        booking_id: str,
+        booking_data: BookingUpdate,
+        expected_version: Optional[int] = None,
+        bay: Optional[int] = None
+    ) -> Optional[Booking]:
+        """Update an existing booking"""
+        update_data = booking_data.dict(exclude_unset=True)
+        self._check_schedule_update(update_data)
+        if bay is not None:
+            update_data['bay'] = bay
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        return self.table.update(booking_id, update_data, expected_version)
+    
+    def delete_booking(self, booking_id: str) -> bool:
+        """Delete a booking"""
+        try:
+            self.table.delete(booking_id)
+            return True
+        except Exception as e:
+            print(f"Error deleting booking: {e}")
+            return False
+    
+    def get_booking_aggregates(self, key: AggregateKey) -> Counters:
+        """Write-time counters of one (scope, period) aggregate"""
+        return self.aggregates.get(key)
+
+class SQLiteBookingAggregates:
+    """
+    Booking counters in the local SQLite database, one row per (scope, period,
+    counter). Deltas are upserted inside the booking write's own transaction,
+    so the counters can never drift from the bookings table.
+    """
+    
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+        self.aggregator = BookingAggregator()
+        self._upsert_sql = (
+            f"INSERT INTO {config.BOOKING_AGGREGATES_TABLE} (scope, period, counter, value) VALUES (?, ?, ?, ?) "
+            f"ON CONFLICT (scope, period, counter) DO UPDATE SET value = value + excluded.value"
+        )
+        self._get_sql = f"SELECT counter, value FROM {config.BOOKING_AGGREGATES_TABLE} WHERE scope = ? AND period = ?"
+    
+    def apply(self, conn: sqlite3.Connection, changes: List[Change]):
+        """Add the counter deltas of booking writes, on the writer's connection"""
+        conn.executemany(self._upsert_sql, [
+            (scope, period, name, value)
+            for (scope, period), counters in self.aggregator.deltas(changes).items()
+            for name, value in counters.items()
+        ])
+    
+    def get(self, key: AggregateKey) -> Counters:
+        """Counters of one aggregate (empty if nothing was ever counted there)"""
+        return {name: value for name, value in self.database.connection().execute(self._get_sql, key) if value}
+
+class SQLiteVehicleCRUD(VehicleRepository):
+    """Vehicle repository stored in the local SQLite database"""
+    
+    def __init__(self, database: SQLiteDatabase = None):
+        self.table = SQLiteTable(database or get_database(), config.VEHICLES_TABLE, 'vehicle_id', Vehicle, columns=('customer_id',))
+    
+    def create_vehicle(self, vehicle_data: VehicleCreate) -> Vehicle:
+        """Create a new vehicle"""
+        vehicles = self._build([vehicle_data])
+        self.table.insert(vehicles)
+        return vehicles[0]
+    
+    def batch_create_vehicles(self, vehicles_data: List[VehicleCreate]) -> Tuple[List[Vehicle], Dict[str, str]]:
+        """Create many vehicles in one transaction; also returns {vehicle_id: error} if it failed"""
+        vehicles = self._build(vehicles_data)
+        try:
+            self.table.insert(vehicles)
+        except Exception as e:
+            print(f"Error creating vehicles: {e}")
+            return vehicles, {vehicle.vehicle_id: str(e) for vehicle in vehicles}
+        return vehicles, {}
+    
+    def _build(self, vehicles_data: List[VehicleCreate]) -> List[Vehicle]:
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            Vehicle(
+                vehicle_id=str(uuid.uuid4()),
+                **vehicle_data.dict(),
+                created_at=timestamp,
+                updated_at=timestamp,
+                version=1
+            )
+            for vehicle_data in vehicles_data
+        ]
+    
+    def get_vehicle(self, vehicle_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Vehicle]:
+        """Get vehicle by ID"""
+        vehicle = self.table.get(vehicle_id)
+        if vehicle is None:
+            return None
+        return project(vehicle, fields) if fields else vehicle
+    
+    def get_vehicles_by_ids(self, vehicle_ids: List[str]) -> List[Vehicle]:
+        """Get many vehicles, in the requested order (each once; missing IDs are skipped)"""
+        vehicles = self.table.get_many(vehicle_ids)
+        return [vehicles[vehicle_id] for vehicle_id in dict.fromkeys(vehicle_ids) if vehicle_id in vehicles]
+    
+    def get_vehicles_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Vehicle], Optional[str]]:
+        """Get one page of vehicles and the token for the next page"""
+        vehicles, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(vehicle, fields) for vehicle in vehicles], next_token
+        return vehicles, next_token
+    
+    def iter_vehicle_pages(self, segments: int = 1) -> Iterator[List[Vehicle]]:
+        """Stream all vehicles page by page (segments is ignored)"""
+        return self.table.iter_pages(config.MAX_PAGE_SIZE)
+    
+    def get_vehicles_by_customer(self, customer_id: str) -> List[Vehicle]:
+        """Get all vehicles for a customer"""
+        return self.table.where('customer_id', customer_id)
+    
+    def update_vehicle(self, vehicle_id: str, vehicle_data: VehicleUpdate, expected_version: Optional[int] = None) -> Optional[Vehicle]:
+        """Update an existing vehicle"""
+        update_data = vehicle_data.dict(exclude_unset=True)
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        return self.table.update(vehicle_id, update_data, expected_version)
+    
+    def delete_vehicle(self, vehicle_id: str) -> bool:
+        """Delete a vehicle"""
+        try:
+            self.table.delete(vehicle_id)
+            return True
+        except Exception as e:
+            print(f"Error deleting vehicle: {e}")
+            return False
+
+class SQLiteCustomerCRUD(CustomerRepository):
+    """Customer repository stored in the local SQLite database"""
+    
+    def __init__(self, database: SQLiteDatabase = None):
+        self.table = SQLiteTable(database or get_database(), config.CUSTOMERS_TABLE, 'customer_id', Customer, columns=('email',))
+    
+    def create_customer(self, customer_data: CustomerCreate) -> Customer:
+        """Create a new customer"""
+        customers = self._build([customer_data])
+        self.table.insert(customers)
+        return customers[0]
+    
+    def batch_create_customers(self, customers_data: List[CustomerCreate]) -> Tuple[List[Customer], Dict[str, str]]:
+        """Create many customers in one transaction; also returns {customer_id: error} if it failed"""
+        customers = self._build(customers_data)
+        try:
+            self.table.insert(customers)
+        except Exception as e:
+            print(f"Error creating customers: {e}")
+            return customers, {customer.customer_id: str(e) for customer in customers}
+        return customers, {}
+    
+    def _build(self, customers_data: List[CustomerCreate]) -> List[Customer]:
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            Customer(
+                customer_id=str(uuid.uuid4()),
+                **customer_data.dict(),
+                created_at=timestamp,
+                updated_at=timestamp,
+                version=1
+            )
+            for customer_data in customers_data
+        ]
+    
+    def get_customer(self, customer_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Customer]:
+        """Get customer by ID"""
+        customer = self.table.get(customer_id)
+        if customer is None:
+            return None
+        return project(customer, fields) if fields else customer
+    
+    def get_customers_by_ids(self, customer_ids: List[str]) -> List[Customer]:
+        """Get many customers, in the requested order (each once; missing IDs are skipped)"""
+        customers = self.table.get_many(customer_ids)
+        return [customers[customer_id] for customer_id in dict.fromkeys(customer_ids) if customer_id in customers]
+    
+    def get_customers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Customer], Optional[str]]:
+        """Get one page of customers and the token for the next page"""
+        customers, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(customer, fields) for customer in customers], next_token
+        return customers, next_token
+    
+    def iter_customer_pages(self, segments: int = 1) -> Iterator[List[Customer]]:
+        """Stream all customers page by page (segments is ignored)"""
+        return self.table.iter_pages(config.MAX_PAGE_SIZE)
+    
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
+        """Get customer by email"""
+        customers = self.table.where('email', email)
+        return customers[0] if customers else None
+    
+    def update_customer(self, customer_id: str, customer_data: CustomerUpdate, expected_version: Optional[int] = None) -> Optional[Customer]:
+        """Update an existing customer"""
+        update_data = customer_data.dict(exclude_unset=True)
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        return self.table.update(customer_id, update_data, expected_version)
+    
+    def delete_customer(self, customer_id: str) -> bool:
+        """Delete a customer"""
+        try:
+            self.table.delete(customer_id)
+            return True
+        except Exception as e:
+            print(f"Error deleting customer: {e}")
+            return False
+
+class SQLiteServiceCenterCRUD(ServiceCenterRepository):
+    """Service center repository stored in the local SQLite database"""
+    
+    def __init__(self, database: SQLiteDatabase = None):
+        self.table = SQLiteTable(
+            database or get_database(),
+            config.SERVICE_CENTERS_TABLE,
+            'service_center_id',
+            ServiceCenter,
+            columns=('city', 'state'),
+            list_column='services_offered'
+        )
+    
+    def create_service_center(self, service_center_data: ServiceCenterCreate) -> ServiceCenter:
+        """Create a new service center"""
+        timestamp = datetime.utcnow().isoformat()
+    
+        service_center = ServiceCenter(
+            service_center_id=str(uuid.uuid4()),
+            **service_center_data.dict(),
+            created_at=timestamp,
+            updated_at=timestamp,
+            version=1
+        )
+    
+        self.table.insert([service_center])
+        return service_center
+    
+    def get_service_center(self, service_center_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[ServiceCenter]:
+        """Get service center by ID"""
+        service_center = self.table.get(service_center_id)
+        if service_center is None:
+            return None
+        return project(service_center, fields) if fields else service_center
+    
+    def get_service_centers_by_ids(self, service_center_ids: List[str]) -> List[ServiceCenter]:
+        """Get many service centers, in the requested order (each once; missing IDs are skipped)"""
+        service_centers = self.table.get_many(service_center_ids)
+        return [
+            service_centers[service_center_id]
+            for service_center_id in dict.fromkeys(service_center_ids)
+            if service_center_id in service_centers
+        ]
+    
+    def get_service_centers_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[ServiceCenter], Optional[str]]:
+        """Get one page of service centers and the token for the next page"""
+        service_centers, next_token = self.table.page(limit, next_token)
+        if fields:
+            return [project(service_center, fields) for service_center in service_centers], next_token
+        return service_centers, next_token
+    
+    def iter_service_center_pages(self, segments: int = 1) -> Iterator[List[ServiceCenter]]:
+        """Stream all service centers page by page (segments is ignored)"""
+        return self.table.iter_pages(config.MAX_PAGE_SIZE)
+    
+    def get_service_centers_by_city(self, city: str) -> List[ServiceCenter]:
+        """Get service centers by city"""
+        return self.table.where('city', city)
+    
+    def get_service_centers_by_state(self, state: str) -> List[ServiceCenter]:
+        """Get service centers by state"""
+        return self.table.where('state', state)
+    
+    def get_service_centers_by_service(self, service: str) -> List[ServiceCenter]:
+        """Get service centers that offer a service type"""
+        return self.table.containing(service)
+    
+    def update_service_center(self, service_center_id: str, service_center_data: ServiceCenterUpdate, expected_version: Optional[int] = None) -> Optional[ServiceCenter]:
+        """Update an existing service center"""
+        update_data = service_center_data.dict(exclude_unset=True)
+        update_data['updated_at'] = datetime.utcnow().isoformat()
+    
+        return self.table.update(service_center_id, update_data, expected_version)
+    
+    def delete_service_center(self, service_center_id: str) -> bool:
+        """Delete a service center"""
+        try:
+            self.table.delete(service_center_id)
+            return True
+        except Exception as e:
+            print(f"Error deleting service center: {e}")
+            return False
+
+class SQLiteSlotReservationCRUD(SlotReservationRepository):
+    """Slot reservations stored in the local SQLite database"""
+    
+    def __init__(self, database: SQLiteDatabase = None):
+        self.database = database or get_database()
+        self._holders_sql = (
+            f"SELECT slot, holder FROM {config.SLOT_RESERVATIONS_TABLE} WHERE day_key = ? "
+            f"AND slot IN (SELECT value FROM json_each(?))"
+        )
+        self._insert_sql = f"INSERT OR REPLACE INTO {config.SLOT_RESERVATIONS_TABLE} (day_key, slot, holder) VALUES (?, ?, ?)"
+        self._delete_sql = f"DELETE FROM {config.SLOT_RESERVATIONS_TABLE} WHERE day_key = ? AND slot = ? AND holder = ?"
+        self._day_sql = f"SELECT slot, holder FROM {config.SLOT_RESERVATIONS_TABLE} WHERE day_key = ?"
+    
+    def reserve(self, day_key: str, keys: List[str], holder: str) -> bool:
+        """Check and claim all keys inside one write transaction"""
+        with self.database.transaction() as conn:
+            taken = conn.execute(self._holders_sql, (day_key, json.dumps(keys))).fetchall()
+            if any(current != holder for _, current in taken):
+                return False
+            conn.executemany(self._insert_sql, [(day_key, key, holder) for key in keys])
+            return True
+    
+    def release(self, day_key: str, keys: List[str], holder: str):
+        """Free the keys that holder still owns"""
+        with self.database.transaction() as conn:
+            conn.executemany(self._delete_sql, [(day_key, key, holder) for key in keys])
+    
+    def get_reservations(self, day_key: str) -> Dict[str, str]:
+        """{key: holder} for one service center and day"""
+        return dict(self.database.connection().execute(self._day_sql, (day_key,)))
@@ -0,0 +1,331 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+from pydantic import BaseModel
+from app.config import config
+from app.crud.pagination import InvalidPageTokenError, decode_next_token, encode_next_token
+from app.crud.updates import VERSION_ATTRIBUTE, VersionConflictError
+
+# Each table keeps the full record as JSON in `data`, plus real columns for the
+# key, the attributes we filter or sort on, and the version. Every list lookup
+# the routes make is answered from an index.
+
+# Sortable booking start (see app.models.booking.booking_datetime), indexed per service center
+BOOKING_DATETIME_SQL = "booking_date || 'T' || json_extract(data, '$.scheduled_time')"
+# Last write of a booking, indexed for incremental report refreshes
+BOOKING_UPDATED_AT_SQL = "json_extract(data, '$.updated_at')"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {config.BOOKINGS_TABLE} (
+    booking_id TEXT PRIMARY KEY,
+    customer_id TEXT NOT NULL,
+    vehicle_id TEXT NOT NULL,
+    service_center_id TEXT NOT NULL,
+    booking_date TEXT NOT NULL,
+    status TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {config.BOOKINGS_TABLE}_customer_date ON {config.BOOKINGS_TABLE} (customer_id, booking_date);
+CREATE INDEX IF NOT EXISTS {config.BOOKINGS_TABLE}_vehicle_date ON {config.BOOKINGS_TABLE} (vehicle_id, booking_date);
+CREATE INDEX IF NOT EXISTS {config.BOOKINGS_TABLE}_service_center_date ON {config.BOOKINGS_TABLE} (service_center_id, booking_date);
+CREATE INDEX IF NOT EXISTS {config.BOOKINGS_TABLE}_service_center_datetime
+    ON {config.BOOKINGS_TABLE} (service_center_id, ({BOOKING_DATETIME_SQL}), booking_id);
+CREATE INDEX IF NOT EXISTS {config.BOOKINGS_TABLE}_date ON {config.BOOKINGS_TABLE} (booking_date);
+CREATE INDEX IF NOT EXISTS {config.BOOKINGS_TABLE}_updated_at
+    ON {config.BOOKINGS_TABLE} (({BOOKING_UPDATED_AT_SQL}), booking_id);
+
+CREATE TABLE IF NOT EXISTS {config.VEHICLES_TABLE} (
+    vehicle_id TEXT PRIMARY KEY,
+    customer_id TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {config.VEHICLES_TABLE}_customer ON {config.VEHICLES_TABLE} (customer_id);
+
+CREATE TABLE IF NOT EXISTS {config.CUSTOMERS_TABLE} (
+    customer_id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {config.CUSTOMERS_TABLE}_email ON {config.CUSTOMERS_TABLE} (email);
+
+CREATE TABLE IF NOT EXISTS {config.SERVICE_CENTERS_TABLE} (
+    service_center_id TEXT PRIMARY KEY,
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {config.SERVICE_CENTERS_TABLE}_city ON {config.SERVICE_CENTERS_TABLE} (city);
+CREATE INDEX IF NOT EXISTS {config.SERVICE_CENTERS_TABLE}_state ON {config.SERVICE_CENTERS_TABLE} (state);
+
+CREATE TABLE IF NOT EXISTS {config.SERVICE_CENTERS_TABLE}_services_offered (
+    services_offered TEXT NOT NULL,
+    service_center_id TEXT NOT NULL,
+    PRIMARY KEY (services_offered, service_center_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS {config.SERVICE_CENTERS_TABLE}_services_offered_id
+    ON {config.SERVICE_CENTERS_TABLE}_services_offered (service_center_id);
+
+CREATE TABLE IF NOT EXISTS {config.SLOT_RESERVATIONS_TABLE} (
+    day_key TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    PRIMARY KEY (day_key, slot)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS {config.BOOKING_AGGREGATES_TABLE} (
+    scope TEXT NOT NULL,
+    period TEXT NOT NULL,
+    counter TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (scope, period, counter)
+) WITHOUT ROWID;
+"""
+
+class SQLiteDatabase:
+    """
+    One SQLite file shared by the four repositories. Each thread (and each
+    forked process) gets its own connection in WAL mode, so readers never
+    block the writer. Statements are parameterized constants, so sqlite3's
+    per-connection statement cache reuses their compiled form.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+    
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the write lock up front (no upgrade deadlocks)"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,  # Transactions are explicit, see transaction()
+            check_same_thread=False,
+            cached_statements=config.SQLITE_STATEMENT_CACHE_SIZE,
+            uri=self.path.startswith('file:')
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # Durable across app crashes; WAL checkpoints fsync
+        conn.execute(f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}")
+        self._ensure_schema(conn)
+        return conn
+    
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+
+_database: Optional[SQLiteDatabase] = None
+_database_lock = threading.Lock()
+
+def get_database() -> SQLiteDatabase:
+    """The process-wide database at config.SQLITE_PATH"""
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = SQLiteDatabase(config.SQLITE_PATH)
+    return _database
+
+class SQLiteTable:
+    """
+    Record store over one table of SCHEMA: key_name is the primary key,
+    columns are copied out of the record for indexing, and list_column (if any)
+    is exploded into the side table <name>_<list_column>.
+    on_change(conn, [(old, new)]) runs inside every write transaction (None
+    stands for a missing record), so derived tables commit or roll back with it;
+    on_commit([(old, new)]) runs once the transaction has committed.
+    Table and column names come from code only; values are always bound parameters.
+    """
+    
+    def __init__(
+        self,
+        database: SQLiteDatabase,
+        name: str,
+        key_name: str,
+        model: Type[BaseModel],
+        columns: Tuple[str, ...] = (),
+        list_column: Optional[str] = None,
+        on_change: Optional[Callable[[sqlite3.Connection, List[Tuple[Optional[BaseModel], Optional[BaseModel]]]], None]] = None,
+        on_commit: Optional[Callable[[List[Tuple[Optional[BaseModel], Optional[BaseModel]]]], None]] = None
+    ):
+        self.database = database
+        self.name = name
+        self.key_name = key_name
+        self.model = model
+        self.columns = columns
+        self.list_column = list_column
+        self.on_change = on_change
+        self.on_commit = on_commit
+    
+        all_columns = (key_name,) + columns + (VERSION_ATTRIBUTE, 'data')
+        self._insert_sql = (
+            f"INSERT INTO {name} ({', '.join(all_columns)}) "
+            f"VALUES ({', '.join('?' * len(all_columns))})"
+        )
+        self._update_sql = (
+            f"UPDATE {name} SET {', '.join(f'{column} = ?' for column in columns + (VERSION_ATTRIBUTE, 'data'))} "
+            f"WHERE {key_name} = ?"
+        )
+        self._get_sql = f"SELECT data FROM {name} WHERE {key_name} = ?"
+        self._page_sql = f"SELECT data FROM {name} WHERE {key_name} > ? ORDER BY {key_name} LIMIT ?"
+        self._delete_sql = f"DELETE FROM {name} WHERE {key_name} = ?"
+        if list_column:
+            side_table = f"{name}_{list_column}"
+            self._list_insert_sql = f"INSERT OR IGNORE INTO {side_table} ({list_column}, {key_name}) VALUES (?, ?)"
+            self._list_delete_sql = f"DELETE FROM {side_table} WHERE {key_name} = ?"
+            self._list_lookup_sql = (
+                f"SELECT t.data FROM {name} t JOIN {side_table} s ON s.{key_name} = t.{key_name} "
+                f"WHERE s.{list_column} = ? ORDER BY t.{key_name}"
+            )
+    
+    def get(self, key: str) -> Optional[BaseModel]:
+        row = self.database.connection().execute(self._get_sql, (key,)).fetchone()
+        return self._load(row[0]) if row else None
+    
+    def get_many(self, keys: List[str]) -> Dict[str, BaseModel]:
+        """{key: record} for the keys that exist, in chunks below SQLite's parameter limit"""
+        records = {}
+        conn = self.database.connection()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            sql = f"SELECT {self.key_name}, data FROM {self.name} WHERE {self.key_name} IN ({', '.join('?' * len(chunk))})"
+            for key, data in conn.execute(sql, chunk):
+                records[key] = self._load(data)
+        return records
+    
+    def insert(self, records: List[BaseModel]):
+        """Insert new records in one transaction (all or nothing)"""
+        with self.database.transaction() as conn:
+            conn.executemany(self._insert_sql, [self._row(record) for record in records])
+            if self.list_column:
+                conn.executemany(self._list_insert_sql, [
+                    (value, getattr(record, self.key_name))
+                    for record in records
+                    for value in getattr(record, self.list_column) or []
+                ])
+            if self.on_change:
+                self.on_change(conn, [(None, record) for record in records])
+        if self.on_commit:
+            self.on_commit([(None, record) for record in records])
+    
+    def update(self, key: str, update_data: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[BaseModel]:
+        """
+        Apply update_data and bump the version, mirroring update_existing_item:
+        None if the key is missing, VersionConflictError on a version mismatch.
+        """
+        with self.database.transaction() as conn:
+            row = conn.execute(self._get_sql, (key,)).fetchone()
+            if row is None:
+                return None
+            data = json.loads(row[0])
+            current_version = data.get(VERSION_ATTRIBUTE) or 0
+            if expected_version is not None and current_version != expected_version:
+                raise VersionConflictError(current_version)
+    
+            data.update({k: v for k, v in update_data.items() if k != VERSION_ATTRIBUTE})
+            data[VERSION_ATTRIBUTE] = current_version + 1
+            record = self.model(**data)
+            conn.execute(self._update_sql, self._row(record)[1:] + (key,))
+            if self.list_column and self.list_column in update_data:
+                conn.execute(self._list_delete_sql, (key,))
+                conn.executemany(self._list_insert_sql, [(value, key) for value in getattr(record, self.list_column) or []])
+            changes = [(self._load(row[0]), record)]
+            if self.on_change:
+                self.on_change(conn, changes)
+        if self.on_commit:
+            self.on_commit(changes)
+        return record
+    
+    def delete(self, key: str):
+        with self.database.transaction() as conn:
+            row = conn.execute(self._get_sql, (key,)).fetchone() if self.on_change or self.on_commit else None
+            conn.execute(self._delete_sql, (key,))
+            if self.list_column:
+                conn.execute(self._list_delete_sql, (key,))
+            changes = [(self._load(row[0]), None)] if row else []
+            if changes and self.on_change:
+                self.on_change(conn, changes)
+        if changes and self.on_commit:
+            self.on_commit(changes)
+    
+    def where(self, column: str, value: Any, order_by: Optional[str] = None) -> List[BaseModel]:
+        """Records with column == value, using that column's index"""
+        sql = f"SELECT data FROM {self.name} WHERE {column} = ? ORDER BY {order_by or self.key_name}"
+        return [self._load(data) for data, in self.database.connection().execute(sql, (value,))]
+    
+    def query(self, condition: str, params: Tuple[Any, ...], order_by: str, limit: int) -> List[BaseModel]:
+        """Up to limit records matching an SQL condition, for lookups where() cannot express"""
+        sql = f"SELECT data FROM {self.name} WHERE {condition} ORDER BY {order_by} LIMIT ?"
+        return [self._load(data) for data, in self.database.connection().execute(sql, params + (limit,))]
+    
+    def containing(self, value: Any) -> List[BaseModel]:
+        """Records whose list_column contains value, using the side table"""
+        return [self._load(data) for data, in self.database.connection().execute(self._list_lookup_sql, (value,))]
+    
+    def page(self, limit: int, next_token: Optional[str] = None) -> Tuple[List[BaseModel], Optional[str]]:
+        """Up to limit records after next_token, in key order (keyset pagination), and the next token"""
+        start_key = decode_next_token(next_token)
+        last_key = ''
+        if start_key:
+            if not isinstance(start_key.get(self.key_name), str):
+                raise InvalidPageTokenError('Invalid next_token')
+            last_key = start_key[self.key_name]
+    
+        rows = self.database.connection().execute(self._page_sql, (last_key, limit + 1)).fetchall()
+        records = [self._load(data) for data, in rows[:limit]]
+        next_token = None
+        if len(rows) > limit:
+            next_token = encode_next_token({self.key_name: getattr(records[-1], self.key_name)})
+        return records, next_token
+    
+    def iter_pages(self, page_size: int) -> Iterator[List[BaseModel]]:
+        next_token = None
+        while True:
+            records, next_token = self.page(page_size, next_token)
+            if records:
+                yield records
+            if not next_token:
+                return
+    
+    def _row(self, record: BaseModel) -> Tuple[Any, ...]:
+        data = record.dict()
+        return (
+            (data[self.key_name],)
+            + tuple(data.get(column) for column in self.columns)
+            + (data.get(VERSION_ATTRIBUTE) or 0, json.dumps(data))
+        )
+    
+    def _load(self, data: str) -> BaseModel:
+        return self.model(**json.loads(data))
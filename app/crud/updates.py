@@ -0,0 +1,84 @@
+from typing import Any, Dict, Optional
+from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+from app.crud.serialization import to_dynamodb
+
+# Every item carries a version that each write increments. Items written before
+# versioning was introduced have no attribute and count as version 0.
+VERSION_ATTRIBUTE = 'version'
+
+class VersionConflictError(Exception):
+    """Raised when an update's expected version does not match the stored item"""
+    
+    def __init__(self, current_version: int):
+        super().__init__(f'Version conflict: item is at version {current_version}')
+        self.current_version = current_version
+
+def update_existing_item(
+    table,
+    key_name: str,
+    key_value: str,
+    update_data: Dict[str, Any],
+    expected_version: Optional[int] = None,
+    return_old: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    SET the given attributes and bump the version in a single conditional update_item.
+    Returns the updated item (or, with return_old, the item as it was before this
+    write), or None if no item exists with that key. If expected_version is given
+    and the stored version differs, raises VersionConflictError; the failed write
+    returns the old item, so no extra read is needed.
+    """
+    update_data = {k: v for k, v in update_data.items() if k != VERSION_ATTRIBUTE}
+    
+    update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in update_data.keys()] + [
+        f"#{VERSION_ATTRIBUTE} = if_not_exists(#{VERSION_ATTRIBUTE}, :zero_version) + :one_version"
+    ])
+    expression_attribute_names = {f"#{k}": k for k in update_data.keys()}
+    expression_attribute_names[f"#{VERSION_ATTRIBUTE}"] = VERSION_ATTRIBUTE
+    expression_attribute_values = {f":{k}": to_dynamodb(v) for k, v in update_data.items()}
+    expression_attribute_values[':zero_version'] = 0
+    expression_attribute_values[':one_version'] = 1
+    
+    condition = Attr(key_name).exists()
+    if expected_version is not None:
+        condition = condition & version_condition(expected_version)
+    
+    try:
+        response = table.update_item(
+            Key={key_name: key_value},
+            UpdateExpression=update_expression,
+            ConditionExpression=condition,
+            ExpressionAttributeNames=expression_attribute_names,
+            ExpressionAttributeValues=expression_attribute_values,
+            ReturnValues="ALL_OLD" if return_old else "ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD"
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            old_item = e.response.get('Item')
+            if old_item:
+                raise VersionConflictError(_stored_version(old_item))
+            return None
+        raise
+    
+    return response['Attributes']
+
+def updated_item(old_item: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The item update_existing_item wrote, rebuilt from the old item it returned with return_old"""
+    item = {**old_item, **{k: v for k, v in update_data.items() if k != VERSION_ATTRIBUTE}}
+    item[VERSION_ATTRIBUTE] = int(old_item.get(VERSION_ATTRIBUTE, 0)) + 1
+    return item
+
+def version_condition(expected_version: int):
+    """Condition that the stored version equals expected_version"""
+    if expected_version == 0:
+        return Attr(VERSION_ATTRIBUTE).not_exists()
+    return Attr(VERSION_ATTRIBUTE).eq(expected_version)
+
+def _stored_version(raw_item: Dict[str, Any]) -> int:
+    """Read the version from an item returned in DynamoDB wire format"""
+    if VERSION_ATTRIBUTE not in raw_item:
+        return 0
+    return int(TypeDeserializer().deserialize(raw_item[VERSION_ATTRIBUTE]))
@@ -1,20 +1,34 @@
-import boto3
 from boto3.dynamodb.conditions import Attr
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import uuid
 from app.config import config
+from app.aws_clients import get_resource, get_table
+from app.crud.batch import batch_get_items, batch_put_items
+from app.crud.cache import TTLCache
+from app.crud.pagination import scan_page
+from app.crud.parallel_scan import parallel_scan_pages
+from app.crud.projection import partial_model, project, projection_params
+from app.crud.repository import VehicleRepository
+from app.crud.serialization import to_dynamodb
+from app.crud.updates import VersionConflictError, update_existing_item
 from app.models.vehicle import Vehicle, VehicleCreate, VehicleUpdate
 
-class VehicleCRUD:
+class VehicleCRUD(VehicleRepository):
+    """Vehicle repository backed by DynamoDB"""
+    
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
-        self.table = self.dynamodb.Table(config.VEHICLES_TABLE)
+        self.cache = TTLCache(config.ENTITY_CACHE_MAXSIZE, config.VEHICLE_CACHE_TTL)
+    
+    @property
+    def dynamodb(self):
+        """This thread's DynamoDB resource (resources are not thread-safe)"""
+        return get_resource('dynamodb')
+    
+    @property
+    def table(self):
+        """This thread's Table object"""
+        return get_table(config.VEHICLES_TABLE)
     
     def create_vehicle(self, vehicle_data: VehicleCreate) -> Vehicle:
         """Create a new vehicle"""
@@ -25,30 +39,78 @@ class VehicleCRUD:
             vehicle_id=vehicle_id,
             **vehicle_data.dict(),
             created_at=timestamp,
-            updated_at=timestamp
+            updated_at=timestamp,
+            version=1
         )
         
         self.table.put_item(Item=vehicle.dict())
+        self.cache.set(vehicle_id, vehicle.copy())
         return vehicle
     
-    def get_vehicle(self, vehicle_id: str) -> Optional[Vehicle]:
-        """Get vehicle by ID"""
-        response = self.table.get_item(Key={'vehicle_id': vehicle_id})
+    def batch_create_vehicles(self, vehicles_data: List[VehicleCreate]) -> Tuple[List[Vehicle], Dict[str, str]]:
+        """Create many vehicles with BatchWriteItem; also returns {vehicle_id: error} for writes that failed"""
+        timestamp = datetime.utcnow().isoformat()
         
-        if 'Item' in response:
-            return Vehicle(**response['Item'])
-        return None
-    
-    def get_all_vehicles(self) -> List[Vehicle]:
-        """Get all vehicles"""
-        response = self.table.scan()
-        vehicles = [Vehicle(**item) for item in response.get('Items', [])]
+        vehicles = [
+            Vehicle(
+                vehicle_id=str(uuid.uuid4()),
+                **vehicle_data.dict(),
+                created_at=timestamp,
+                updated_at=timestamp,
+                version=1
+            )
+            for vehicle_data in vehicles_data
+        ]
         
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            vehicles.extend([Vehicle(**item) for item in response.get('Items', [])])
+        failed = batch_put_items(
+            self.dynamodb,
+            config.VEHICLES_TABLE,
+            [to_dynamodb(vehicle.dict()) for vehicle in vehicles],
+            'vehicle_id'
+        )
+        return vehicles, failed
+    
+    def get_vehicle(self, vehicle_id: str, fields: Optional[Tuple[str, ...]] = None) -> Optional[Vehicle]:
+        """Get vehicle by ID (read-through cache); fields limits the attributes returned"""
+        vehicle = self.cache.get(vehicle_id)
+        if vehicle is None:
+            response = self.table.get_item(Key={'vehicle_id': vehicle_id}, **projection_params(fields))
+            if 'Item' not in response:
+                return None
+            if fields:
+                # Partial items are never cached
+                return partial_model(Vehicle, fields)(**response['Item'])
+            vehicle = Vehicle(**response['Item'])
+            self.cache.set(vehicle_id, vehicle)
         
-        return vehicles
+        if fields:
+            return project(vehicle, fields)
+        # Callers get their own copy so they cannot mutate the cached record
+        return vehicle.copy()
+    
+    def get_vehicles_by_ids(self, vehicle_ids: List[str]) -> List[Vehicle]:
+        """Get many vehicles with BatchGetItem, in the requested order (each once; missing IDs are skipped)"""
+        items = batch_get_items(self.dynamodb, config.VEHICLES_TABLE, 'vehicle_id', vehicle_ids)
+        return [Vehicle(**items[vehicle_id]) for vehicle_id in dict.fromkeys(vehicle_ids) if vehicle_id in items]
+    
+    def get_vehicles_page(
+        self,
+        limit: int,
+        next_token: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[Vehicle], Optional[str]]:
+        """Get one page of vehicles and the token for the next page; fields limits the attributes read"""
+        items, next_token = scan_page(self.table, limit, next_token, **projection_params(fields))
+        model = partial_model(Vehicle, fields) if fields else Vehicle
+        return [model(**item) for item in items], next_token
+    
+    def iter_vehicle_pages(self, segments: int = 1) -> Iterator[List[Vehicle]]:
+        """
+        Stream all vehicles page by page without holding the whole table in memory.
+        With segments > 1 the table is read as a parallel segmented scan.
+        """
+        for items in parallel_scan_pages(self.table, segments, config.SCAN_WORKERS):
+            yield [Vehicle(**item) for item in items]
     
     def get_vehicles_by_customer(self, customer_id: str) -> List[Vehicle]:
         """Get all vehicles for a customer"""
@@ -57,34 +119,38 @@ class VehicleCRUD:
         )
         return [Vehicle(**item) for item in response.get('Items', [])]
     
-    def update_vehicle(self, vehicle_id: str, vehicle_data: VehicleUpdate) -> Optional[Vehicle]:
-        """Update an existing vehicle"""
-        current_vehicle = self.get_vehicle(vehicle_id)
-        if not current_vehicle:
-            return None
-        
+    def update_vehicle(self, vehicle_id: str, vehicle_data: VehicleUpdate, expected_version: Optional[int] = None) -> Optional[Vehicle]:
+        """
+        Update an existing vehicle (single conditional write, no read first).
+        Raises VersionConflictError if expected_version is given and does not match.
+        """
         update_data = vehicle_data.dict(exclude_unset=True)
         update_data['updated_at'] = datetime.utcnow().isoformat()
         
-        update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in update_data.keys()])
-        expression_attribute_names = {f"#{k}": k for k in update_data.keys()}
-        expression_attribute_values = {f":{k}": v for k, v in update_data.items()}
+        try:
+            item = update_existing_item(self.table, 'vehicle_id', vehicle_id, update_data, expected_version)
+        except VersionConflictError:
+            self.cache.invalidate(vehicle_id)
+            raise
         
-        response = self.table.update_item(
-            Key={'vehicle_id': vehicle_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeNames=expression_attribute_names,
-            ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW"
-        )
+        if not item:
+            self.cache.invalidate(vehicle_id)
+            return None
         
-        return Vehicle(**response['Attributes'])
+        vehicle = Vehicle(**item)
+        self.cache.set(vehicle_id, vehicle.copy())
+        return vehicle
     
     def delete_vehicle(self, vehicle_id: str) -> bool:
         """Delete a vehicle"""
         try:
             self.table.delete_item(Key={'vehicle_id': vehicle_id})
+            self.cache.invalidate(vehicle_id)
             return True
         except Exception as e:
             print(f"Error deleting vehicle: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the vehicle read-through cache"""
+        return self.cache.stats()
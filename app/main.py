@@ -4,7 +4,11 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import os
 from app.config import config
-from app.api import booking_routes, vehicle_routes, customer_routes, service_center_routes
+from app.async_adapter import shutdown_executor
+from app.crud.report_jobs import shutdown_report_job_runner
+from app.crud.report_materializer import shutdown_report_materializer
+from app.non_crud_lib.parallel_reports import shutdown_process_pool
+from app.api import booking_routes, vehicle_routes, customer_routes, service_center_routes, report_routes
 
 app = FastAPI(
     title=config.APP_NAME,
@@ -31,6 +35,15 @@ app.include_router(booking_routes.router)
 app.include_router(vehicle_routes.router)
 app.include_router(customer_routes.router)
 app.include_router(service_center_routes.router)
+app.include_router(report_routes.router)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Drain in-flight AWS calls offloaded by the async routes
+    shutdown_executor()
+    shutdown_report_job_runner()
+    shutdown_process_pool()
+    shutdown_report_materializer()
 
 @app.get("/")
 async def root():
@@ -52,7 +65,8 @@ async def root():
             "customers": "/customers/",
             "bookings": "/bookings/",
             "vehicles": "/vehicles/",
-            "service_centers": "/service-centers/"
+            "service_centers": "/service-centers/",
+            "reports": "/reports/"
         }
     }
 
@@ -60,6 +74,18 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "vehicle-booking-system"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the entity caches, the service center replica and the report cache"""
+    return {
+        "vehicles": vehicle_routes.vehicle_crud.wrapped.cache_stats(),
+        "customers": customer_routes.customer_crud.wrapped.cache_stats(),
+        "service_centers": service_center_routes.service_center_crud.wrapped.cache_stats(),
+        "service_center_replica": service_center_routes.service_center_crud.wrapped.replica_stats(),
+        "report_rollups": report_routes.report_builder.wrapped.materializer.stats(),
+        "reports": report_routes.report_builder.wrapped.cache.stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+from enum import Enum
+
+T = TypeVar('T')
+
+class BatchItemStatus(str, Enum):
+    CREATED = "CREATED"
+    INVALID = "INVALID"  # Rejected by validation, never written
+    FAILED = "FAILED"    # Valid, but the write did not succeed
+
+class BatchItemResult(BaseModel):
+    index: int  # Position of the item in the request body
+    status: BatchItemStatus
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchCreateResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[BatchItemResult]
+
+class BatchGetRequest(BaseModel):
+    ids: List[str]
+
+class BatchGetResponse(BaseModel, Generic[T]):
+    items: List[T]  # Found records, in the order they were requested
+    missing_ids: List[str]
@@ -30,8 +30,10 @@ class Booking(BaseModel):
     estimated_cost: Optional[float] = None
     actual_cost: Optional[float] = None
     notes: Optional[str] = None
+    bay: Optional[int] = None  # Service bay reserved for this booking
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: int = 0  # Incremented on every write; 0 for records written before versioning
 
 class BookingCreate(BaseModel):
     customer_id: str
@@ -48,4 +50,8 @@ class BookingUpdate(BaseModel):
     scheduled_time: Optional[str] = None
     status: Optional[BookingStatus] = None
     actual_cost: Optional[float] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+def booking_datetime(booking_date: str, scheduled_time: str) -> str:
+    """Sortable start of a booking ("2030-01-31T09:30:00"); ISO strings order chronologically"""
+    return f"{booking_date}T{scheduled_time}"
@@ -13,6 +13,7 @@ class Customer(BaseModel):
     zip_code: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: int = 0  # Incremented on every write; 0 for records written before versioning
 
 class CustomerCreate(BaseModel):
     first_name: str
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from enum import Enum
+
+class ReportType(str, Enum):
+    BOOKING_SUMMARY = "BOOKING_SUMMARY"
+    SERVICE_CENTER_PERFORMANCE = "SERVICE_CENTER_PERFORMANCE"  # Needs service_center_id
+    ALL_SERVICE_CENTERS_PERFORMANCE = "ALL_SERVICE_CENTERS_PERFORMANCE"
+    MONTHLY = "MONTHLY"  # Needs month and year; service_center_id is optional
+    CUSTOMER_SERVICE_HISTORY = "CUSTOMER_SERVICE_HISTORY"  # Needs customer_id
+
+class ReportSpec(BaseModel):
+    report_type: ReportType
+    service_center_id: Optional[str] = None
+    customer_id: Optional[str] = None
+    month: Optional[int] = Field(None, ge=1, le=12)
+    year: Optional[int] = Field(None, ge=1, le=9999)
+
+class ReportJobStatus(str, Enum):
+    PENDING = "PENDING"      # Accepted, waiting for a report worker
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"  # Result ready for download
+    FAILED = "FAILED"
+
+class ReportJob(BaseModel):
+    job_id: str
+    spec: ReportSpec
+    status: ReportJobStatus = ReportJobStatus.PENDING
+    error: Optional[str] = None
+    result_key: Optional[str] = None  # Where the stored result lives (file path or S3 key)
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 
 class ServiceCenter(BaseModel):
@@ -12,9 +12,11 @@ class ServiceCenter(BaseModel):
     email: EmailStr
     services_offered: List[str]
     working_hours: Optional[str] = "9:00 AM - 6:00 PM"
+    bays: Optional[int] = None  # Service bays worked in parallel; None uses DEFAULT_SERVICE_BAYS
     rating: Optional[float] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: int = 0  # Incremented on every write; 0 for records written before versioning
 
 class ServiceCenterCreate(BaseModel):
     name: str
@@ -26,6 +28,7 @@ class ServiceCenterCreate(BaseModel):
     email: EmailStr
     services_offered: List[str]
     working_hours: Optional[str] = "9:00 AM - 6:00 PM"
+    bays: Optional[int] = Field(None, ge=1)
 
 class ServiceCenterUpdate(BaseModel):
     name: Optional[str] = None
@@ -33,4 +36,12 @@ class ServiceCenterUpdate(BaseModel):
     email: Optional[EmailStr] = None
     services_offered: Optional[List[str]] = None
     working_hours: Optional[str] = None
-    rating: Optional[float] = None
\ No newline at end of file
+    bays: Optional[int] = Field(None, ge=1)
+    rating: Optional[float] = None
+
+class AvailableSlot(BaseModel):
+    service_center_id: str
+    service_center_name: str
+    booking_date: str
+    scheduled_time: str
+    free_bays: int
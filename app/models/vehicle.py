@@ -13,6 +13,7 @@ class Vehicle(BaseModel):
     mileage: Optional[int] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: int = 0  # Incremented on every write; 0 for records written before versioning
 
 class VehicleCreate(BaseModel):
     customer_id: str
@@ -0,0 +1,35 @@
+from app.async_adapter import AsyncAdapter
+from app.non_crud_lib.notification_service import NotificationService
+from app.non_crud_lib.queue_service import QueueService
+from app.non_crud_lib.scheduler_service import SchedulerService
+from app.non_crud_lib.storage_service import StorageService
+from app.non_crud_lib.service_factory import (
+    get_notification_service,
+    get_queue_service,
+    get_scheduler_service,
+    get_storage_service
+)
+
+class AsyncNotificationService(AsyncAdapter):
+    """NotificationService (SNS) with awaitable methods"""
+    
+    def __init__(self, notification_service: NotificationService = None):
+        super().__init__(notification_service or get_notification_service())
+
+class AsyncStorageService(AsyncAdapter):
+    """StorageService (S3) with awaitable methods"""
+    
+    def __init__(self, storage_service: StorageService = None):
+        super().__init__(storage_service or get_storage_service())
+
+class AsyncQueueService(AsyncAdapter):
+    """QueueService (SQS) with awaitable methods"""
+    
+    def __init__(self, queue_service: QueueService = None):
+        super().__init__(queue_service or get_queue_service())
+
+class AsyncSchedulerService(AsyncAdapter):
+    """SchedulerService (EventBridge) with awaitable methods"""
+    
+    def __init__(self, scheduler_service: SchedulerService = None):
+        super().__init__(scheduler_service or get_scheduler_service())
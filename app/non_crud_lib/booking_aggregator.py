@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models.booking import Booking, BookingStatus
+
+# Counters are kept per (scope, period):
+#   scope  - ALL, or SC#<service_center_id> for one service center
+#   period - ALL, or YYYY-MM for the month of the booking date
+# (CUSTOMER#<customer_id>, ALL) only counts CHANGES, for the customer's reports.
+ALL = 'ALL'
+BOOKINGS = 'bookings'
+REVENUE = 'revenue'  # actual_cost, else estimated_cost
+COMPLETED_REVENUE = 'completed_revenue'  # actual_cost of COMPLETED bookings
+STATUS_PREFIX = 'status:'
+SERVICE_TYPE_PREFIX = 'service_type:'
+CHANGES = 'changes'  # Writes that moved the aggregate's counters: a version shared by every process
+
+AggregateKey = Tuple[str, str]
+Counters = Dict[str, float]
+Change = Tuple[Optional[Booking], Optional[Booking]]
+
+def service_center_scope(service_center_id: str) -> str:
+    return f"SC#{service_center_id}"
+
+def customer_scope(customer_id: str) -> str:
+    return f"CUSTOMER#{customer_id}"
+
+def month_period(month: int, year: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+class BookingAggregator:
+    """
+    Non-CRUD Service for write-time booking aggregates
+    No database operations - Pure counter arithmetic
+    
+    Every booking adds its contribution to the counters of the aggregates it
+    belongs to; a write is the new contribution minus the old one. Sums of
+    deltas commute, so stores can apply them with atomic increments.
+    """
+    
+    def keys_for(self, booking: Booking) -> List[AggregateKey]:
+        """Aggregates a booking counts towards"""
+        scopes = [ALL, service_center_scope(booking.service_center_id)]
+        periods = [ALL]
+        try:
+            date = datetime.fromisoformat(booking.booking_date)
+            periods.append(month_period(date.month, date.year))
+        except ValueError:
+            pass
+        return [(scope, period) for scope in scopes for period in periods]
+    
+    def contribution(self, booking: Booking) -> Counters:
+        """Counter increments for one booking"""
+        counters = {
+            BOOKINGS: 1,
+            STATUS_PREFIX + booking.status.value: 1,
+            SERVICE_TYPE_PREFIX + booking.service_type.value: 1,
+            REVENUE: booking.actual_cost or booking.estimated_cost or 0
+        }
+        if booking.status == BookingStatus.COMPLETED:
+            counters[COMPLETED_REVENUE] = booking.actual_cost or 0
+        return counters
+    
+    def deltas(self, changes: Iterable[Change]) -> Dict[AggregateKey, Counters]:
+        """
+        Net counter changes of many (old, new) booking writes; None is a missing
+        booking. Every aggregate they move also gets CHANGES + 1.
+        """
+        changes = list(changes)
+        deltas: Dict[AggregateKey, Counters] = {}
+        for old, new in changes:
+            for booking, sign in ((old, -1), (new, 1)):
+                if booking is None:
+                    continue
+                for key in self.keys_for(booking):
+                    counters = deltas.setdefault(key, {})
+                    for name, value in self.contribution(booking).items():
+                        counters[name] = counters.get(name, 0) + sign * value
+    
+        # Drop counters that cancel out (e.g. an update that only edits notes)
+        result = {}
+        for key, counters in deltas.items():
+            changed = {name: value for name, value in counters.items() if value}
+            if changed:
+                changed[CHANGES] = 1
+                result[key] = changed
+    
+        # A customer's reports read the same fields as the counters
+        for old, new in changes:
+            if old is None or new is None or old.customer_id != new.customer_id or self.contribution(old) != self.contribution(new):
+                for booking in (old, new):
+                    if booking is not None:
+                        result[(customer_scope(booking.customer_id), ALL)] = {CHANGES: 1}
+        return result
@@ -0,0 +1,192 @@
+import bisect
+import re
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app.config import config
+from app.models.booking import ServiceType
+from app.non_crud_lib.cost_calculator import CostCalculator
+
+MINUTES_PER_DAY = 24 * 60
+
+_WORKING_HOURS = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*([AP]M)\s*-\s*(\d{1,2}):(\d{2})\s*([AP]M)\s*$', re.IGNORECASE)
+
+def parse_working_hours(working_hours: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Opening and closing minute of a day from e.g. "9:00 AM - 6:00 PM" (None if unparseable)"""
+    match = _WORKING_HOURS.match(working_hours or '')
+    if not match:
+        return None
+    
+    minutes = []
+    for hour, minute, meridiem in (match.group(1, 2, 3), match.group(4, 5, 6)):
+        hour, minute = int(hour), int(minute)
+        if not 1 <= hour <= 12 or minute >= 60:
+            return None
+        minutes.append((hour % 12 + (12 if meridiem.upper() == 'PM' else 0)) * 60 + minute)
+    
+    opening, closing = minutes
+    if closing == 0:
+        closing = MINUTES_PER_DAY  # "... - 12:00 AM" closes at midnight
+    return (opening, closing) if opening < closing else None
+
+class Slot(NamedTuple):
+    """Time a booking occupies a bay: [start_minute, end_minute) after midnight on booking_date"""
+    booking_date: str
+    start_minute: int
+    end_minute: int
+
+class BayIntervals:
+    """
+    Reserved [start, end) intervals of one bay. They never overlap, so sorted
+    by start they are sorted by end too, and an overlap test is one bisect.
+    """
+    
+    def __init__(self):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._holders: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._starts)
+    
+    def overlaps(self, start: int, end: int, ignore_holder: Optional[str] = None) -> bool:
+        """Whether [start, end) intersects an interval not held by ignore_holder - O(log n)"""
+        # Only intervals starting before `end` can intersect; walk back over the ones that also end after `start`
+        index = bisect.bisect_left(self._starts, end) - 1
+        while index >= 0 and self._ends[index] > start:
+            if self._holders[index] != ignore_holder:
+                return True
+            index -= 1
+        return False
+    
+    def add(self, start: int, end: int, holder: str):
+        index = bisect.bisect_left(self._starts, start)
+        self._starts.insert(index, start)
+        self._ends.insert(index, end)
+        self._holders.insert(index, holder)
+    
+    def remove(self, holder: str) -> Optional[Tuple[int, int]]:
+        """Drop holder's interval and return it (None if holder has none on this bay)"""
+        if holder not in self._holders:
+            return None
+        index = self._holders.index(holder)
+        removed = (self._starts[index], self._ends[index])
+        del self._starts[index], self._ends[index], self._holders[index]
+        return removed
+
+class DaySchedule:
+    """
+    Interval index of every bay at one service center on one day, plus an
+    occupancy bitmap per bay (bit n set = unit n reserved) for slot searches.
+    """
+    
+    def __init__(self, bays: int, slot_minutes: int):
+        self.bays = bays
+        self.slot_minutes = slot_minutes
+        self._intervals: Dict[int, BayIntervals] = {}
+        self._occupancy: Dict[int, int] = {}
+    
+    def free_bays(self, start: int, end: int, ignore_holder: Optional[str] = None) -> List[int]:
+        """Bays with nothing reserved in [start, end), lowest first - O(bays * log n)"""
+        return [
+            bay for bay in range(self.bays)
+            if bay not in self._intervals or not self._intervals[bay].overlaps(start, end, ignore_holder)
+        ]
+    
+    def free_starts(self, opening: int, closing: int, duration: int) -> List[Tuple[int, int]]:
+        """
+        [(start minute, free bays)] for every unit boundary from opening on where
+        a job of duration minutes fits on some bay before closing - one AND per
+        bay and start.
+        """
+        window = (1 << -(-duration // self.slot_minutes)) - 1
+        first = -(-opening // self.slot_minutes)
+        last = (closing - duration) // self.slot_minutes
+    
+        masks = [self._occupancy.get(bay, 0) for bay in range(self.bays)]
+        starts = []
+        for unit in range(first, last + 1):
+            free = sum(1 for mask in masks if not mask & (window << unit))
+            if free:
+                starts.append((unit * self.slot_minutes, free))
+        return starts
+    
+    def add(self, bay: int, start: int, end: int, holder: str):
+        self._intervals.setdefault(bay, BayIntervals()).add(start, end, holder)
+        self._occupancy[bay] = self._occupancy.get(bay, 0) | self._bits(start, end)
+    
+    def remove(self, holder: str):
+        for bay, intervals in self._intervals.items():
+            removed = intervals.remove(holder)
+            if removed:
+                self._occupancy[bay] &= ~self._bits(*removed)
+    
+    def _bits(self, start: int, end: int) -> int:
+        first, last = start // self.slot_minutes, -(-end // self.slot_minutes)
+        return ((1 << (last - first)) - 1) << first
+
+class CapacityPlanner:
+    """
+    Non-CRUD Service for service bay capacity
+    No database operations - Pure slot arithmetic and reservation keys
+    
+    A day is split into SLOT_MINUTES units. A booking occupies the units from its
+    scheduled time until the estimated service duration has passed, on one bay.
+    Each (bay, unit) pair is one reservation key, so two bookings conflict exactly
+    when they would claim the same key.
+    """
+    
+    def __init__(self, cost_calculator: CostCalculator = None, slot_minutes: int = None):
+        self.cost_calculator = cost_calculator or CostCalculator()
+        self.slot_minutes = slot_minutes or config.SLOT_MINUTES
+    
+    def bays_for(self, service_center) -> int:
+        """Number of bays a service center works in parallel"""
+        return service_center.bays or config.DEFAULT_SERVICE_BAYS
+    
+    def duration_minutes(self, service_type: ServiceType) -> int:
+        """Minutes a service keeps a bay busy"""
+        return self.cost_calculator.estimate_service_duration(service_type)['estimated_duration_minutes']
+    
+    def slot_for(self, booking_date: str, scheduled_time: str, service_type: ServiceType) -> Slot:
+        """Slot a booking needs; raises ValueError for bad dates or services running past midnight"""
+        start = datetime.fromisoformat(f"{booking_date}T{scheduled_time}")
+        duration = self.duration_minutes(service_type)
+    
+        start_minute = start.hour * 60 + start.minute
+        end_minute = start_minute + duration
+        if end_minute > MINUTES_PER_DAY:
+            raise ValueError('Service would run past midnight; please book an earlier time')
+    
+        # Round outwards to whole units
+        start_minute -= start_minute % self.slot_minutes
+        end_minute += -end_minute % self.slot_minutes
+        return Slot(start.date().isoformat(), start_minute, end_minute)
+    
+    def day_key(self, service_center_id: str, booking_date: str) -> str:
+        """Partition of all reservations at one service center on one day"""
+        return f"{service_center_id}#{booking_date}"
+    
+    def slot_keys(self, slot: Slot, bay: int) -> List[str]:
+        """Reservation keys (one per unit) for a slot on a bay"""
+        return [
+            f"{bay:03d}#{unit:03d}"
+            for unit in range(slot.start_minute // self.slot_minutes, slot.end_minute // self.slot_minutes)
+        ]
+    
+    def schedule_from_reservations(self, bays: int, reservations: Dict[str, str]) -> DaySchedule:
+        """Rebuild the interval index of a day from its {reservation key: holder} map"""
+        units: Dict[Tuple[int, str], List[int]] = {}
+        for key, holder in reservations.items():
+            bay, unit = key.split('#')
+            units.setdefault((int(bay), holder), []).append(int(unit))
+    
+        schedule = DaySchedule(bays, self.slot_minutes)
+        for (bay, holder), held in units.items():
+            held.sort()
+            run_start = previous = held[0]
+            for unit in held[1:] + [None]:
+                if unit != previous + 1:
+                    schedule.add(bay, run_start * self.slot_minutes, (previous + 1) * self.slot_minutes, holder)
+                    run_start = unit
+                previous = unit
+        return schedule
@@ -0,0 +1,173 @@
+import io
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+from botocore.exceptions import ClientError
+from app.config import config
+from app.non_crud_lib.notification_service import NotificationService
+from app.non_crud_lib.queue_service import QueueService
+from app.non_crud_lib.scheduler_service import SchedulerService
+from app.non_crud_lib.storage_service import StorageService
+
+# In-process stand-ins for the SNS, SQS, EventBridge and S3 backed services, for the
+# mock app, tests and benchmarks. Each one keeps the real service's logic (message
+# formats, return values) and only swaps its AWS client for an in-memory one that
+# implements the calls the service makes, so nothing ever leaves the process.
+
+def _client_error(code: str, message: str, operation: str) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': message}}, operation)
+
+class _MemorySNS:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.published: List[Dict[str, Any]] = []
+    
+    def publish(self, **params) -> Dict[str, Any]:
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self.published.append(dict(params, MessageId=message_id))
+        return {'MessageId': message_id}
+
+class _MemorySQS:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._messages: Dict[str, Dict[str, Any]] = {}  # receipt handle -> message, in send order
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+    
+    def send_message(self, QueueUrl: str, MessageBody: str, MessageAttributes: Dict = None) -> Dict[str, Any]:
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self._messages[str(uuid.uuid4())] = {
+                'MessageId': message_id,
+                'Body': MessageBody,
+                'MessageAttributes': MessageAttributes or {}
+            }
+        return {'MessageId': message_id}
+    
+    def send_message_batch(self, QueueUrl: str, Entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        successful = []
+        for entry in Entries:
+            response = self.send_message(QueueUrl, entry['MessageBody'], entry.get('MessageAttributes'))
+            successful.append({'Id': entry['Id'], 'MessageId': response['MessageId']})
+        return {'Successful': successful, 'Failed': []}
+    
+    def receive_message(self, QueueUrl: str, MaxNumberOfMessages: int = 1, **params) -> Dict[str, Any]:
+        # Never waits: an empty queue returns at once instead of long polling
+        with self._lock:
+            handles = list(self._messages)[:MaxNumberOfMessages]
+            messages = []
+            for handle in handles:
+                message = self._messages.pop(handle)
+                self._in_flight[handle] = message
+                messages.append(dict(message, ReceiptHandle=handle))
+        return {'Messages': messages}
+    
+    def delete_message(self, QueueUrl: str, ReceiptHandle: str) -> Dict[str, Any]:
+        with self._lock:
+            if self._in_flight.pop(ReceiptHandle, None) is None and self._messages.pop(ReceiptHandle, None) is None:
+                raise _client_error('ReceiptHandleIsInvalid', 'The receipt handle is not valid', 'DeleteMessage')
+        return {}
+    
+    def get_queue_attributes(self, QueueUrl: str, AttributeNames: List[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            return {'Attributes': {
+                'ApproximateNumberOfMessages': str(len(self._messages)),
+                'ApproximateNumberOfMessagesNotVisible': str(len(self._in_flight)),
+                'ApproximateNumberOfMessagesDelayed': '0'
+            }}
+
+class _MemoryEventBridge:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules: Dict[str, Dict[str, Any]] = {}
+    
+    def put_rule(self, Name: str, **params) -> Dict[str, Any]:
+        with self._lock:
+            self._rules[Name] = dict(params, Name=Name)
+        return {'RuleArn': f"arn:aws:events:{config.AWS_REGION}:000000000000:rule/{Name}"}
+    
+    def list_targets_by_rule(self, Rule: str) -> Dict[str, Any]:
+        with self._lock:
+            if Rule not in self._rules:
+                raise _client_error('ResourceNotFoundException', f'Rule {Rule} does not exist', 'ListTargetsByRule')
+        return {'Targets': []}
+    
+    def remove_targets(self, Rule: str, Ids: List[str]) -> Dict[str, Any]:
+        return {'FailedEntryCount': 0, 'FailedEntries': []}
+    
+    def delete_rule(self, Name: str) -> Dict[str, Any]:
+        with self._lock:
+            self._rules.pop(Name, None)
+        return {}
+    
+    def list_rules(self, NamePrefix: str = '') -> Dict[str, Any]:
+        with self._lock:
+            return {'Rules': [dict(rule) for name, rule in sorted(self._rules.items()) if name.startswith(NamePrefix)]}
+
+class _MemoryS3:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._objects: Dict[str, Dict[str, Any]] = {}
+    
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str = 'binary/octet-stream', Metadata: Dict = None) -> Dict[str, Any]:
+        with self._lock:
+            self._objects[Key] = {
+                'Body': bytes(Body),
+                'ContentType': ContentType,
+                'Metadata': dict(Metadata or {}),
+                'LastModified': datetime.utcnow()
+            }
+        return {}
+    
+    def get_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        with self._lock:
+            stored = self._objects.get(Key)
+        if stored is None:
+            raise _client_error('NoSuchKey', 'The specified key does not exist.', 'GetObject')
+        return dict(stored, Body=io.BytesIO(stored['Body']))
+    
+    def generate_presigned_url(self, operation: str, Params: Dict[str, Any], ExpiresIn: int = 3600) -> str:
+        return f"memory://{Params['Bucket']}/{Params['Key']}?expires_in={ExpiresIn}"
+    
+    def list_objects_v2(self, Bucket: str, Prefix: str = '') -> Dict[str, Any]:
+        with self._lock:
+            contents = [
+                {'Key': key, 'Size': len(stored['Body']), 'LastModified': stored['LastModified']}
+                for key, stored in sorted(self._objects.items())
+                if key.startswith(Prefix)
+            ]
+        return {'Contents': contents, 'KeyCount': len(contents)}
+    
+    def delete_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        with self._lock:
+            self._objects.pop(Key, None)
+        return {}
+
+class MemoryNotificationService(NotificationService):
+    """NotificationService that records published notifications instead of sending them through SNS"""
+    
+    def __init__(self):
+        self.sns_client = _MemorySNS()
+        self.topic_arn = config.SNS_TOPIC_ARN
+
+class MemoryQueueService(QueueService):
+    """QueueService over an in-process FIFO instead of SQS"""
+    
+    def __init__(self):
+        self.sqs_client = _MemorySQS()
+        self.queue_url = config.SQS_QUEUE_URL
+
+class MemorySchedulerService(SchedulerService):
+    """SchedulerService that keeps its rules in memory instead of EventBridge (nothing fires)"""
+    
+    def __init__(self):
+        self.eventbridge_client = _MemoryEventBridge()
+        self.rule_name_prefix = config.EVENTBRIDGE_RULE_NAME
+
+class MemoryStorageService(StorageService):
+    """StorageService that keeps documents in memory instead of S3"""
+    
+    def __init__(self):
+        self.s3_client = _MemoryS3()
+        self.bucket_name = config.S3_BUCKET_NAME
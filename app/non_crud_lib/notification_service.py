@@ -1,7 +1,7 @@
-import boto3
 import json
 from typing import Dict, Any, List
 from app.config import config
+from app.aws_clients import get_client
 
 class NotificationService:
     """
@@ -10,12 +10,7 @@ class NotificationService:
     """
     
     def __init__(self):
-        self.sns_client = boto3.client(
-            'sns',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
+        self.sns_client = get_client('sns')
         self.topic_arn = config.SNS_TOPIC_ARN
     
     def send_booking_confirmation(self, customer_email: str, booking_details: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,139 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.non_crud_lib.booking_aggregator import BOOKINGS, COMPLETED_REVENUE, STATUS_PREFIX
+from app.non_crud_lib.columnar_reports import BookingColumns
+from app.non_crud_lib.report_generator import ReportGenerator
+
+# Worker processes are spawned rather than forked: forking a server that is
+# already running threads can copy a held lock into the child.
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+# One row range of the columns a performance report reads: service center codes,
+# status codes, actual costs, the number of service centers and the status codes
+# that mean COMPLETED and CANCELLED. Plain NumPy buffers pickle as raw bytes.
+Segment = Tuple[np.ndarray, np.ndarray, np.ndarray, int, List[int], List[int]]
+# Per service center code: bookings, completed, cancelled, completed revenue
+PartialCounters = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the shared report process pool, creating it on first use"""
+    global _executor, _executor_workers
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+                _executor_workers = workers
+    return _executor
+
+def shutdown_process_pool():
+    """Stop the shared report process pool (called on application shutdown)"""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+def _discard_process_pool(executor: ProcessPoolExecutor):
+    """Drop a broken pool so the next report starts a fresh one"""
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+def _segment_counters(segment: Segment) -> PartialCounters:
+    """Performance counters of every service center over one row range (runs in a worker process)"""
+    service_center_codes, status_codes, actual_cost, service_centers, completed_codes, cancelled_codes = segment
+    completed = np.isin(status_codes, completed_codes)
+    cancelled = np.isin(status_codes, cancelled_codes)
+    # Missing (NaN) costs of completed bookings count as 0, like `actual_cost or 0`
+    revenue = np.where(completed & ~np.isnan(actual_cost), actual_cost, 0)
+    return (
+        np.bincount(service_center_codes, minlength=service_centers),
+        np.bincount(service_center_codes[completed], minlength=service_centers),
+        np.bincount(service_center_codes[cancelled], minlength=service_centers),
+        np.bincount(service_center_codes, weights=revenue, minlength=service_centers)
+    )
+
+class ParallelReportGenerator:
+    """
+    Non-CRUD Service for reports over every service center at once
+    No database operations - Splits the booking columns into row ranges, counts
+    each range in a pool of worker processes and merges their partial counters
+    
+    Below min_bookings, or with fewer than two workers, everything runs in
+    the calling process: spawning and pickling would cost more than it saves.
+    """
+    
+    def __init__(self, workers: int, min_bookings: int = 0):
+        self.workers = workers
+        self.min_bookings = min_bookings
+        self.report_generator = ReportGenerator()
+    
+    def generate_all_service_center_performance(self, columns: BookingColumns) -> Dict[str, Any]:
+        """generate_service_center_performance for every service center with bookings, merged into one report"""
+        if not len(columns):
+            return {
+                'status': 'success',
+                'message': 'No bookings found for any service center',
+                'report': {}
+            }
+        
+        totals, completed, cancelled, revenue = self._count(columns)
+        reports = {}
+        for code, service_center_id in enumerate(columns.service_centers):
+            if totals[code]:
+                reports[service_center_id] = self.report_generator.generate_service_center_performance_from_aggregates({
+                    BOOKINGS: int(totals[code]),
+                    STATUS_PREFIX + 'COMPLETED': int(completed[code]),
+                    STATUS_PREFIX + 'CANCELLED': int(cancelled[code]),
+                    COMPLETED_REVENUE: float(revenue[code])
+                })['report']
+        
+        return {
+            'status': 'success',
+            'message': f'Service center performance report generated for {len(reports)} service centers',
+            'report': {
+                'total_service_centers': len(reports),
+                'total_bookings': len(columns),
+                'service_centers': {service_center_id: reports[service_center_id] for service_center_id in sorted(reports, key=str)},
+                'generated_at': datetime.utcnow().isoformat()
+            }
+        }
+    
+    def _count(self, columns: BookingColumns) -> PartialCounters:
+        completed_codes = [code for code, status in enumerate(columns.statuses) if status == 'COMPLETED']
+        cancelled_codes = [code for code, status in enumerate(columns.statuses) if status == 'CANCELLED']
+        
+        def segment(start: int, end: int) -> Segment:
+            return (
+                columns.service_center_codes[start:end],
+                columns.status_codes[start:end],
+                columns.actual_cost[start:end],
+                len(columns.service_centers),
+                completed_codes,
+                cancelled_codes
+            )
+        
+        if self.workers < 2 or len(columns) < self.min_bookings:
+            return _segment_counters(segment(0, len(columns)))
+        
+        executor = get_process_pool(self.workers)
+        bounds = np.linspace(0, len(columns), _executor_workers + 1, dtype=int)
+        segments = [segment(start, end) for start, end in zip(bounds[:-1], bounds[1:])]
+        try:
+            partials = list(executor.map(_segment_counters, segments))
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); the report can still be built here
+            print(f"Report process pool broke, computing in process: {e}")
+            _discard_process_pool(executor)
+            return _segment_counters(segment(0, len(columns)))
+        # Merged in row order, so revenue is summed range by range
+        return tuple(sum(counters[i] for counters in partials) for i in range(4))
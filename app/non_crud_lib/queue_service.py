@@ -1,7 +1,8 @@
-import boto3
 import json
 from typing import Dict, Any, List
+from datetime import datetime
 from app.config import config
+from app.aws_clients import get_client
 
 class QueueService:
     """
@@ -10,12 +11,7 @@ class QueueService:
     """
     
     def __init__(self):
-        self.sqs_client = boto3.client(
-            'sqs',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
+        self.sqs_client = get_client('sqs')
         self.queue_url = config.SQS_QUEUE_URL
     
     def enqueue_booking_request(self, booking_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -53,6 +49,53 @@ class QueueService:
                 'message': f'Failed to queue booking request: {str(e)}'
             }
     
+    def enqueue_booking_requests(self, bookings_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add many booking requests to the queue using SendMessageBatch (10 per call)"""
+        queued = 0
+        failed = []
+        timestamp = str(datetime.utcnow())
+        
+        for start in range(0, len(bookings_data), 10):
+            chunk = bookings_data[start:start + 10]
+            entries = [
+                {
+                    'Id': str(index),
+                    'MessageBody': json.dumps({
+                        'message_type': 'BOOKING_REQUEST',
+                        'data': booking_data,
+                        'timestamp': timestamp
+                    }),
+                    'MessageAttributes': {
+                        'MessageType': {
+                            'StringValue': 'BOOKING_REQUEST',
+                            'DataType': 'String'
+                        },
+                        'Priority': {
+                            'StringValue': booking_data.get('priority', 'NORMAL'),
+                            'DataType': 'String'
+                        }
+                    }
+                }
+                for index, booking_data in enumerate(chunk)
+            ]
+            
+            try:
+                response = self.sqs_client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+                queued += len(response.get('Successful', []))
+                failed.extend(
+                    chunk[int(entry['Id'])].get('booking_id')
+                    for entry in response.get('Failed', [])
+                )
+            except Exception:
+                failed.extend(booking_data.get('booking_id') for booking_data in chunk)
+        
+        return {
+            'status': 'success' if not failed else 'error',
+            'message': f'Queued {queued} of {len(bookings_data)} booking requests',
+            'queued': queued,
+            'failed_booking_ids': failed
+        }
+    
     def enqueue_service_completion(self, service_data: Dict[str, Any]) -> Dict[str, Any]:
         """Add service completion notification to queue"""
         try:
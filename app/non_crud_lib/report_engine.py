@@ -0,0 +1,151 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.models.booking import Booking
+from app.non_crud_lib.booking_aggregator import AggregateKey, BookingAggregator, Counters
+
+# What a folded booking adds to the rollups: (version, aggregate keys, counter increments)
+Contribution = Tuple[int, Tuple[AggregateKey, ...], Counters]
+
+CHECKPOINT_FORMAT = 2
+
+class IncrementalReportEngine:
+    """
+    Non-CRUD Service for incrementally materialized reports
+    No database operations - Folds booking changes into rollups
+    
+    Rollups use the same (scope, period) counters as the write-time aggregates.
+    The engine remembers the contribution it folded for every booking (not the
+    booking itself), so folding a booking again only applies its change, and
+    folding the same state twice is a no-op: overlapping incremental runs are harmless.
+    Deleted bookings are taken out with remove() and never folded again, so a
+    lagging read of one cannot bring it back.
+    """
+    
+    def __init__(self):
+        self.aggregator = BookingAggregator()
+        self.rollups: Dict[AggregateKey, Counters] = {}
+        self.folded: Dict[str, Contribution] = {}
+        self.deleted: Set[str] = set()  # Removed bookings, until the next rebuild from scratch
+        self.high_water_mark: Optional[str] = None  # updated_at up to which every change is folded
+        self.rebuilt_at: Optional[str] = None  # When the whole table was last folded from scratch
+        self._keys: Dict[AggregateKey, AggregateKey] = {}  # One shared tuple per key across all contributions
+    
+    def fold(self, bookings: Iterable[Booking]) -> int:
+        """Fold the current state of changed bookings; returns how many changed a rollup"""
+        changed = 0
+        for booking in bookings:
+            if booking.booking_id in self.deleted:
+                continue
+            previous = self.folded.get(booking.booking_id)
+            if previous is not None and previous[0] > booking.version:
+                continue  # A lagging read (e.g. an eventually consistent index) of a state already folded
+    
+            contribution = (
+                booking.version,
+                tuple(self._keys.setdefault(key, key) for key in self.aggregator.keys_for(booking)),
+                self.aggregator.contribution(booking)
+            )
+            self.folded[booking.booking_id] = contribution
+            changed += 1 if self._apply(previous, contribution) else 0
+        return changed
+    
+    def remove(self, booking_ids: Iterable[str]) -> int:
+        """Take deleted bookings out of the rollups; returns how many changed a rollup"""
+        changed = 0
+        for booking_id in booking_ids:
+            self.deleted.add(booking_id)
+            previous = self.folded.pop(booking_id, None)
+            if previous is not None:
+                changed += 1 if self._apply(previous, None) else 0
+        return changed
+    
+    def get(self, key: AggregateKey) -> Counters:
+        """Counters of one rollup, without the ones that cancelled out"""
+        return {name: value for name, value in self.rollups.get(key, {}).items() if value}
+    
+    def snapshot(self) -> 'IncrementalReportEngine':
+        """
+        Copy to checkpoint from while this engine keeps folding. Contributions are
+        never changed in place, so only the rollup counters need copying.
+        """
+        engine = IncrementalReportEngine()
+        engine.rollups = {key: dict(counters) for key, counters in self.rollups.items()}
+        engine.folded = dict(self.folded)
+        engine.deleted = set(self.deleted)
+        engine.high_water_mark = self.high_water_mark
+        engine.rebuilt_at = self.rebuilt_at
+        return engine
+    
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """
+        JSON-serializable state, enough to resume folding after a restart: the
+        rollups, and per booking its version, the index of its set of rollups,
+        the index of its set of counter names and the counter values
+        """
+        key_index = {key: i for i, key in enumerate(self.rollups)}
+        key_sets: Dict[Tuple[AggregateKey, ...], int] = {}
+        name_sets: Dict[Tuple[str, ...], int] = {}
+        bookings = []
+        for booking_id, (version, keys, counters) in self.folded.items():
+            names = tuple(counters)
+            bookings.append([
+                booking_id,
+                version,
+                key_sets.setdefault(keys, len(key_sets)),
+                name_sets.setdefault(names, len(name_sets)),
+                list(counters.values())
+            ])
+    
+        return {
+            'format': CHECKPOINT_FORMAT,
+            'high_water_mark': self.high_water_mark,
+            'rebuilt_at': self.rebuilt_at,
+            'rollups': [[scope, period, counters] for (scope, period), counters in self.rollups.items()],
+            'key_sets': [[key_index[key] for key in keys] for keys in key_sets],
+            'name_sets': [list(names) for names in name_sets],
+            'bookings': bookings,
+            'deleted': list(self.deleted)
+        }
+    
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any]) -> 'IncrementalReportEngine':
+        """Engine restored from to_checkpoint(); rollups are loaded as saved, nothing is refolded"""
+        if checkpoint.get('format') != CHECKPOINT_FORMAT:
+            raise ValueError(f"Unsupported report checkpoint format {checkpoint.get('format')}")
+        engine = cls()
+        keys = []
+        for scope, period, counters in checkpoint['rollups']:
+            key = (scope, period)
+            engine._keys[key] = key
+            engine.rollups[key] = counters
+            keys.append(key)
+        key_sets = [tuple(keys[i] for i in indexes) for indexes in checkpoint['key_sets']]
+        name_sets = checkpoint['name_sets']
+        engine.folded = {
+            booking_id: (version, key_sets[key_set], dict(zip(name_sets[name_set], values)))
+            for booking_id, version, key_set, name_set, values in checkpoint['bookings']
+        }
+        engine.deleted = set(checkpoint.get('deleted', ()))
+        engine.high_water_mark = checkpoint.get('high_water_mark')
+        engine.rebuilt_at = checkpoint.get('rebuilt_at')
+        return engine
+    
+    def _apply(self, previous: Optional[Contribution], contribution: Optional[Contribution]) -> bool:
+        """Replace previous by contribution in the rollups; whether any counter changed"""
+        deltas: Dict[AggregateKey, Counters] = {}
+        for folded, sign in ((previous, -1), (contribution, 1)):
+            if folded is None:
+                continue
+            _, keys, counters = folded
+            for key in keys:
+                key_deltas = deltas.setdefault(key, {})
+                for name, value in counters.items():
+                    key_deltas[name] = key_deltas.get(name, 0) + sign * value
+    
+        changed = False
+        for key, counters in deltas.items():
+            for name, value in counters.items():
+                if value:
+                    rollup = self.rollups.setdefault(key, {})
+                    rollup[name] = rollup.get(name, 0) + value
+                    changed = True
+        return changed
@@ -1,6 +1,13 @@
 from typing import Dict, Any, List
 from datetime import datetime
 import json
+from app.non_crud_lib.booking_aggregator import (
+    BOOKINGS,
+    COMPLETED_REVENUE,
+    REVENUE,
+    SERVICE_TYPE_PREFIX,
+    STATUS_PREFIX
+)
 
 class ReportGenerator:
     """
@@ -63,7 +70,7 @@ class ReportGenerator:
         
         total_services = len(customer_bookings)
         total_spent = sum(
-            booking.get('actual_cost', booking.get('estimated_cost', 0))
+            booking.get('actual_cost') or booking.get('estimated_cost') or 0
             for booking in customer_bookings
         )
         
@@ -104,7 +111,7 @@ class ReportGenerator:
         cancellation_rate = (cancelled_bookings / total_bookings * 100) if total_bookings > 0 else 0
         
         total_revenue = sum(
-            booking.get('actual_cost', 0)
+            booking.get('actual_cost') or 0
             for booking in service_center_bookings
             if booking.get('status') == 'COMPLETED'
         )
@@ -141,7 +148,7 @@ class ReportGenerator:
         
         total_bookings = len(monthly_bookings)
         total_revenue = sum(
-            booking.get('actual_cost', booking.get('estimated_cost', 0))
+            booking.get('actual_cost') or booking.get('estimated_cost') or 0
             for booking in monthly_bookings
         )
         
@@ -158,6 +165,93 @@ class ReportGenerator:
             }
         }
     
+    def generate_booking_summary_from_aggregates(self, aggregates: Dict[str, float]) -> Dict[str, Any]:
+        """Same report as generate_booking_summary_report, from write-time counters"""
+        total_bookings = int(aggregates.get(BOOKINGS, 0))
+        if not total_bookings:
+            return {
+                'status': 'success',
+                'message': 'No bookings to generate report',
+                'report': {}
+            }
+        
+        total_revenue = aggregates.get(REVENUE, 0)
+        return {
+            'status': 'success',
+            'message': 'Booking summary report generated',
+            'report': {
+                'summary': {
+                    'total_bookings': total_bookings,
+                    'total_revenue': round(total_revenue, 2),
+                    'average_booking_value': round(total_revenue / total_bookings, 2)
+                },
+                'by_status': self._counts(aggregates, STATUS_PREFIX),
+                'by_service_type': self._counts(aggregates, SERVICE_TYPE_PREFIX),
+                'generated_at': datetime.utcnow().isoformat()
+            }
+        }
+    
+    def generate_service_center_performance_from_aggregates(self, aggregates: Dict[str, float]) -> Dict[str, Any]:
+        """Same report as generate_service_center_performance, from write-time counters"""
+        total_bookings = int(aggregates.get(BOOKINGS, 0))
+        if not total_bookings:
+            return {
+                'status': 'success',
+                'message': 'No bookings found for service center',
+                'report': {}
+            }
+        
+        completed_bookings = int(aggregates.get(STATUS_PREFIX + 'COMPLETED', 0))
+        cancelled_bookings = int(aggregates.get(STATUS_PREFIX + 'CANCELLED', 0))
+        total_revenue = aggregates.get(COMPLETED_REVENUE, 0)
+        
+        return {
+            'status': 'success',
+            'message': 'Service center performance report generated',
+            'report': {
+                'total_bookings': total_bookings,
+                'completed_bookings': completed_bookings,
+                'cancelled_bookings': cancelled_bookings,
+                'completion_rate': round(completed_bookings / total_bookings * 100, 2),
+                'cancellation_rate': round(cancelled_bookings / total_bookings * 100, 2),
+                'total_revenue': round(total_revenue, 2),
+                'average_revenue_per_booking': round(total_revenue / completed_bookings, 2) if completed_bookings > 0 else 0,
+                'generated_at': datetime.utcnow().isoformat()
+            }
+        }
+    
+    def generate_monthly_report_from_aggregates(self, month: int, year: int, aggregates: Dict[str, float]) -> Dict[str, Any]:
+        """Same report as generate_monthly_report, from the month's write-time counters"""
+        total_bookings = int(aggregates.get(BOOKINGS, 0))
+        if not total_bookings:
+            return {
+                'status': 'success',
+                'message': f'No bookings found for {month}/{year}',
+                'report': {}
+            }
+        
+        total_revenue = aggregates.get(REVENUE, 0)
+        return {
+            'status': 'success',
+            'message': f'Monthly report generated for {month}/{year}',
+            'report': {
+                'month': month,
+                'year': year,
+                'total_bookings': total_bookings,
+                'total_revenue': round(total_revenue, 2),
+                'average_booking_value': round(total_revenue / total_bookings, 2),
+                'generated_at': datetime.utcnow().isoformat()
+            }
+        }
+    
+    def _counts(self, aggregates: Dict[str, float], prefix: str) -> Dict[str, int]:
+        """{name: count} of the non-zero counters starting with prefix"""
+        return {
+            name[len(prefix):]: int(value)
+            for name, value in aggregates.items()
+            if name.startswith(prefix) and value
+        }
+    
     def _is_in_month(self, date_string: str, month: int, year: int) -> bool:
         """Helper to check if date is in specified month/year"""
         try:
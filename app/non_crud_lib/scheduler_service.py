@@ -1,8 +1,8 @@
-import boto3
 import json
 from typing import Dict, Any
 from datetime import datetime, timedelta
 from app.config import config
+from app.aws_clients import get_client
 
 class SchedulerService:
     """
@@ -11,12 +11,7 @@ class SchedulerService:
     """
     
     def __init__(self):
-        self.eventbridge_client = boto3.client(
-            'events',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
+        self.eventbridge_client = get_client('events')
         self.rule_name_prefix = config.EVENTBRIDGE_RULE_NAME
     
     def schedule_booking_reminder(self, booking_id: str, booking_datetime: str, customer_email: str) -> Dict[str, Any]:
@@ -0,0 +1,72 @@
+import threading
+from typing import Any, Callable, Dict
+from app.config import config
+from app.non_crud_lib.notification_service import NotificationService
+from app.non_crud_lib.queue_service import QueueService
+from app.non_crud_lib.scheduler_service import SchedulerService
+from app.non_crud_lib.storage_service import StorageService
+
+# One instance per service and process, built for config.SERVICES_BACKEND:
+#   aws    - SNS, SQS, EventBridge and S3 (default)
+#   memory - in-process stand-ins (app.non_crud_lib.memory_services) for the
+#            mock app, tests and benchmarks; nothing is sent anywhere
+_lock = threading.Lock()
+_instances: Dict[str, Any] = {}
+
+def _aws_backend() -> Dict[str, Callable[[], Any]]:
+    return {
+        'notification': NotificationService,
+        'queue': QueueService,
+        'scheduler': SchedulerService,
+        'storage': StorageService
+    }
+
+def _memory_backend() -> Dict[str, Callable[[], Any]]:
+    from app.non_crud_lib.memory_services import (
+        MemoryNotificationService,
+        MemoryQueueService,
+        MemorySchedulerService,
+        MemoryStorageService
+    )
+    return {
+        'notification': MemoryNotificationService,
+        'queue': MemoryQueueService,
+        'scheduler': MemorySchedulerService,
+        'storage': MemoryStorageService
+    }
+
+BACKENDS = {
+    'aws': _aws_backend,
+    'memory': _memory_backend
+}
+
+def _get(name: str):
+    service = _instances.get(name)
+    if service is None:
+        with _lock:
+            service = _instances.get(name)
+            if service is None:
+                backend = BACKENDS.get(config.SERVICES_BACKEND)
+                if backend is None:
+                    raise ValueError(
+                        f"Unknown SERVICES_BACKEND '{config.SERVICES_BACKEND}' (expected one of: {', '.join(BACKENDS)})"
+                    )
+                service = backend()[name]()
+                _instances[name] = service
+    return service
+
+def get_notification_service() -> NotificationService:
+    """Shared notification service for the configured backend"""
+    return _get('notification')
+
+def get_queue_service() -> QueueService:
+    """Shared queue service for the configured backend"""
+    return _get('queue')
+
+def get_scheduler_service() -> SchedulerService:
+    """Shared scheduler service for the configured backend"""
+    return _get('scheduler')
+
+def get_storage_service() -> StorageService:
+    """Shared storage service for the configured backend"""
+    return _get('storage')
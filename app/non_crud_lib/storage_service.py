@@ -1,8 +1,8 @@
-import boto3
 from typing import Dict, Any, Optional
 import io
 from datetime import datetime, timedelta
 from app.config import config
+from app.aws_clients import get_client
 
 class StorageService:
     """
@@ -11,12 +11,7 @@ class StorageService:
     """
     
     def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            region_name=config.AWS_REGION,
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY
-        )
+        self.s3_client = get_client('s3')
         self.bucket_name = config.S3_BUCKET_NAME
     
     def upload_service_report(self, booking_id: str, file_content: bytes, file_name: str) -> Dict[str, Any]:
@@ -104,6 +99,35 @@ class StorageService:
                 'message': f'Failed to upload vehicle image: {str(e)}'
             }
     
+    def upload_report(self, job_id: str, report_content: bytes, file_name: str) -> Dict[str, Any]:
+        """Upload a generated report (or its job record) to S3"""
+        try:
+            key = f"reports/{job_id}/{file_name}"
+            
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=report_content,
+                ContentType='application/json',
+                Metadata={
+                    'job_id': job_id,
+                    'document_type': 'report',
+                    'upload_date': datetime.utcnow().isoformat()
+                }
+            )
+            
+            return {
+                'status': 'success',
+                'message': 'Report uploaded successfully',
+                'file_key': key,
+                'bucket': self.bucket_name
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Failed to upload report: {str(e)}'
+            }
+    
     def download_document(self, file_key: str) -> Dict[str, Any]:
         """Download document from S3"""
         try:
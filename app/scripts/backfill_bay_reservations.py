@@ -0,0 +1,74 @@
+import sys
+import os
+from datetime import date
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import config
+from app.crud.bay_allocator import get_bay_allocator
+from app.crud.factory import get_booking_crud, get_service_center_crud
+from app.crud.updates import VersionConflictError
+from app.models.booking import BookingStatus, BookingUpdate
+
+def backfill_bay_reservations():
+    """
+    Assign a bay, and write its slot reservations, to every non-cancelled booking
+    from today on that was made before bays existed (bay is None), so new
+    bookings can no longer be put on top of them. Earlier-made bookings get their
+    bay first; ones that no longer fit are listed to be rescheduled by hand.
+    Safe to run repeatedly and while the API is serving.
+    """
+    booking_crud = get_booking_crud()
+    service_center_crud = get_service_center_crud()
+    allocator = get_bay_allocator()
+    planner = allocator.planner
+    today = date.today().isoformat()
+    
+    pending = [
+        booking
+        for bookings in booking_crud.iter_booking_pages(config.SCAN_SEGMENTS)
+        for booking in bookings
+        if booking.bay is None and booking.status != BookingStatus.CANCELLED and booking.booking_date >= today
+    ]
+    pending.sort(key=lambda booking: booking.created_at)
+    
+    bays_by_center = {}
+    assigned = 0
+    unplaced = []
+    for booking in pending:
+        if booking.service_center_id not in bays_by_center:
+            service_center = service_center_crud.get_service_center(booking.service_center_id)
+            bays_by_center[booking.service_center_id] = planner.bays_for(service_center) if service_center else None
+        bays = bays_by_center[booking.service_center_id]
+        if bays is None:
+            unplaced.append((booking.booking_id, 'service center not found'))
+            continue
+        
+        try:
+            slot = planner.slot_for(booking.booking_date, booking.scheduled_time, booking.service_type)
+        except ValueError as e:
+            unplaced.append((booking.booking_id, str(e)))
+            continue
+        
+        bay = allocator.reserve(booking.service_center_id, bays, slot, booking.booking_id)
+        if bay is None:
+            unplaced.append((booking.booking_id, 'no bay free at its time'))
+            continue
+        
+        try:
+            # Only if the booking did not change since the scan; a later update through the API reserves its own bay
+            updated = booking_crud.update_booking(booking.booking_id, BookingUpdate(), expected_version=booking.version or 0, bay=bay)
+        except VersionConflictError:
+            updated = None
+        if updated is None:
+            allocator.release(booking.service_center_id, slot, bay, booking.booking_id)
+            continue
+        assigned += 1
+    
+    print(f"✅ Assigned bays to {assigned} of {len(pending)} bookings without one")
+    for booking_id, reason in unplaced:
+        print(f"⚠️  Booking {booking_id} has no bay ({reason}); reschedule it")
+
+if __name__ == "__main__":
+    backfill_bay_reservations()
@@ -0,0 +1,54 @@
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from app.config import config
+from app.aws_clients import get_resource
+from app.crud.parallel_scan import parallel_scan_pages
+from app.models.booking import booking_datetime
+
+def backfill_booking_datetime():
+    """
+    Set booking_datetime on bookings written before the schedule index existed,
+    so they appear in service center schedule queries. Run scripts/create_tables.py
+    first: on an existing table it adds the indexes it is missing. Safe to run
+    repeatedly.
+    """
+    table = get_resource('dynamodb').Table(config.BOOKINGS_TABLE)
+    updated = 0
+    
+    pages = parallel_scan_pages(
+        table,
+        config.SCAN_SEGMENTS,
+        config.SCAN_WORKERS,
+        FilterExpression=Attr('booking_datetime').not_exists()
+    )
+    for items in pages:
+        for item in items:
+            try:
+                # Only if the schedule did not change since the scan; a later write sets it itself
+                table.update_item(
+                    Key={'booking_id': item['booking_id']},
+                    UpdateExpression='SET booking_datetime = :booking_datetime',
+                    ConditionExpression=(
+                        Attr('booking_datetime').not_exists()
+                        & Attr('booking_date').eq(item['booking_date'])
+                        & Attr('scheduled_time').eq(item['scheduled_time'])
+                    ),
+                    ExpressionAttributeValues={
+                        ':booking_datetime': booking_datetime(item['booking_date'], item['scheduled_time'])
+                    }
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+    
+    print(f"✅ Backfilled booking_datetime on {updated} bookings")
+
+if __name__ == "__main__":
+    backfill_booking_datetime()
@@ -1,23 +1,50 @@
-import boto3
 import sys
 import os
+import time
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.config import config
+from app.aws_clients import get_client, get_resource
+
+def _booking_date_index(index_name, partition_key, sort_key='booking_date'):
+    """GSI definition for looking up bookings by partition_key, sorted by sort_key (booking date by default)"""
+    return {
+        'IndexName': index_name,
+        'KeySchema': [
+            {'AttributeName': partition_key, 'KeyType': 'HASH'},
+            {'AttributeName': sort_key, 'KeyType': 'RANGE'},
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+    }
 
 def create_dynamodb_tables():
     """Create all required DynamoDB tables"""
     
-    boto_config = config.get_boto3_config()
-    dynamodb = boto3.resource('dynamodb', **boto_config)
+    dynamodb = get_resource('dynamodb')
     
     tables_config = [
         {
             'TableName': config.BOOKINGS_TABLE,
             'KeySchema': [{'AttributeName': 'booking_id', 'KeyType': 'HASH'}],
-            'AttributeDefinitions': [{'AttributeName': 'booking_id', 'AttributeType': 'S'}],
+            'AttributeDefinitions': [
+                {'AttributeName': 'booking_id', 'AttributeType': 'S'},
+                {'AttributeName': 'customer_id', 'AttributeType': 'S'},
+                {'AttributeName': 'vehicle_id', 'AttributeType': 'S'},
+                {'AttributeName': 'service_center_id', 'AttributeType': 'S'},
+                {'AttributeName': 'booking_date', 'AttributeType': 'S'},
+                {'AttributeName': 'booking_datetime', 'AttributeType': 'S'},
+                {'AttributeName': 'updated_day', 'AttributeType': 'S'},
+                {'AttributeName': 'updated_at', 'AttributeType': 'S'},
+            ],
+            'GlobalSecondaryIndexes': [
+                _booking_date_index(config.BOOKINGS_CUSTOMER_INDEX, 'customer_id'),
+                _booking_date_index(config.BOOKINGS_VEHICLE_INDEX, 'vehicle_id'),
+                _booking_date_index(config.BOOKINGS_SERVICE_CENTER_INDEX, 'service_center_id'),
+                _booking_date_index(config.BOOKINGS_SCHEDULE_INDEX, 'service_center_id', 'booking_datetime'),
+                _booking_date_index(config.BOOKINGS_UPDATED_INDEX, 'updated_day', 'updated_at'),
+            ],
         },
         {
             'TableName': config.VEHICLES_TABLE,
@@ -34,30 +61,91 @@ def create_dynamodb_tables():
             'KeySchema': [{'AttributeName': 'service_center_id', 'KeyType': 'HASH'}],
             'AttributeDefinitions': [{'AttributeName': 'service_center_id', 'AttributeType': 'S'}],
         },
+        {
+            # One item per reserved (bay, time unit) of a service center's day
+            'TableName': config.SLOT_RESERVATIONS_TABLE,
+            'KeySchema': [
+                {'AttributeName': 'day_key', 'KeyType': 'HASH'},
+                {'AttributeName': 'slot', 'KeyType': 'RANGE'},
+            ],
+            'AttributeDefinitions': [
+                {'AttributeName': 'day_key', 'AttributeType': 'S'},
+                {'AttributeName': 'slot', 'AttributeType': 'S'},
+            ],
+        },
+        {
+            # Booking counters per (scope, period), kept up to date with atomic ADD on every booking write
+            'TableName': config.BOOKING_AGGREGATES_TABLE,
+            'KeySchema': [
+                {'AttributeName': 'scope', 'KeyType': 'HASH'},
+                {'AttributeName': 'period', 'KeyType': 'RANGE'},
+            ],
+            'AttributeDefinitions': [
+                {'AttributeName': 'scope', 'AttributeType': 'S'},
+                {'AttributeName': 'period', 'AttributeType': 'S'},
+            ],
+        },
     ]
     
     for table_config in tables_config:
         try:
-            table = dynamodb.create_table(
-                TableName=table_config['TableName'],
-                KeySchema=table_config['KeySchema'],
-                AttributeDefinitions=table_config['AttributeDefinitions'],
-                BillingMode='PAY_PER_REQUEST'
-            )
+            table = dynamodb.create_table(BillingMode='PAY_PER_REQUEST', **table_config)
             print(f"✅ Creating table: {table_config['TableName']}")
-            
+    
             if not config.USE_LOCALSTACK:
                 table.wait_until_exists()
                 print(f"✅ Table created: {table_config['TableName']}")
         except dynamodb.meta.client.exceptions.ResourceInUseException:
             print(f"ℹ️  Table already exists: {table_config['TableName']}")
+            create_missing_indexes(dynamodb.meta.client, table_config)
         except Exception as e:
             print(f"❌ Error creating table {table_config['TableName']}: {str(e)}")
 
+def create_missing_indexes(client, table_config):
+    """
+    Add the GSIs of table_config that an existing table was created without, one
+    UpdateTable call per index (DynamoDB creates only one at a time), waiting for
+    each to become ACTIVE. DynamoDB backfills an added index from the items
+    already in the table; run scripts/backfill_booking_datetime.py afterwards so
+    older bookings get the schedule index's sort key.
+    """
+    table_name = table_config['TableName']
+    description = client.describe_table(TableName=table_name)['Table']
+    existing = {index['IndexName'] for index in description.get('GlobalSecondaryIndexes', [])}
+    attribute_types = {
+        definition['AttributeName']: definition
+        for definition in table_config['AttributeDefinitions']
+    }
+    
+    for index in table_config.get('GlobalSecondaryIndexes', []):
+        if index['IndexName'] in existing:
+            continue
+        try:
+            client.update_table(
+                TableName=table_name,
+                AttributeDefinitions=[attribute_types[key['AttributeName']] for key in index['KeySchema']],
+                GlobalSecondaryIndexUpdates=[{'Create': index}]
+            )
+            print(f"✅ Creating index {index['IndexName']} on {table_name}")
+            if not config.USE_LOCALSTACK:
+                _wait_for_index(client, table_name, index['IndexName'])
+                print(f"✅ Index created: {index['IndexName']}")
+        except Exception as e:
+            print(f"❌ Error creating index {index['IndexName']} on {table_name}: {str(e)}")
+            return
+
+def _wait_for_index(client, table_name, index_name, delay=10):
+    """Poll until the table and the new index are ACTIVE (boto3 has no waiter for indexes)"""
+    while True:
+        description = client.describe_table(TableName=table_name)['Table']
+        statuses = {index['IndexName']: index['IndexStatus'] for index in description.get('GlobalSecondaryIndexes', [])}
+        if description['TableStatus'] == 'ACTIVE' and statuses.get(index_name) == 'ACTIVE':
+            return
+        time.sleep(delay)
+
 def create_s3_bucket():
     """Create S3 bucket"""
-    boto_config = config.get_boto3_config()
-    s3 = boto3.client('s3', **boto_config)
+    s3 = get_client('s3')
     
     try:
         s3.create_bucket(Bucket=config.S3_BUCKET_NAME)
@@ -70,8 +158,7 @@ def create_s3_bucket():
 
 def create_sns_topic():
     """Create SNS topic"""
-    boto_config = config.get_boto3_config()
-    sns = boto3.client('sns', **boto_config)
+    sns = get_client('sns')
     
     try:
         response = sns.create_topic(Name='vehicle-service-notifications')
@@ -83,8 +170,7 @@ def create_sns_topic():
 
 def create_sqs_queue():
     """Create SQS queue"""
-    boto_config = config.get_boto3_config()
-    sqs = boto3.client('sqs', **boto_config)
+    sqs = get_client('sqs')
     
     try:
         response = sqs.create_queue(QueueName='vehicle-service-queue')
@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import config
+from app.aws_clients import get_resource
+from app.crud.parallel_scan import parallel_scan_pages
+from app.crud.serialization import to_dynamodb
+from app.models.booking import Booking
+from app.non_crud_lib.booking_aggregator import CHANGES, BookingAggregator
+
+def rebuild_booking_aggregates():
+    """
+    Recompute the booking aggregates table from the bookings table: initial
+    backfill, and repair after counter updates failed. Counters are replaced,
+    not incremented, so run it while booking writes are paused.
+    """
+    dynamodb = get_resource('dynamodb')
+    bookings_table = dynamodb.Table(config.BOOKINGS_TABLE)
+    aggregates_table = dynamodb.Table(config.BOOKING_AGGREGATES_TABLE)
+    aggregator = BookingAggregator()
+    
+    aggregates = {}
+    pages = parallel_scan_pages(bookings_table, config.SCAN_SEGMENTS, config.SCAN_WORKERS)
+    for items in pages:
+        for key, deltas in aggregator.deltas((None, Booking(**item)) for item in items).items():
+            counters = aggregates.setdefault(key, {})
+            for name, value in deltas.items():
+                counters[name] = counters.get(name, 0) + value
+    
+    existing = parallel_scan_pages(
+        aggregates_table,
+        1,
+        ProjectionExpression='#scope, #period, #changes',
+        ExpressionAttributeNames={'#scope': 'scope', '#period': 'period', '#changes': CHANGES}
+    )
+    stale = []
+    for items in existing:
+        for item in items:
+            key = (item['scope'], item['period'])
+            if key in aggregates:
+                # Move every changes counter past its old value, so no cached report survives the rebuild
+                aggregates[key][CHANGES] = int(item.get(CHANGES, 0)) + 1
+            else:
+                stale.append(key)
+    
+    with aggregates_table.batch_writer() as batch:
+        for (scope, period), counters in aggregates.items():
+            batch.put_item(Item={'scope': scope, 'period': period, **to_dynamodb(counters)})
+        for scope, period in stale:
+            batch.delete_item(Key={'scope': scope, 'period': period})
+    
+    print(f"✅ Rebuilt {len(aggregates)} booking aggregates, removed {len(stale)} stale ones")
+
+if __name__ == "__main__":
+    rebuild_booking_aggregates()
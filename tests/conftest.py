@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The tests run the app on the in-memory repositories and services, so they need
+# no AWS account or local database. Must be set before app.config is imported.
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("SERVICES_BACKEND", "memory")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,148 @@
+import threading
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.crud.bay_allocator import BayAllocator
+from app.crud.factory import get_booking_crud, get_service_center_crud
+from app.crud.memory_crud import MemorySlotReservationCRUD
+from app.main import app
+from app.models.booking import BookingCreate, BookingUpdate, ServiceType
+from app.models.service_center import ServiceCenterCreate
+from app.non_crud_lib.capacity_planner import CapacityPlanner
+from app.scripts.backfill_bay_reservations import backfill_bay_reservations
+
+BOOKING_DATE = "2030-06-03"
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def create_service_center(bays: int) -> str:
+    return get_service_center_crud().create_service_center(ServiceCenterCreate(
+        name="Bay Test Garage",
+        address="1 Test Street",
+        city="Springfield",
+        state="IL",
+        zip_code="62701",
+        phone="+12025550100",
+        email="bays@example.com",
+        services_offered=["OIL_CHANGE", "BRAKE_SERVICE"],
+        bays=bays
+    )).service_center_id
+
+def booking_payload(service_center_id: str, scheduled_time: str, service_type: str = "OIL_CHANGE") -> dict:
+    return {
+        "customer_id": "customer-1",
+        "vehicle_id": "vehicle-1",
+        "service_center_id": service_center_id,
+        "service_type": service_type,
+        "booking_date": BOOKING_DATE,
+        "scheduled_time": scheduled_time
+    }
+
+def test_second_allocator_with_stale_schedule_cannot_take_a_reserved_bay():
+    # Two allocators over one reservation store stand in for two API processes
+    reservations = MemorySlotReservationCRUD()
+    planner = CapacityPlanner()
+    first, second = BayAllocator(reservations, planner), BayAllocator(reservations, planner)
+    slot = planner.slot_for(BOOKING_DATE, "10:00", ServiceType.OIL_CHANGE)
+    
+    # second caches the day while it is still empty
+    assert second.free_starts("sc", 1, BOOKING_DATE, 9 * 60, 18 * 60, 30)
+    assert first.reserve("sc", 1, slot, "booking-1") == 0
+    
+    # Its cached view says bay 0 is free; the atomic write fails and the reload finds no bay
+    assert second.reserve("sc", 1, slot, "booking-2") is None
+    assert set(reservations.get_reservations(planner.day_key("sc", BOOKING_DATE)).values()) == {"booking-1"}
+
+def test_overlapping_slots_conflict_and_adjacent_slots_do_not():
+    planner = CapacityPlanner()
+    allocator = BayAllocator(MemorySlotReservationCRUD(), planner)
+    assert allocator.reserve("sc", 1, planner.slot_for(BOOKING_DATE, "10:00", ServiceType.BRAKE_SERVICE), "long") == 0
+    assert allocator.reserve("sc", 1, planner.slot_for(BOOKING_DATE, "11:30", ServiceType.OIL_CHANGE), "overlapping") is None
+    assert allocator.reserve("sc", 1, planner.slot_for(BOOKING_DATE, "12:00", ServiceType.OIL_CHANGE), "adjacent") == 0
+
+def test_concurrent_requests_never_share_a_bay():
+    reservations = MemorySlotReservationCRUD()
+    planner = CapacityPlanner()
+    slot = planner.slot_for(BOOKING_DATE, "10:00", ServiceType.OIL_CHANGE)
+    results = {}
+    start = threading.Barrier(8)
+    
+    def reserve(holder: str):
+        allocator = BayAllocator(reservations, planner)  # Each with its own cached schedule
+        start.wait()
+        results[holder] = allocator.reserve("sc", 2, slot, holder)
+    
+    threads = [threading.Thread(target=reserve, args=(f"booking-{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sorted(bay for bay in results.values() if bay is not None) == [0, 1]
+
+def test_booking_route_rejects_a_full_slot(client):
+    service_center_id = create_service_center(bays=1)
+    assert client.post("/bookings/", json=booking_payload(service_center_id, "10:00")).status_code == 200
+    
+    response = client.post("/bookings/", json=booking_payload(service_center_id, "10:15"))
+    assert response.status_code == 409
+    assert client.post("/bookings/", json=booking_payload(service_center_id, "10:30")).status_code == 200
+
+def test_reschedule_into_a_full_slot_keeps_the_original_bay(client):
+    service_center_id = create_service_center(bays=1)
+    first = client.post("/bookings/", json=booking_payload(service_center_id, "10:00")).json()
+    second = client.post("/bookings/", json=booking_payload(service_center_id, "14:00")).json()
+    
+    response = client.put(f"/bookings/{second['booking_id']}", json={"scheduled_time": "10:00"})
+    assert response.status_code == 409
+    
+    # The rejected move released nothing: 14:00 is still held, 10:00 still belongs to the first booking
+    assert client.post("/bookings/", json=booking_payload(service_center_id, "14:00")).status_code == 409
+    assert client.put(f"/bookings/{first['booking_id']}", json={"notes": "still here"}).status_code == 200
+    assert client.post("/bookings/", json=booking_payload(service_center_id, "10:00")).status_code == 409
+
+def test_moving_only_the_time_keeps_the_date(client):
+    service_center_id = create_service_center(bays=1)
+    booking = client.post("/bookings/", json=booking_payload(service_center_id, "10:00")).json()
+    
+    response = client.put(f"/bookings/{booking['booking_id']}", json={"scheduled_time": "14:00"})
+    assert response.status_code == 200
+    assert (response.json()["booking_date"], response.json()["scheduled_time"]) == (BOOKING_DATE, "14:00")
+    assert client.post("/bookings/", json=booking_payload(service_center_id, "10:00")).status_code == 200
+    
+    # The repository itself takes the two together, so it never has to read the other half
+    with pytest.raises(ValueError):
+        get_booking_crud().update_booking(booking["booking_id"], BookingUpdate(scheduled_time="15:00"))
+
+@pytest.mark.parametrize('status', ['CONFIRMED', 'COMPLETED', 'CANCELLED'])
+def test_status_change_of_a_booking_made_before_bays_on_a_full_day(client, status):
+    service_center_id = create_service_center(bays=1)
+    legacy = get_booking_crud().create_booking(
+        BookingCreate(**booking_payload(service_center_id, "10:00")),
+        estimated_cost=50.0,
+        booking_id=str(uuid.uuid4())
+    )
+    assert client.post("/bookings/", json=booking_payload(service_center_id, "10:00")).status_code == 200
+    
+    # The day is full, but a status change alone never asks for a bay
+    response = client.put(f"/bookings/{legacy.booking_id}", json={"status": status})
+    assert response.status_code == 200
+    assert (response.json()["status"], response.json()["bay"]) == (status, None)
+
+def test_backfill_reserves_bays_for_bookings_made_before_bays(client):
+    service_center_id = create_service_center(bays=1)
+    booking_crud = get_booking_crud()
+    legacy = [
+        booking_crud.create_booking(BookingCreate(**booking_payload(service_center_id, "10:00")), estimated_cost=50.0, booking_id=str(uuid.uuid4()))
+        for _ in range(2)
+    ]
+    assert all(booking.bay is None for booking in legacy)
+    
+    backfill_bay_reservations()
+    
+    bays = sorted(str(booking_crud.get_booking(booking.booking_id).bay) for booking in legacy)
+    assert bays == ['0', 'None']  # The earlier-made booking keeps the bay, the other is reported
+    assert client.post("/bookings/", json=booking_payload(service_center_id, "10:00")).status_code == 409
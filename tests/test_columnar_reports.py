@@ -0,0 +1,96 @@
+import random
+import pytest
+from app.models.booking import Booking
+from app.non_crud_lib.columnar_reports import BookingColumns, ColumnarReportGenerator
+from app.non_crud_lib.parallel_reports import ParallelReportGenerator
+from app.non_crud_lib.report_generator import ReportGenerator
+
+STATUSES = ['PENDING', 'CONFIRMED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED']
+SERVICE_TYPES = ['OIL_CHANGE', 'TIRE_ROTATION', 'BRAKE_SERVICE', 'FULL_SERVICE']
+COSTS = [None, 0, 0.0, 19.99, 120.55, 1e-3, 350.1]
+DATES = ['2030-01-05', '2030-01-31', '2030-02-01', '2029-12-31', '', '2030-13-01', 'not-a-date', '2030-01', None]
+
+def random_booking_dict(rnd: random.Random) -> dict:
+    """A booking dict with the gaps real data has: missing keys, None and 0 costs, bad dates"""
+    booking = {
+        'service_center_id': f"sc{rnd.randrange(5)}",
+        'booking_date': rnd.choice(DATES),
+        'actual_cost': rnd.choice(COSTS),
+        'estimated_cost': rnd.choice(COSTS)
+    }
+    if rnd.random() < 0.9:
+        booking['status'] = rnd.choice(STATUSES)
+    if rnd.random() < 0.9:
+        booking['service_type'] = rnd.choice(SERVICE_TYPES)
+    for field in ('actual_cost', 'estimated_cost', 'booking_date'):
+        if rnd.random() < 0.1:
+            del booking[field]
+    return booking
+
+def random_booking(rnd: random.Random, index: int) -> Booking:
+    return Booking(
+        booking_id=f"b{index}",
+        customer_id="c",
+        vehicle_id="v",
+        service_center_id=f"sc{rnd.randrange(5)}",
+        service_type=rnd.choice(SERVICE_TYPES),
+        booking_date=rnd.choice(['2030-01-05', '2030-01-31', '2030-02-01', '2029-12-31']),
+        scheduled_time="10:00",
+        status=rnd.choice(STATUSES),
+        estimated_cost=rnd.choice([c for c in COSTS if c is not None]),
+        actual_cost=rnd.choice(COSTS)
+    )
+
+def without_timestamps(report: dict) -> dict:
+    report = dict(report, report=dict(report['report']))
+    report['report'].pop('generated_at', None)
+    for center in report['report'].get('service_centers', {}).values():
+        center.pop('generated_at', None)
+    return report
+
+def assert_same_reports(dicts, columns: BookingColumns):
+    generator = ReportGenerator()
+    columnar = ColumnarReportGenerator()
+    assert without_timestamps(columnar.generate_booking_summary_report(columns)) == \
+        without_timestamps(generator.generate_booking_summary_report(dicts))
+    assert without_timestamps(columnar.generate_service_center_performance(columns)) == \
+        without_timestamps(generator.generate_service_center_performance(dicts))
+    for month, year in ((1, 2030), (2, 2030), (12, 2029), (3, 2030)):
+        assert without_timestamps(columnar.generate_monthly_report(month, year, columns)) == \
+            without_timestamps(generator.generate_monthly_report(month, year, dicts))
+
+@pytest.mark.parametrize('seed', range(20))
+def test_columns_from_dicts_match_dict_reports(seed):
+    rnd = random.Random(seed)
+    dicts = [random_booking_dict(rnd) for _ in range(rnd.randrange(0, 300))]
+    assert_same_reports(dicts, BookingColumns.from_dicts(dicts))
+
+@pytest.mark.parametrize('seed', range(20))
+def test_concatenated_pages_match_dict_reports(seed):
+    rnd = random.Random(seed)
+    bookings = [random_booking(rnd, index) for index in range(rnd.randrange(0, 300))]
+    # Uneven pages, including empty ones, with categories first seen in different pages
+    cuts = sorted(rnd.randrange(0, len(bookings) + 1) for _ in range(rnd.randrange(0, 6)))
+    pages = [bookings[start:end] for start, end in zip([0] + cuts, cuts + [len(bookings)])]
+    columns = BookingColumns.concat([BookingColumns.from_bookings(page) for page in pages])
+    assert_same_reports([booking.dict() for booking in bookings], columns)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_all_service_center_performance_matches_per_center_reports(seed):
+    rnd = random.Random(seed)
+    bookings = [random_booking(rnd, index) for index in range(rnd.randrange(1, 500))]
+    columns = BookingColumns.concat([BookingColumns.from_bookings(bookings[start:start + 64]) for start in range(0, len(bookings), 64)])
+    
+    report = ParallelReportGenerator(workers=1).generate_all_service_center_performance(columns)
+    
+    generator = ReportGenerator()
+    by_center = {}
+    for booking in bookings:
+        by_center.setdefault(booking.service_center_id, []).append(booking.dict())
+    expected = {
+        service_center_id: without_timestamps(generator.generate_service_center_performance(center_bookings))['report']
+        for service_center_id, center_bookings in sorted(by_center.items())
+    }
+    report = without_timestamps(report)['report']
+    assert report['total_bookings'] == len(bookings)
+    assert report['service_centers'] == expected
@@ -0,0 +1,30 @@
+import pytest
+from app.crud.memory_crud import MemoryVehicleCRUD
+from app.crud.pagination import InvalidPageTokenError, encode_next_token
+from app.crud.sqlite_crud import SQLiteVehicleCRUD
+from app.crud.sqlite_table import SQLiteDatabase
+from app.models.vehicle import VehicleCreate
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def vehicles(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteVehicleCRUD(SQLiteDatabase(str(tmp_path / 'test.db')))
+    return MemoryVehicleCRUD()
+
+@pytest.mark.parametrize('start_key', [{'vehicle_id': 7}, {'vehicle_id': None}, {'vehicle_id': ['a']}, {'other': 'a'}])
+def test_page_token_with_a_bad_start_key_is_rejected(vehicles, start_key):
+    with pytest.raises(InvalidPageTokenError):
+        vehicles.get_vehicles_page(10, encode_next_token(start_key))
+
+def test_page_token_round_trips(vehicles):
+    for plate in ("ABC123", "DEF456", "GHI789"):
+        vehicles.create_vehicle(VehicleCreate(
+            customer_id="customer-1",
+            make="Toyota",
+            model="Corolla",
+            year=2020,
+            registration_number=plate
+        ))
+    first, next_token = vehicles.get_vehicles_page(2)
+    rest, last_token = vehicles.get_vehicles_page(2, next_token)
+    assert (len(first), len(rest), last_token) == (2, 1, None)
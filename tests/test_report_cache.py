@@ -0,0 +1,128 @@
+import threading
+import pytest
+from app.config import config
+from app.crud.memory_crud import MemoryBookingCRUD
+from app.crud.report_builder import ReportBuilder
+from app.crud.report_cache import ReportCache
+from app.models.booking import BookingCreate, BookingUpdate
+from app.non_crud_lib.booking_aggregator import ALL, CHANGES, service_center_scope
+
+SUMMARY_TAG = (ALL, ALL)
+
+def create_booking(bookings: MemoryBookingCRUD, service_center_id: str = "sc1", customer_id: str = "customer-1"):
+    return bookings.create_booking(BookingCreate(
+        customer_id=customer_id,
+        vehicle_id="vehicle-1",
+        service_center_id=service_center_id,
+        service_type="OIL_CHANGE",
+        booking_date="2030-06-03",
+        scheduled_time="10:00"
+    ), estimated_cost=50.0)
+
+class Counter:
+    """compute() stand-in that returns how often it ran"""
+    
+    def __init__(self, during=None):
+        self.calls = 0
+        self.during = during
+    
+    def __call__(self):
+        self.calls += 1
+        if self.during:
+            self.during()
+        return self.calls
+
+def test_report_computed_across_an_invalidation_is_not_stored():
+    cache = ReportCache(maxsize=10)
+    compute = Counter(during=lambda: cache.invalidate([SUMMARY_TAG]))
+    
+    assert cache.get_or_compute('summary', [SUMMARY_TAG], compute) == 1
+    # It may have read the data from before the write, so the next lookup recomputes
+    compute.during = None
+    assert cache.get_or_compute('summary', [SUMMARY_TAG], compute) == 2
+    assert cache.get_or_compute('summary', [SUMMARY_TAG], compute) == 2
+
+def test_invalidation_of_another_tag_does_not_block_storing():
+    cache = ReportCache(maxsize=10)
+    other_tag = (service_center_scope("sc2"), ALL)
+    compute = Counter(during=lambda: cache.invalidate([other_tag]))
+    
+    assert cache.get_or_compute('summary', [SUMMARY_TAG], compute) == 1
+    assert cache.get_or_compute('summary', [SUMMARY_TAG], compute) == 1
+
+def test_write_while_a_concurrent_compute_is_running_is_not_lost():
+    cache = ReportCache(maxsize=10)
+    computing, written = threading.Event(), threading.Event()
+    
+    def slow_compute():
+        computing.set()
+        written.wait(5)
+        return 'stale'
+    
+    reader = threading.Thread(target=cache.get_or_compute, args=('summary', [SUMMARY_TAG], slow_compute))
+    reader.start()
+    computing.wait(5)
+    cache.invalidate([SUMMARY_TAG])  # A booking write lands mid-compute
+    written.set()
+    reader.join()
+    
+    assert cache.get_or_compute('summary', [SUMMARY_TAG], lambda: 'fresh') == 'fresh'
+
+def test_booking_writes_drop_the_reports_in_their_scope(monkeypatch):
+    monkeypatch.setattr(config, 'REPORT_SOURCE', 'columnar')
+    bookings = MemoryBookingCRUD()
+    cache = ReportCache(maxsize=10)
+    bookings.add_change_listener(cache.on_change)
+    builder = ReportBuilder(bookings=bookings, cache=cache)
+    create_booking(bookings, "sc1")
+    
+    assert builder.booking_summary()['report']['summary']['total_bookings'] == 1
+    performance = builder.service_center_performance("sc2")
+    create_booking(bookings, "sc1")
+    
+    assert builder.booking_summary()['report']['summary']['total_bookings'] == 2
+    assert builder.service_center_performance("sc2") is performance  # Other scope: still cached
+
+def test_writes_from_another_process_are_seen_through_the_change_counters(monkeypatch):
+    monkeypatch.setattr(config, 'REPORT_SOURCE', 'columnar')
+    bookings = MemoryBookingCRUD()
+    # Not registered as a listener: it never hears of these writes, like another process's cache
+    cache = ReportCache(maxsize=10, change_count=lambda tag: bookings.get_booking_aggregates(tag).get(CHANGES, 0))
+    builder = ReportBuilder(bookings=bookings, cache=cache)
+    booking = create_booking(bookings)
+    
+    assert builder.booking_summary()['report']['summary']['total_bookings'] == 1
+    assert builder.customer_service_history("customer-1")['report']['total_services'] == 1
+    
+    create_booking(bookings)
+    assert builder.booking_summary()['report']['summary']['total_bookings'] == 2
+    assert builder.customer_service_history("customer-1")['report']['total_services'] == 2
+    assert cache.stats()['stale'] == 2
+    
+    # A write that moves no counter leaves the reports valid
+    bookings.update_booking(booking.booking_id, BookingUpdate(notes="customer called"))
+    hits = cache.stats()['hits']
+    builder.booking_summary()
+    builder.customer_service_history("customer-1")
+    assert cache.stats()['hits'] == hits + 2
+
+@pytest.mark.parametrize('source', ['counters', 'rollups'])
+def test_only_reports_computed_from_bookings_are_cached_for_aggregate_sources(monkeypatch, source):
+    monkeypatch.setattr(config, 'REPORT_SOURCE', source)
+    bookings = MemoryBookingCRUD()
+    cache = ReportCache(maxsize=10, change_count=lambda tag: bookings.get_booking_aggregates(tag).get(CHANGES, 0))
+    builder = ReportBuilder(bookings=bookings, cache=cache)
+    create_booking(bookings)
+    
+    # One aggregate read each: validating a cached copy would cost the same
+    builder.booking_summary()
+    builder.service_center_performance("sc1")
+    builder.monthly(6, 2030)
+    assert cache.stats()['misses'] == 0
+    
+    # These scan or query the bookings whatever the source
+    builder.customer_service_history("customer-1")
+    builder.customer_service_history("customer-1")
+    builder.all_service_centers_performance()
+    builder.all_service_centers_performance()
+    assert (cache.stats()['misses'], cache.stats()['hits']) == (2, 2)
@@ -0,0 +1,20 @@
+import asyncio
+import json
+import pytest
+from fastapi import HTTPException
+from app.api import report_routes
+from app.models.report import ReportJob, ReportSpec, ReportType
+
+@pytest.mark.parametrize('job_id', ['..', '../report_jobs', 'not-a-job', '{00000000-0000-0000-0000-000000000000}'])
+def test_job_ids_that_are_not_uuids_never_reach_the_job_store(tmp_path, monkeypatch, job_id):
+    # Jobs live under tmp_path/report_jobs; a job file next to it must stay out of reach
+    (tmp_path / 'report_jobs').mkdir()
+    monkeypatch.setattr(report_routes.report_job_runner.wrapped.store, 'directory', str(tmp_path / 'report_jobs'))
+    outside = ReportJob(job_id='outside', spec=ReportSpec(report_type=ReportType.BOOKING_SUMMARY), created_at='2030-01-01T00:00:00')
+    (tmp_path / 'job.json').write_text(json.dumps(outside.dict(), default=str))
+    
+    # Called directly: an HTTP client would already have collapsed the dot segments
+    for route in (report_routes.get_report_job, report_routes.download_report_job_result):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(route(job_id))
+        assert error.value.status_code == 404
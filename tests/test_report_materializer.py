@@ -0,0 +1,50 @@
+from app.crud.memory_crud import MemoryBookingCRUD
+from app.crud.report_materializer import ReportMaterializer
+from app.models.booking import BookingCreate, BookingStatus, BookingUpdate
+from app.non_crud_lib.booking_aggregator import ALL, BOOKINGS, COMPLETED_REVENUE, service_center_scope
+
+def create_booking(bookings: MemoryBookingCRUD, service_center_id: str = "sc1"):
+    return bookings.create_booking(BookingCreate(
+        customer_id="customer-1",
+        vehicle_id="vehicle-1",
+        service_center_id=service_center_id,
+        service_type="OIL_CHANGE",
+        booking_date="2030-06-03",
+        scheduled_time="10:00"
+    ), estimated_cost=50.0)
+
+def materializer_for(bookings: MemoryBookingCRUD) -> ReportMaterializer:
+    # Refreshed only when the test asks, and never rebuilt from scratch on its own
+    materializer = ReportMaterializer(bookings, refresh_interval=3600, full_refresh_interval=0, checkpoint_path='')
+    bookings.add_change_listener(materializer.on_change)
+    return materializer
+
+def test_incremental_refresh_drops_a_deleted_booking():
+    bookings = MemoryBookingCRUD()
+    materializer = materializer_for(bookings)
+    kept, deleted = create_booking(bookings), create_booking(bookings)
+    bookings.update_booking(deleted.booking_id, BookingUpdate(status=BookingStatus.COMPLETED, actual_cost=80.0))
+    materializer.refresh(full=True)
+    assert materializer.aggregates((ALL, ALL))[BOOKINGS] == 2
+    assert materializer.aggregates((service_center_scope("sc1"), ALL))[COMPLETED_REVENUE] == 80.0
+    
+    assert bookings.delete_booking(deleted.booking_id)
+    materializer.refresh()
+    
+    assert materializer.full_refresh_count == 1
+    assert materializer.aggregates((ALL, ALL))[BOOKINGS] == 1
+    assert COMPLETED_REVENUE not in materializer.aggregates((service_center_scope("sc1"), ALL))
+    assert set(materializer._engine.folded) == {kept.booking_id}
+
+def test_lagging_read_of_a_deleted_booking_is_not_folded_again():
+    bookings = MemoryBookingCRUD()
+    materializer = materializer_for(bookings)
+    booking = create_booking(bookings)
+    materializer.refresh(full=True)
+    
+    bookings.delete_booking(booking.booking_id)
+    materializer.refresh()
+    # An eventually consistent index can still return the booking after its delete
+    materializer._engine.fold([booking])
+    
+    assert materializer.aggregates((ALL, ALL)) == {}